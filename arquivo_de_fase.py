@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+'''
+Formato declarativo de arquivo de fase, em texto ou binário, independente de qualquer placa gráfica.
+
+Forma de texto (.fase), uma declaração por linha, com comentários iniciados por #:
+
+    intervalo_de_colisao 10
+    duracao_do_tique 0.01
+    gravidade 10
+    escala 1
+    velocidade PassaroAmarelo 30
+    PassaroAmarelo 30 30
+    Porco 620 30
+
+As linhas de atores têm a classe e as coordenadas x e y. Classes sem módulo são procuradas em atores; as demais
+são escritas como 'modulo.Classe'. Os atores podem aparecer em qualquer ordem: pássaros, obstáculos e porcos são
+separados na carga, mantendo a ordem em que aparecem.
+
+Forma binária (.fasebin), em little-endian, feita para ser mapeada em memória:
+
+    cabeçalho   magic 'PBFN', versão, intervalo de colisão, duração do tique, gravidade e escala da física,
+                quantidade de pássaros, obstáculos, porcos, classes de atores e velocidades da física
+    classes     para cada classe: tamanho (uint16) e nome 'modulo.Classe' em utf-8
+    velocidades para cada velocidade da física: nome da classe e valor (float64)
+    atores      preenchimento até múltiplo de 8 bytes, depois as colunas x e y (float64) e tipo (uint8, índice na
+                tabela de classes) de todos atores, na ordem pássaros, obstáculos, porcos
+
+Com NumPy, carregar monta uma FaseVetorizada direto das colunas, sem criar um objeto por ator.
+'''
+import mmap
+import os
+import struct
+from array import array
+from collections import namedtuple
+from itertools import chain
+
+from atores import Passaro, Porco
+from empacotamento import FormatoInvalido, carregar_classe, coluna, escrever_nome, ler_coluna, ler_nome, \
+    nome_da_classe, para_float, para_valor
+from fase import Fase
+from fase_vetorizada import FaseVetorizada, np
+from fisica import GRAVIDADE, Fisica
+
+MAGICO = b'PBFN'
+VERSAO = 1
+EXTENSAO_DE_TEXTO = '.fase'
+EXTENSAO_BINARIA = '.fasebin'
+_CABECALHO = struct.Struct('<4sHddddIIIHH')
+_VELOCIDADE = struct.Struct('<d')
+
+Nivel = namedtuple('Nivel', 'intervalo_de_colisao duracao_do_tique fisica classes tipos x y quantidades')
+Nivel.__doc__ = '''Descrição de uma fase antes de qualquer lançamento. tipos, x e y têm um valor por ator, na ordem
+pássaros, obstáculos e porcos; quantidades é o par (quantidade de pássaros, quantidade de obstáculos).'''
+
+_PARAMETROS = ('intervalo_de_colisao', 'duracao_do_tique', 'gravidade', 'escala')
+
+
+def _grupo(classe):
+    if issubclass(classe, Passaro):
+        return 0
+    if issubclass(classe, Porco):
+        return 2
+    return 1
+
+
+def _nome_curto(classe):
+    nome = nome_da_classe(classe)
+    return nome[len('atores.'):] if nome.startswith('atores.') else nome
+
+
+def _classe(nome):
+    return carregar_classe(nome if '.' in nome else 'atores.' + nome)
+
+
+def _inteiro_se_possivel(valor):
+    return int(valor) if valor == int(valor) else valor
+
+
+def _numero(valor):
+    return repr(_inteiro_se_possivel(valor))
+
+
+def nivel_da_fase(fase):
+    'Nivel com os atores de fase nas suas posições iniciais'
+    atores = list(chain(fase._passaros, fase._obstaculos, fase._porcos))
+    classes = []
+    indices = {}
+    tipos = array('B')
+    for ator in atores:
+        classe = type(ator)
+        if classe not in indices:
+            indices[classe] = len(classes)
+            classes.append(classe)
+        tipos.append(indices[classe])
+    x = array('d', [getattr(ator, '_x_inicial', ator.x) for ator in atores])
+    y = array('d', [getattr(ator, '_y_inicial', ator.y) for ator in atores])
+    return Nivel(fase.intervalo_de_colisao, fase.duracao_do_tique, fase.fisica, classes, tipos, x, y,
+                 (len(fase._passaros), len(fase._obstaculos)))
+
+
+def criar_fase(nivel, classe_de_fase=None):
+    '''
+    Fase de classe_de_fase descrita por nivel. Classes com de_arrays, como FaseVetorizada, são montadas direto das
+    colunas; as demais recebem um objeto por ator. O padrão é FaseVetorizada, ou Fase se o NumPy não estiver
+    instalado: ela monta a fase sem criar um objeto por ator e, a cada quadro, compara cada pássaro só com os alvos
+    da sua faixa de x, então fases com milhões de atores continuam jogáveis.
+    '''
+    if classe_de_fase is None:
+        classe_de_fase = Fase if np is None else FaseVetorizada
+    parametros = (nivel.intervalo_de_colisao, nivel.duracao_do_tique, nivel.fisica)
+    if hasattr(classe_de_fase, 'de_arrays'):
+        return classe_de_fase.de_arrays(nivel.classes, nivel.tipos, nivel.x, nivel.y, nivel.quantidades,
+                                        *parametros)
+    fase = classe_de_fase(*parametros)
+    classes = nivel.classes
+    atores = [classes[tipo](x, y) for tipo, x, y in zip(_para_lista(nivel.tipos), _para_lista(nivel.x),
+                                                         _para_lista(nivel.y))]
+    n_passaros, n_obstaculos = nivel.quantidades
+    fase.adicionar_passaro(*atores[:n_passaros])
+    fase.adicionar_obstaculo(*atores[n_passaros:n_passaros + n_obstaculos])
+    fase.adicionar_porco(*atores[n_passaros + n_obstaculos:])
+    return fase
+
+
+def _para_lista(valores):
+    return valores.tolist() if hasattr(valores, 'tolist') else list(valores)
+
+
+def para_texto(nivel):
+    'Forma de texto de nivel'
+    gravidade, velocidades, escala = nivel.fisica.__getstate__()
+    linhas = ['intervalo_de_colisao %s' % _numero(nivel.intervalo_de_colisao)]
+    if nivel.duracao_do_tique is not None:
+        linhas.append('duracao_do_tique %s' % _numero(nivel.duracao_do_tique))
+    linhas.append('gravidade %s' % _numero(gravidade))
+    linhas.append('escala %s' % _numero(escala))
+    for classe, velocidade in velocidades.items():
+        linhas.append('velocidade %s %s' % (_nome_curto(classe), _numero(velocidade)))
+    nomes = [_nome_curto(classe) for classe in nivel.classes]
+    linhas.extend('%s %s %s' % (nomes[tipo], _numero(x), _numero(y))
+                  for tipo, x, y in zip(_para_lista(nivel.tipos), _para_lista(nivel.x), _para_lista(nivel.y)))
+    return '\n'.join(linhas) + '\n'
+
+
+def de_texto(texto):
+    'Nivel descrito por texto na forma de texto'
+    parametros = {'intervalo_de_colisao': 1, 'duracao_do_tique': None, 'gravidade': GRAVIDADE, 'escala': 1}
+    velocidades = {}
+    classes = []
+    indices = {}
+    grupos = ([], [], [])
+    for numero, linha in enumerate(texto.splitlines(), 1):
+        campos = linha.split('#', 1)[0].split()
+        if not campos:
+            continue
+        try:
+            if campos[0] in _PARAMETROS and len(campos) == 2:
+                parametros[campos[0]] = float(campos[1])
+            elif campos[0] == 'velocidade' and len(campos) == 3:
+                velocidades[_classe(campos[1])] = float(campos[2])
+            elif len(campos) == 3:
+                nome = campos[0]
+                if nome not in indices:
+                    indices[nome] = len(classes)
+                    classes.append(_classe(nome))
+                tipo = indices[nome]
+                grupos[_grupo(classes[tipo])].append((tipo, float(campos[1]), float(campos[2])))
+            else:
+                raise ValueError('Declaração desconhecida')
+        except (ValueError, ImportError) as erro:
+            raise FormatoInvalido('Linha %s: %s' % (numero, erro))
+    atores = list(chain(*grupos))
+    return Nivel(_inteiro_se_possivel(parametros['intervalo_de_colisao']), parametros['duracao_do_tique'],
+                 Fisica(parametros['gravidade'], velocidades, parametros['escala']), classes,
+                 array('B', [ator[0] for ator in atores]), array('d', [ator[1] for ator in atores]),
+                 array('d', [ator[2] for ator in atores]), (len(grupos[0]), len(grupos[1])))
+
+
+def para_bytes(nivel):
+    'Forma binária de nivel'
+    gravidade, velocidades, escala = nivel.fisica.__getstate__()
+    n_passaros, n_obstaculos = nivel.quantidades
+    total = len(nivel.tipos)
+    partes = [_CABECALHO.pack(MAGICO, VERSAO, nivel.intervalo_de_colisao, para_float(nivel.duracao_do_tique),
+                              gravidade, escala, n_passaros, n_obstaculos, total - n_passaros - n_obstaculos,
+                              len(nivel.classes), len(velocidades))]
+    for classe in nivel.classes:
+        escrever_nome(partes, classe)
+    for classe, velocidade in velocidades.items():
+        escrever_nome(partes, classe)
+        partes.append(_VELOCIDADE.pack(velocidade))
+    # colunas float64 alinhadas em 8 bytes, para que possam ser lidas direto do arquivo mapeado
+    partes.append(bytes(-sum(map(len, partes)) % 8))
+    partes.append(coluna(_para_lista(nivel.x)).tobytes())
+    partes.append(coluna(_para_lista(nivel.y)).tobytes())
+    partes.append(array('B', _para_lista(nivel.tipos)).tobytes())
+    return b''.join(partes)
+
+
+def de_bytes(dados):
+    'Nivel a partir da forma binária, que pode ser bytes ou um mmap'
+    dados = memoryview(dados)
+    if len(dados) < _CABECALHO.size:
+        raise FormatoInvalido('Dados truncados')
+    (magico, versao, intervalo_de_colisao, duracao_do_tique, gravidade, escala, n_passaros, n_obstaculos, n_porcos,
+     n_classes, n_velocidades) = _CABECALHO.unpack_from(dados)
+    if magico != MAGICO:
+        raise FormatoInvalido('Não é um arquivo de fase')
+    if versao != VERSAO:
+        raise FormatoInvalido('Versão %s não suportada' % versao)
+    posicao = _CABECALHO.size
+    classes = []
+    for _ in range(n_classes):
+        classe, posicao = ler_nome(dados, posicao)
+        classes.append(classe)
+    velocidades = {}
+    for _ in range(n_velocidades):
+        classe, posicao = ler_nome(dados, posicao)
+        if posicao + _VELOCIDADE.size > len(dados):
+            raise FormatoInvalido('Dados truncados')
+        velocidades[classe], = _VELOCIDADE.unpack_from(dados, posicao)
+        posicao += _VELOCIDADE.size
+    posicao += -posicao % 8
+
+    total = n_passaros + n_obstaculos + n_porcos
+    if posicao + 17 * total > len(dados):
+        raise FormatoInvalido('Dados truncados')
+    if np is None:
+        x, posicao = ler_coluna(dados, posicao, 'd', total)
+        y, posicao = ler_coluna(dados, posicao, 'd', total)
+        tipos, posicao = ler_coluna(dados, posicao, 'B', total)
+        maior_tipo = max(tipos, default=-1)
+    else:
+        # astype copia as colunas, então o mmap pode ser fechado logo depois
+        x = np.frombuffer(dados, '<f8', total, posicao).astype(float)
+        y = np.frombuffer(dados, '<f8', total, posicao + 8 * total).astype(float)
+        tipos = np.frombuffer(dados, np.uint8, total, posicao + 16 * total).astype(np.intp)
+        maior_tipo = int(tipos.max()) if total else -1
+    if maior_tipo >= n_classes:
+        raise FormatoInvalido('Tipo de ator %s fora da tabela de classes' % maior_tipo)
+    return Nivel(_inteiro_se_possivel(intervalo_de_colisao), para_valor(duracao_do_tique),
+                 Fisica(gravidade, velocidades, escala), classes, tipos, x, y, (n_passaros, n_obstaculos))
+
+
+def salvar(fase_ou_nivel, caminho):
+    'Grava uma fase, ou um Nivel, em caminho, na forma binária se a extensão for .fasebin e de texto nos demais casos'
+    nivel = fase_ou_nivel if isinstance(fase_ou_nivel, Nivel) else nivel_da_fase(fase_ou_nivel)
+    if os.path.splitext(caminho)[1] == EXTENSAO_BINARIA:
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(para_bytes(nivel))
+    else:
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(para_texto(nivel))
+
+
+def ler(caminho):
+    'Nivel gravado em caminho, em qualquer das duas formas; a binária é lida por mapeamento em memória'
+    with open(caminho, 'rb') as arquivo:
+        if arquivo.read(len(MAGICO)) != MAGICO:
+            arquivo.seek(0)
+            return de_texto(arquivo.read().decode('utf-8'))
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            dados = memoryview(mapa)
+            try:
+                return de_bytes(dados)
+            finally:
+                dados.release()
+
+
+def carregar(caminho, classe_de_fase=None):
+    'Fase gravada em caminho, ver criar_fase'
+    return criar_fase(ler(caminho), classe_de_fase)
+
+
+def main(argumentos=None):
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description='Converte uma fase em arquivo de fase, de texto ou binário')
+    parser.add_argument('origem', help='módulo com uma função criar_fase(), ex: fases.brasil, ou arquivo de fase')
+    parser.add_argument('destino', help='arquivo de destino, binário se terminar em %s' % EXTENSAO_BINARIA)
+    argumentos = parser.parse_args(argumentos)
+
+    if os.path.exists(argumentos.origem):
+        nivel = ler(argumentos.origem)
+    else:
+        nivel = nivel_da_fase(importlib.import_module(argumentos.origem).criar_fase())
+    salvar(nivel, argumentos.destino)
+
+
+if __name__ == '__main__':
+    main()
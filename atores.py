@@ -3,61 +3,125 @@
 from __future__ import unicode_literals
 import math
 
-DESTRUIDO = 'Destruido'
-ATIVO = 'Ativo'
+from fisica import FISICA_PADRAO
+from trajetoria import Trajetoria
+
+DESTRUIDO = 0
+ATIVO = 1
+
+GRAVIDADE = FISICA_PADRAO.gravidade  # m/s^2, mantida para quem importava a constante daqui
 
 
 class Ator():
+    __slots__ = ('x', 'y', '_colisao', '_observador')
     _caracter_ativo = 'A'
     _caracter_destruido = ' '
 
     def __init__(self, x=0, y=0):
         self.y = y
         self.x = x
-        self._tempo_de_colisao = None
+        self._observador = None
+        self._colisao = None
+
+    @property
+    def _tempo_de_colisao(self):
+        return self._colisao
+
+    @_tempo_de_colisao.setter
+    def _tempo_de_colisao(self, tempo):
+        # o observador (em geral a linha do tempo da fase) é avisado de toda mudança no tempo de colisão
+        if self._observador is not None:
+            self._observador.ao_alterar_colisao(self, self._colisao, tempo)
+        self._colisao = tempo
 
     def caracter(self, tempo):
         return self._caracter_ativo if self.status(tempo) == ATIVO else self._caracter_destruido
 
+    @classmethod
+    def criar_varios(cls, xs, ys):
+        'Atores da classe nas posições de xs e ys, usado ao carregar fases grandes'
+        return list(map(cls, xs, ys))
+
     def resetar(self):
         self._tempo_de_colisao = None
 
     def status(self, tempo):
-        if self._tempo_de_colisao is None or self._tempo_de_colisao > tempo:
+        if self._colisao is None or self._colisao > tempo:
             return ATIVO
         return DESTRUIDO
 
+    def coordenadas(self):
+        'Posição atual arredondada, sem alterar o ator'
+        return round(self.x), round(self.y)
+
+    def posicao(self, tempo):
+        'Posição arredondada em tempo, sem alterar o ator'
+        return self.coordenadas()
+
     def calcular_posicao(self, tempo):
-        return self.arredondar_posicao()
+        self.x, self.y = self.posicao(tempo)
+        return self.x, self.y
 
     def arredondar_posicao(self):
-        self.x, self.y = round(self.x), round(self.y)
+        self.x, self.y = self.coordenadas()
         return self.x, self.y
 
     def colidir(self, outro_ator, tempo, intervalo=1):
         if self.status(tempo) == DESTRUIDO or outro_ator.status(tempo) == DESTRUIDO:
             return
-        x1, y1 = self.arredondar_posicao()
-        x2, y2 = outro_ator.arredondar_posicao()
+        x1, y1 = self.coordenadas()
+        x2, y2 = outro_ator.coordenadas()
 
         if x1 - intervalo <= x2 <= x1 + intervalo and y1 - intervalo <= y2 <= y1 + intervalo:
             self._tempo_de_colisao = tempo
             outro_ator._tempo_de_colisao = tempo
 
 
-class Obstaculo(Ator):
+class AtorEstatico(Ator):
+    'Ator que não se move: sua posição é arredondada uma única vez, na construção'
+    __slots__ = ()
+
+    def __init__(self, x=0, y=0):
+        super().__init__(round(x), round(y))
+
+    @classmethod
+    def criar_varios(cls, xs, ys):
+        if cls.__init__ is not AtorEstatico.__init__:
+            return super().criar_varios(xs, ys)
+        # os atributos são preenchidos aqui mesmo, sem a cadeia de __init__, que dobraria o tempo de carga
+        novo = cls.__new__
+        atores = []
+        for x, y in zip(map(round, xs), map(round, ys)):
+            ator = novo(cls)
+            ator.x = x
+            ator.y = y
+            ator._observador = None
+            ator._colisao = None
+            atores.append(ator)
+        return atores
+
+    def coordenadas(self):
+        return self.x, self.y
+
+    def posicao(self, tempo):
+        return self.x, self.y
+
+
+class Obstaculo(AtorEstatico):
+    __slots__ = ()
     _caracter_ativo = 'O'
 
 
-class Porco(Ator):
+class Porco(AtorEstatico):
+    __slots__ = ()
     _caracter_ativo = '@'
     _caracter_destruido = '+'
 
 
-GRAVIDADE = 10  # m/s^2
-
 
 class Passaro(Ator):
+    __slots__ = ('_x_inicial', '_y_inicial', '_tempo_de_lancamento', '_angulo_de_lancamento', '_trajetoria',
+                 '_fisica')
     velocidade_escalar = None
 
     def __init__(self, x=0, y=0):
@@ -66,11 +130,27 @@ class Passaro(Ator):
         self._y_inicial = y
         self._tempo_de_lancamento = None
         self._angulo_de_lancamento = None  # radianos
+        self._trajetoria = None
+        self._fisica = FISICA_PADRAO  # trocada pela física da fase quando o pássaro é adicionado a uma
 
     def resetar(self):
         super().resetar()
         self._tempo_de_lancamento = None
         self._angulo_de_lancamento = None
+        self._trajetoria = None
+
+    def usar_fisica(self, fisica):
+        self._fisica = fisica
+        self._trajetoria = None
+
+    @property
+    def trajetoria(self):
+        'Trajetória do lançamento, None se o pássaro ainda não foi lançado'
+        if self._trajetoria is None and self.foi_lancado():
+            self._trajetoria = Trajetoria(self._x_inicial, self._y_inicial, self._fisica.velocidade(type(self)),
+                                          self._angulo_de_lancamento, self._fisica.gravidade,
+                                          self._tempo_de_lancamento)
+        return self._trajetoria
 
 
     def foi_lancado(self):
@@ -80,32 +160,26 @@ class Passaro(Ator):
         if self.y <= 0:
             self._tempo_de_colisao = tempo
 
-    def _calcular_posicao_horizontal(self, delta_t):
-        self.x = self._x_inicial + self.velocidade_escalar * delta_t * math.cos(self._angulo_de_lancamento)
-
-    def _calcular_posicao_vertical(self, delta_t):
-        self.y = (self._y_inicial +
-                  self.velocidade_escalar * delta_t * math.sin(self._angulo_de_lancamento) -
-                  (GRAVIDADE / 2) * delta_t ** 2)
-
-    def _calcular_posicao(self, tempo):
-        delta_t = tempo - self._tempo_de_lancamento
-        self._calcular_posicao_vertical(delta_t)
-        self._calcular_posicao_horizontal(delta_t)
-
-    def calcular_posicao(self, tempo):
+    def posicao(self, tempo):
         if self._aguardando_lancamento(tempo):
-            self.x = self._x_inicial
-            self.y = self._y_inicial
-        elif self._ja_colidiu(tempo):
-            self._calcular_posicao(self._tempo_de_colisao)
-        else:
-            self._calcular_posicao(tempo)
-        return self.arredondar_posicao()
+            return round(self._x_inicial), round(self._y_inicial)
+        if self._ja_colidiu(tempo):
+            # fica parado onde colidiu
+            tempo = self._colisao
+        trajetoria = self._trajetoria
+        if trajetoria is None:
+            trajetoria = self.trajetoria
+        return trajetoria.posicao_arredondada(tempo)
 
     def lancar(self, angulo, tempo):
         self._tempo_de_lancamento = tempo
         self._angulo_de_lancamento = math.radians(angulo)
+        self._trajetoria = None
+        return self.trajetoria
+
+    def usar_ponto_fixo(self, duracao_do_tique):
+        'Calcula as posições do pássaro já lançado em ponto fixo, ver Trajetoria.usar_ponto_fixo'
+        self.trajetoria.usar_ponto_fixo(duracao_do_tique)
 
     def _aguardando_lancamento(self, tempo):
         return not self.foi_lancado() or tempo < self._tempo_de_lancamento
@@ -115,12 +189,14 @@ class Passaro(Ator):
 
 
 class PassaroAmarelo(Passaro):
+    __slots__ = ()
     velocidade_escalar = 30  # m/s
     _caracter_ativo = 'A'
     _caracter_destruido = 'a'
 
 
 class PassaroVermelho(Passaro):
+    __slots__ = ()
     velocidade_escalar = 20  # m/s
     _caracter_ativo = 'V'
     _caracter_destruido = 'v'
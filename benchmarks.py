@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+'''
+Microbenchmarks dos caminhos críticos do motor: Ator.colidir, Passaro.calcular_posicao, Fase.calcular_pontos,
+Fase.acabou, placa_grafica.desenhar e Visor.pontos_visiveis, com várias quantidades de atores e tamanhos de tela.
+
+Cada caso é medido com timeit e o resultado é o menor tempo por chamada entre as repetições. Os resultados podem
+ser gravados como linha de base em JSON e comparados depois, apontando regressões acima de um limite.
+
+    python benchmarks.py --salvar linha_de_base.json
+    python benchmarks.py --comparar linha_de_base.json --limite 0.1
+'''
+import argparse
+import json
+import platform
+import sys
+import timeit
+from collections import namedtuple
+
+import placa_grafica
+from atores import PassaroAmarelo, Porco
+from fase import Fase
+from gerador_de_fases import gerar_fase
+from visor import Visor
+
+VERSAO = 1
+QUANTIDADES_DE_ATORES = (10, 100, 1000)
+TAMANHOS_DE_TELA = ((80, 20), (160, 48))
+TEMPO = 0.5  # pássaros já lançados e ainda longe dos alvos
+
+Caso = namedtuple('Caso', 'nome preparar')
+Comparacao = namedtuple('Comparacao', 'nome base atual razao regressao')
+
+
+def _fase(quantidade_de_atores):
+    'Fase gerada com um pássaro para cada dez atores, todos lançados no tempo 0'
+    passaros = max(quantidade_de_atores // 10, 1)
+    alvos = quantidade_de_atores - passaros
+    fase = gerar_fase('benchmark', Fase, porcos=alvos - alvos // 2, densidade_de_obstaculos=(alvos // 2) / 80,
+                      quantidade_de_passaros=passaros, passaros=[(PassaroAmarelo, 1)])
+    for i in range(passaros):
+        fase.lancar(90 * i / passaros, 0)
+    return fase
+
+
+def _colidir():
+    passaro, porco = PassaroAmarelo(3, 3), Porco(70, 1)
+    return lambda: passaro.colidir(porco, TEMPO)
+
+
+def _calcular_posicao():
+    passaro = PassaroAmarelo(3, 3)
+    passaro.lancar(45, 0)
+    return lambda: passaro.calcular_posicao(TEMPO)
+
+
+def _calcular_pontos(quantidade):
+    def preparar():
+        fase = _fase(quantidade)
+        return lambda: fase.calcular_pontos(TEMPO)
+    return preparar
+
+
+def _acabou(quantidade):
+    def preparar():
+        fase = _fase(quantidade)
+        fase.calcular_pontos(TEMPO)
+        return lambda: fase.acabou(TEMPO)
+    return preparar
+
+
+def _desenhar(largura, altura, quantidade):
+    def preparar():
+        pontos = _fase(quantidade).calcular_pontos(TEMPO)
+        return lambda: placa_grafica.desenhar(*pontos, largura=largura, altura=altura)
+    return preparar
+
+
+def _visor(quantidade):
+    def preparar():
+        # a fase cresce com a quantidade de atores e a janela vê sempre a mesma fatia, com cerca de dez alvos
+        fase = gerar_fase('benchmark', Fase, porcos=quantidade // 2, densidade_de_obstaculos=1 / 16,
+                          largura=8 * quantidade)
+        visor = Visor(*TAMANHOS_DE_TELA[0], x=8 * quantidade // 2)
+        visor.usar_pontos(fase.calcular_pontos(0))
+        return visor.pontos_visiveis
+    return preparar
+
+
+def casos():
+    'Todos os casos de benchmark, na ordem em que são medidos'
+    lista = [Caso('Ator.colidir', _colidir), Caso('Passaro.calcular_posicao', _calcular_posicao)]
+    for quantidade in QUANTIDADES_DE_ATORES:
+        lista.append(Caso('Fase.calcular_pontos[atores=%s]' % quantidade, _calcular_pontos(quantidade)))
+        lista.append(Caso('Fase.acabou[atores=%s]' % quantidade, _acabou(quantidade)))
+    for largura, altura in TAMANHOS_DE_TELA:
+        for quantidade in QUANTIDADES_DE_ATORES[:2]:
+            lista.append(Caso('placa_grafica.desenhar[tela=%sx%s,atores=%s]' % (largura, altura, quantidade),
+                              _desenhar(largura, altura, quantidade)))
+    for quantidade in QUANTIDADES_DE_ATORES:
+        lista.append(Caso('Visor.pontos_visiveis[atores=%s]' % quantidade, _visor(quantidade)))
+    return lista
+
+
+def medir_caso(caso, repeticoes=5, tempo_minimo=0.2):
+    'Menor tempo, em segundos, de uma chamada do caso entre as repetições'
+    temporizador = timeit.Timer(caso.preparar())
+    chamadas, _ = temporizador.autorange()
+    # autorange para em 0.2 s; o número de chamadas é ajustado para tempo_minimo por repetição
+    chamadas = max(1, round(chamadas * tempo_minimo / 0.2))
+    return min(temporizador.repeat(repeticoes, chamadas)) / chamadas
+
+
+def medir(filtro='', repeticoes=5, tempo_minimo=0.2):
+    'Dicionário nome do caso -> segundos por chamada, só dos casos cujo nome contém filtro'
+    return {caso.nome: medir_caso(caso, repeticoes, tempo_minimo) for caso in casos() if filtro in caso.nome}
+
+
+def salvar(resultados, caminho):
+    dados = {'versao': VERSAO, 'python': platform.python_version(), 'plataforma': platform.platform(),
+             'resultados': resultados}
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, indent=2, sort_keys=True)
+
+
+def carregar(caminho):
+    'Resultados de uma linha de base gravada com salvar'
+    with open(caminho, encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    if dados.get('versao') != VERSAO:
+        raise ValueError('Versão de linha de base não suportada: %s' % dados.get('versao'))
+    return dados['resultados']
+
+
+def comparar(base, atual, limite=0.1):
+    '''
+    Compara os casos presentes em base e atual. razao é atual / base e regressao indica razao acima de 1 + limite;
+    casos que só existem de um dos lados são ignorados.
+    '''
+    return [Comparacao(nome, base[nome], atual[nome], atual[nome] / base[nome], atual[nome] / base[nome] > 1 + limite)
+            for nome in atual if nome in base]
+
+
+def _formatar(segundos):
+    for unidade, fator in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if segundos * fator >= 1:
+            return '%8.2f %-2s' % (segundos * fator, unidade)
+    return '%8.2f ns' % (segundos * 1e9)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Mede os caminhos críticos do motor e compara com uma linha de base')
+    parser.add_argument('--filtro', default='', help='mede só os casos cujo nome contém o texto')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--tempo-minimo', type=float, default=0.2, help='segundos de cada repetição')
+    parser.add_argument('--salvar', metavar='JSON', help='grava os resultados como linha de base')
+    parser.add_argument('--comparar', metavar='JSON', help='compara os resultados com uma linha de base')
+    parser.add_argument('--limite', type=float, default=0.1,
+                        help='aumento relativo a partir do qual há regressão, padrão 0.1 (10%%)')
+    argumentos = parser.parse_args(argumentos)
+
+    resultados = medir(argumentos.filtro, argumentos.repeticoes, argumentos.tempo_minimo)
+    if argumentos.salvar:
+        salvar(resultados, argumentos.salvar)
+    if not argumentos.comparar:
+        for nome, segundos in resultados.items():
+            print('%-52s %s' % (nome, _formatar(segundos)))
+        return 0
+    regressoes = 0
+    for comparacao in comparar(carregar(argumentos.comparar), resultados, argumentos.limite):
+        regressoes += comparacao.regressao
+        print('%-52s %s -> %s  %+6.1f%%%s' % (comparacao.nome, _formatar(comparacao.base),
+                                             _formatar(comparacao.atual), (comparacao.razao - 1) * 100,
+                                             '  REGRESSÃO' if comparacao.regressao else ''))
+    return 1 if regressoes else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
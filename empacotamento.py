@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+'''
+Funções de empacotamento comuns aos formatos binários de estado (serializacao) e de fase (arquivo_de_fase).
+
+Nomes de classes são gravados com tamanho (uint16) e 'modulo.Classe' em utf-8; colunas de números são arrays em
+little-endian; valores None são gravados como NaN.
+'''
+import importlib
+import math
+import struct
+import sys
+from array import array
+
+from atores import Ator
+
+TAMANHO_DO_NOME = struct.Struct('<H')
+
+
+class FormatoInvalido(ValueError):
+    pass
+
+
+def para_float(valor):
+    return math.nan if valor is None else valor
+
+
+def para_valor(valor):
+    return None if valor != valor else valor
+
+
+def nome_da_classe(classe):
+    return '%s.%s' % (classe.__module__, classe.__qualname__)
+
+
+def escrever_nome(partes, classe):
+    nome = nome_da_classe(classe).encode('utf-8')
+    partes.append(TAMANHO_DO_NOME.pack(len(nome)))
+    partes.append(nome)
+
+
+def ler_nome(dados, posicao):
+    if posicao + TAMANHO_DO_NOME.size > len(dados):
+        raise FormatoInvalido('Dados truncados')
+    tamanho, = TAMANHO_DO_NOME.unpack_from(dados, posicao)
+    posicao += TAMANHO_DO_NOME.size
+    return carregar_classe(bytes(dados[posicao:posicao + tamanho]).decode('utf-8')), posicao + tamanho
+
+
+def carregar_classe(nome):
+    modulo, _, classe = nome.rpartition('.')
+    classe = getattr(importlib.import_module(modulo), classe, None)
+    if not (isinstance(classe, type) and issubclass(classe, Ator)):
+        raise FormatoInvalido('Classe de ator desconhecida: %s' % nome)
+    return classe
+
+
+def coluna(valores):
+    coluna = array('d', valores)
+    if sys.byteorder != 'little':
+        coluna.byteswap()
+    return coluna
+
+
+def ler_coluna(dados, posicao, tipo, quantidade):
+    coluna = array(tipo)
+    fim = posicao + coluna.itemsize * quantidade
+    if fim > len(dados):
+        raise FormatoInvalido('Dados truncados')
+    coluna.frombytes(dados[posicao:fim])
+    if sys.byteorder != 'little' and tipo != 'B':
+        coluna.byteswap()
+    return coluna, fim
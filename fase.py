@@ -1,9 +1,18 @@
 # -*- coding: utf-8 -*-
-from itertools import chain
+import math
+from itertools import chain, repeat
 from atores import ATIVO
+from fisica import FISICA_PADRAO
+from indice_espacial import GradeEspacial
+from linha_do_tempo import LinhaDoTempo
+from serializacao import serializar, desserializar
+
+OBSTACULOS, PORCOS, PASSAROS = 0, 1, 2
 
 
 class Ponto():
+    __slots__ = ('x', 'y', 'caracter')
+
     def __init__(self, x, y, caracter):
         self.caracter = caracter
         self.x = x
@@ -17,71 +26,280 @@ class Ponto():
 
 
 class Fase():
-    def __init__(self, intervalo_de_colisao=1):
+    def __init__(self, intervalo_de_colisao=1, duracao_do_tique=None, fisica=None):
+        '''
+        Com duracao_do_tique a fase passa a usar uma base de tempo em tiques inteiros: todo tempo recebido é levado
+        ao tique mais próximo e os pássaros lançados calculam suas posições em ponto fixo.
+
+        fisica define gravidade, velocidades e escala apenas desta fase; o padrão é fisica.FISICA_PADRAO.
+        '''
         self.intervalo_de_colisao = intervalo_de_colisao
+        self.duracao_do_tique = duracao_do_tique
+        self.fisica = fisica or FISICA_PADRAO
         self._passaros = []
         self._porcos = []
         self._obstaculos = []
+        self._indice = GradeEspacial(intervalo_de_colisao)
+        self._linha_do_tempo = LinhaDoTempo(OBSTACULOS, PORCOS, PASSAROS)
+        self._ultimo_tempo = 0
+        self._proximo_passaro = 0
+        self._referencia = None
 
     def _adicionar_ator(self, lista, *atores):
         lista.extend(atores)
 
+    def _registrar(self, grupo, lista, atores):
+        self._linha_do_tempo.registrar(grupo, *atores)
+        if grupo != PASSAROS:
+            chaves = zip(repeat(grupo), range(len(lista) - len(atores), len(lista)))
+            self._indice.adicionar_varios(zip(chaves, atores))
+
     def adicionar_obstaculo(self, *obstaculos):
         self._adicionar_ator(self._obstaculos, *obstaculos)
+        self._registrar(OBSTACULOS, self._obstaculos, obstaculos)
 
     def adicionar_porco(self, *porcos):
         self._adicionar_ator(self._porcos, *porcos)
+        self._registrar(PORCOS, self._porcos, porcos)
 
     def adicionar_passaro(self, *passaros):
+        for passaro in passaros:
+            passaro.usar_fisica(self.fisica)
         self._adicionar_ator(self._passaros, *passaros)
+        self._registrar(PASSAROS, self._passaros, passaros)
+
+    def usar_fisica(self, fisica):
+        'Troca a física da fase e de seus pássaros'
+        self.fisica = fisica
+        for passaro in self._passaros:
+            passaro.usar_fisica(fisica)
+            if passaro.foi_lancado() and self.duracao_do_tique is not None:
+                passaro.usar_ponto_fixo(self.duracao_do_tique)
+
+    def _quantizar(self, tempo):
+        if self.duracao_do_tique is None:
+            return tempo
+        return round(tempo / self.duracao_do_tique) * self.duracao_do_tique
 
     def acabou(self, tempo):
+        tempo = self._quantizar(tempo)
         return not self._existe_porco_ativo(tempo) or not self._existe_passaro_ativo(tempo)
 
     def status(self, tempo):
+        tempo = self._quantizar(tempo)
         if not self._existe_porco_ativo(tempo):
             return 'Jogo em encerrado. Você ganhou!'
         if self._existe_passaro_ativo(tempo):
             return 'Jogo em andamento.'
         return 'Jogo em encerrado. Você perdeu!'
 
+    def porcos_destruidos(self, tempo):
+        'Quantos porcos já foram destruídos em tempo'
+        return self._linha_do_tempo.destruidos_ate(PORCOS, self._quantizar(tempo))
+
+    def quantidade_de_passaros(self):
+        return len(self._passaros)
+
+    def quantidade_de_obstaculos(self):
+        return len(self._obstaculos)
+
+    def alvos_em_colunas(self):
+        'x, y e tempo de colisão, math.inf se ainda ativo, de obstáculos e porcos, nessa ordem, em três listas'
+        alvos = list(chain(self._obstaculos, self._porcos))
+        return ([ator.x for ator in alvos], [ator.y for ator in alvos],
+                [math.inf if ator._colisao is None else ator._colisao for ator in alvos])
+
     def lancar(self, angulo, tempo):
-        for passaro in self._passaros:
+        # pássaros são lançados em ordem, então basta avançar um cursor até o próximo ainda não lançado
+        tempo = self._quantizar(tempo)
+        while self._proximo_passaro < len(self._passaros):
+            passaro = self._passaros[self._proximo_passaro]
+            self._proximo_passaro += 1
             if not passaro.foi_lancado():
                 passaro.lancar(angulo, tempo)
-                return
+                if self.duracao_do_tique is not None:
+                    passaro.usar_ponto_fixo(self.duracao_do_tique)
+                self._linha_do_tempo.registrar_lancamento(tempo)
+                return passaro
 
     def resetar(self):
         for ator in chain(self._passaros, self._obstaculos, self._porcos):
             ator.resetar()
+        self._linha_do_tempo.limpar_lancamentos()
+        self._proximo_passaro = 0
+        self._indice.restaurar(0)
+
+    def para_bytes(self):
+        'Estado da fase num formato binário compacto, ver serializacao'
+        return serializar(self)
+
+    @classmethod
+    def de_bytes(cls, dados):
+        'Reconstrói uma fase salva com para_bytes'
+        return desserializar(dados, cls)
+
+    def _restaurar_estado(self, ultimo_tempo):
+        self._ultimo_tempo = ultimo_tempo
+        for passaro in self._passaros:
+            if passaro.foi_lancado():
+                self._linha_do_tempo.registrar_lancamento(passaro._tempo_de_lancamento)
+                if self.duracao_do_tique is not None:
+                    passaro.usar_ponto_fixo(self.duracao_do_tique)
 
     def calcular_pontos(self, tempo):
-        pontos = [self._calcular_ponto_de_passaro(p, tempo) for p in self._passaros]
-        obstaculos_e_porcos = chain(self._obstaculos, self._porcos)
-        pontos.extend([self._transformar_em_ponto(ator, tempo) for ator in obstaculos_e_porcos])
+        tempo = self._quantizar(tempo)
+        self._calcular_posicoes(tempo)
+        self._calcular_colisoes(tempo)
+        return self._gerar_pontos(tempo)
+
+    def avancar(self, tempo):
+        'Calcula posições e colisões em tempo, como calcular_pontos, mas sem gerar os pontos; retorna o tempo usado'
+        tempo = self.calcular_posicoes(tempo)
+        self.calcular_colisoes(tempo)
+        return tempo
+
+    def calcular_posicoes(self, tempo):
+        'Primeira etapa de avancar: leva tempo ao tique mais próximo, move os pássaros e retorna o tempo usado'
+        tempo = self._quantizar(tempo)
+        self._calcular_posicoes(tempo)
+        return tempo
+
+    def calcular_colisoes(self, tempo):
+        'Segunda etapa de avancar, depois de calcular_posicoes no mesmo tempo'
+        self._calcular_colisoes(self._quantizar(tempo))
+
+    def consultar_pontos(self, tempo):
+        '''
+        Pontos em tempo a partir das colisões já registradas, sem procurar novas colisões nem alterar os atores.
+        Usado em replays e pode ser chamado de outra thread enquanto a simulação avança.
+        '''
+        tempo = self._quantizar(tempo)
+        return [Ponto(*ator.posicao(tempo), ator.caracter(tempo))
+                for ator in chain(self._passaros, self._obstaculos, self._porcos)]
+
+    def quadro_chave(self, tempo):
+        'Calcula todos os pontos, como calcular_pontos, e os guarda como referência para calcular_alteracoes'
+        pontos = self.calcular_pontos(tempo)
+        self._guardar_referencia(self._quantizar(tempo), pontos)
         return pontos
 
+    def calcular_alteracoes(self, tempo, desde=None):
+        '''
+        Calcula a fase em tempo, como calcular_pontos, mas retorna apenas os pontos que mudaram de posição ou de
+        caracter, como pares (índice do ponto em calcular_pontos, Ponto).
+
+        Sem desde, a comparação é com a chamada anterior de calcular_alteracoes ou quadro_chave; na primeira chamada,
+        ou depois que atores são adicionados, todos os pontos são retornados. Com desde, a comparação é com a fase
+        no tempo desde.
+        '''
+        if desde is not None:
+            tempo = self._quantizar(tempo)
+            self._calcular_posicoes(tempo)
+            self._calcular_colisoes(tempo)
+            return self.consultar_alteracoes(tempo, desde)
+        if self._referencia is None or self._tamanho_da_referencia != self._quantidade_de_atores():
+            return list(enumerate(self.quadro_chave(tempo)))
+        tempo = self._quantizar(tempo)
+        self._calcular_posicoes(tempo)
+        self._calcular_colisoes(tempo)
+        return self._alteracoes(tempo)
+
+    def consultar_alteracoes(self, tempo, desde):
+        '''
+        Pontos que mudaram entre desde e tempo, no formato de calcular_alteracoes, a partir das colisões já
+        registradas e sem alterar os atores, como consultar_pontos.
+        '''
+        tempo, desde = self._quantizar(tempo), self._quantizar(desde)
+        alteracoes = []
+        for i, passaro in enumerate(self._passaros):
+            x, y = passaro.posicao(tempo)
+            caracter = passaro.caracter(tempo)
+            if (x, y) != passaro.posicao(desde) or caracter != passaro.caracter(desde):
+                alteracoes.append((i, Ponto(x, y, caracter)))
+        linha_do_tempo = self._linha_do_tempo
+        inicio = len(self._passaros)
+        for grupo, atores in ((OBSTACULOS, self._obstaculos), (PORCOS, self._porcos)):
+            # atores parados só mudam de caracter quando há alguma colisão do grupo entre desde e tempo
+            if linha_do_tempo.destruidos_ate(grupo, desde) != linha_do_tempo.destruidos_ate(grupo, tempo):
+                for i, ator in enumerate(atores, inicio):
+                    caracter = ator.caracter(tempo)
+                    if caracter != ator.caracter(desde):
+                        alteracoes.append((i, Ponto(ator.x, ator.y, caracter)))
+            inicio += len(atores)
+        return alteracoes
+
+    def _quantidade_de_atores(self):
+        return len(self._passaros) + len(self._obstaculos) + len(self._porcos)
+
+    def _guardar_referencia(self, tempo, pontos):
+        self._referencia = [(ponto.x, ponto.y, ponto.caracter) for ponto in pontos]
+        self._tamanho_da_referencia = len(pontos)
+        self._tempo_da_referencia = tempo
+        self._versoes_da_referencia = {grupo: self._linha_do_tempo.versao(grupo) for grupo in (OBSTACULOS, PORCOS)}
+
+    def _alteracoes(self, tempo):
+        referencia = self._referencia
+        alteracoes = []
+        for i, passaro in enumerate(self._passaros):
+            estado = (passaro.x, passaro.y, passaro.caracter(tempo))
+            if estado != referencia[i]:
+                referencia[i] = estado
+                alteracoes.append((i, Ponto(*estado)))
+        linha_do_tempo = self._linha_do_tempo
+        versoes = self._versoes_da_referencia
+        inicio = len(self._passaros)
+        for grupo, atores in ((OBSTACULOS, self._obstaculos), (PORCOS, self._porcos)):
+            # sem colisões novas no grupo e sem colisões entre a referência e tempo, nenhum caracter muda
+            versao = linha_do_tempo.versao(grupo)
+            if (versao != versoes[grupo] or linha_do_tempo.destruidos_ate(grupo, self._tempo_da_referencia) !=
+                    linha_do_tempo.destruidos_ate(grupo, tempo)):
+                versoes[grupo] = versao
+                for i, ator in enumerate(atores, inicio):
+                    caracter = ator.caracter(tempo)
+                    if caracter != referencia[i][2]:
+                        referencia[i] = (ator.x, ator.y, caracter)
+                        alteracoes.append((i, Ponto(ator.x, ator.y, caracter)))
+            inicio += len(atores)
+        self._tempo_da_referencia = tempo
+        return alteracoes
+
+    def _calcular_posicoes(self, tempo):
+        for passaro in self._passaros:
+            passaro.calcular_posicao(tempo)
+
+    def _calcular_colisoes(self, tempo):
+        if tempo < self._ultimo_tempo:
+            self._indice.restaurar(tempo)
+        self._ultimo_tempo = tempo
+        if self._obstaculos or self._porcos:
+            for passaro in self._passaros:
+                self._colidir_passaro(passaro, tempo)
+
+    def _gerar_pontos(self, tempo):
+        return [self._transformar_em_ponto(ator, tempo) for ator in chain(self._passaros, self._obstaculos,
+                                                                            self._porcos)]
+
     def _transformar_em_ponto(self, ator, tempo):
         return Ponto(ator.x, ator.y, ator.caracter(tempo))
 
-    def _calcular_ponto_de_passaro(self, passaro, tempo, ):
-        passaro.calcular_posicao(tempo)
-        for ator in chain(self._obstaculos, self._porcos):
-            if ATIVO == passaro.status(tempo):
+    def _colidir_passaro(self, passaro, tempo):
+        if ATIVO != passaro.status(tempo):
+            return
+        if passaro.y <= 0:
+            # o chão é conferido logo após o primeiro alvo, então só ele pode ser atingido antes
+            passaro.colidir(next(chain(self._obstaculos, self._porcos)), tempo, self.intervalo_de_colisao)
+            passaro.colidir_com_chao(tempo)
+        else:
+            for ator in self._indice.candidatos(passaro.x, passaro.y, self.intervalo_de_colisao, tempo):
                 passaro.colidir(ator, tempo, self.intervalo_de_colisao)
-                passaro.colidir_com_chao(tempo)
-            else:
-                break
-        return self._transformar_em_ponto(passaro, tempo)
+                if ATIVO != passaro.status(tempo):
+                    break
 
     def _existe_porco_ativo(self, tempo):
-        return self._verificar_se_existe_ator_ativo(self._porcos, tempo)
+        return self._verificar_se_existe_ator_ativo(PORCOS, self._porcos, tempo)
 
-    def _verificar_se_existe_ator_ativo(self, atores, tempo):
-        for a in atores:
-            if a.status(tempo) == ATIVO:
-                return True
-        return False
+    def _verificar_se_existe_ator_ativo(self, grupo, atores, tempo):
+        return self._linha_do_tempo.ativos_ate(grupo, len(atores), tempo) > 0
 
     def _existe_passaro_ativo(self, tempo):
-        return self._verificar_se_existe_ator_ativo(self._passaros, tempo)
+        return self._verificar_se_existe_ator_ativo(PASSAROS, self._passaros, tempo)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+import math
+from bisect import bisect_left, bisect_right
+from heapq import heapify, heappop, heappush
+from itertools import chain
+
+from fase import Fase
+from trajetoria import tempo_de_entrada_na_caixa
+
+
+class FaseAnalitica(Fase):
+    '''
+    Fase cujas colisões são resolvidas analiticamente no lançamento, e não amostradas a cada quadro.
+
+    Ao lançar um pássaro é calculado, uma única vez, o primeiro tempo em que sua parábola entra na caixa de colisão
+    de cada obstáculo e porco e o tempo em que toca o chão. Esses eventos são processados numa fila de prioridade
+    em ordem de tempo, de modo que um alvo já destruído não pode ser atingido por outro pássaro. A fila só é
+    processada na consulta seguinte, então vários lançamentos ou atores adicionados custam uma única resolução.
+    Depois disso calcular_pontos, status e acabou são apenas consultas e o resultado independe da taxa de quadros.
+
+    Como as posições dos atores são arredondadas, a caixa de colisão vai até intervalo_de_colisao + 0.5 do alvo.
+    '''
+
+    def __init__(self, intervalo_de_colisao=1, duracao_do_tique=None, fisica=None):
+        super().__init__(intervalo_de_colisao, duracao_do_tique, fisica)
+        self._eventos = {}
+        self._colididos = []
+        self._alvos_por_x = None
+        self._resolver()
+
+    def _adicionar_ator(self, lista, *atores):
+        super()._adicionar_ator(lista, *atores)
+        for ator in atores:
+            ator.arredondar_posicao()
+        self._colididos.extend(ator for ator in atores if ator._tempo_de_colisao is not None)
+        if lista is not self._passaros:
+            # alvos novos mudam os eventos de todos os pássaros lançados, recalculados só na próxima consulta
+            self._alvos_por_x = None
+            for passaro in self._eventos:
+                self._eventos[passaro] = None
+        self._sujo = True
+
+    def lancar(self, angulo, tempo):
+        passaro = super().lancar(angulo, tempo)
+        if passaro is not None:
+            self._eventos[passaro] = self._calcular_eventos(passaro)
+            self._sujo = True
+        return passaro
+
+    def resetar(self):
+        super().resetar()
+        self._eventos.clear()
+        self._colididos = []
+        self._resolver()
+
+    def usar_fisica(self, fisica):
+        super().usar_fisica(fisica)
+        for passaro in self._eventos:
+            self._eventos[passaro] = None
+        self._sujo = True
+
+    def _restaurar_estado(self, ultimo_tempo):
+        super()._restaurar_estado(ultimo_tempo)
+        self._colididos = [ator for ator in chain(self._passaros, self._obstaculos, self._porcos)
+                           if ator._tempo_de_colisao is not None]
+        for passaro in self._passaros:
+            if passaro.foi_lancado():
+                self._eventos[passaro] = None
+        self._sujo = True
+
+    def resolver_colisoes(self):
+        '''
+        Resolve as colisões pendentes desde o último lançamento ou ator adicionado. As consultas, como
+        calcular_pontos e status, chamam este método; chame-o antes de ler o tempo de colisão direto dos atores.
+        '''
+        if self._sujo:
+            self._resolver()
+
+    def _calcular_eventos(self, passaro):
+        '''
+        Lista de eventos de um pássaro, ordenada por tempo: (tempo, ordem do alvo, alvo). O último evento é o
+        choque com o chão, representado com alvo None.
+        '''
+        trajetoria = passaro.trajetoria
+        x0, y0, vx, vy, gravidade = trajetoria.x0, trajetoria.y0, trajetoria.vx, trajetoria.vy, trajetoria.gravidade
+        lancamento = passaro._tempo_de_lancamento
+        chao = trajetoria.duracao_do_voo
+        intervalo = self.intervalo_de_colisao
+        margem = intervalo + 0.5
+        eventos = []
+        for ordem, alvo in self._alvos_ao_alcance(trajetoria):
+            t = tempo_de_entrada_na_caixa(x0, y0, vx, vy, gravidade, alvo.x - margem, alvo.x + margem,
+                                          alvo.y - margem, alvo.y + margem, chao)
+            if t is not None:
+                eventos.append((lancamento + t, ordem, alvo))
+        eventos.sort(key=lambda evento: evento[:2])
+        if chao != math.inf:
+            eventos.append((lancamento + chao, len(self._obstaculos) + len(self._porcos), None))
+        return eventos
+
+    def _alvos_ao_alcance(self, trajetoria):
+        'Pares (ordem, alvo) dos alvos dentro da caixa do voo, achados por busca binária nos alvos ordenados por x'
+        if self._alvos_por_x is None:
+            alvos = sorted(enumerate(chain(self._obstaculos, self._porcos)), key=lambda par: par[1].x)
+            self._alvos_por_x = ([alvo.x for _, alvo in alvos], alvos)
+        xs, alvos = self._alvos_por_x
+        margem = self.intervalo_de_colisao + 0.5
+        x_min, x_max, y_min, y_max = trajetoria.caixa
+        y_min, y_max = y_min - margem, y_max + margem
+        faixa = alvos[bisect_left(xs, x_min - margem):bisect_right(xs, x_max + margem)]
+        return [(ordem, alvo) for ordem, alvo in faixa if y_min <= alvo.y <= y_max]
+
+    def _resolver(self):
+        # só os atores que colidiram na resolução anterior precisam voltar a ficar ativos
+        for ator in self._colididos:
+            ator._tempo_de_colisao = None
+        colididos = self._colididos = []
+        for passaro, eventos in self._eventos.items():
+            if eventos is None:
+                self._eventos[passaro] = self._calcular_eventos(passaro)
+
+        ordem_dos_passaros = {passaro: ordem for ordem, passaro in enumerate(self._passaros)}
+        fila = [(eventos[0][0], ordem_dos_passaros[passaro], eventos[0][1], passaro, 0)
+                for passaro, eventos in self._eventos.items() if eventos]
+        heapify(fila)
+        inicio_dos_porcos = len(self._obstaculos)
+        passaros_colididos = porcos_destruidos = 0
+        fim_dos_passaros = fim_dos_porcos = -math.inf
+        while fila:
+            tempo, ordem, ordem_do_alvo, passaro, indice = heappop(fila)
+            eventos = self._eventos[passaro]
+            alvo = eventos[indice][2]
+            if alvo is None or alvo._tempo_de_colisao is None:
+                passaro._tempo_de_colisao = tempo
+                colididos.append(passaro)
+                passaros_colididos += 1
+                fim_dos_passaros = max(fim_dos_passaros, tempo)
+                if alvo is not None:
+                    alvo._tempo_de_colisao = tempo
+                    colididos.append(alvo)
+                    if ordem_do_alvo >= inicio_dos_porcos:
+                        porcos_destruidos += 1
+                        fim_dos_porcos = max(fim_dos_porcos, tempo)
+            elif indice + 1 < len(eventos):
+                proximo = eventos[indice + 1]
+                heappush(fila, (proximo[0], ordem, proximo[1], passaro, indice + 1))
+
+        # tempo a partir do qual nenhum porco, ou nenhum pássaro, está ativo
+        self._fim_dos_porcos = fim_dos_porcos if porcos_destruidos == len(self._porcos) else math.inf
+        self._fim_dos_passaros = fim_dos_passaros if passaros_colididos == len(self._passaros) else math.inf
+        self._sujo = False
+
+    def _calcular_posicoes(self, tempo):
+        self.resolver_colisoes()
+        super()._calcular_posicoes(tempo)
+
+    def _calcular_colisoes(self, tempo):
+        pass
+
+    def consultar_pontos(self, tempo):
+        self.resolver_colisoes()
+        return super().consultar_pontos(tempo)
+
+    def consultar_alteracoes(self, tempo, desde):
+        self.resolver_colisoes()
+        return super().consultar_alteracoes(tempo, desde)
+
+    def para_bytes(self):
+        self.resolver_colisoes()
+        return super().para_bytes()
+
+    def porcos_destruidos(self, tempo):
+        self.resolver_colisoes()
+        return super().porcos_destruidos(tempo)
+
+    def alvos_em_colunas(self):
+        self.resolver_colisoes()
+        return super().alvos_em_colunas()
+
+    def _existe_porco_ativo(self, tempo):
+        self.resolver_colisoes()
+        return tempo < self._fim_dos_porcos
+
+    def _existe_passaro_ativo(self, tempo):
+        self.resolver_colisoes()
+        return tempo < self._fim_dos_passaros
@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+import math
+from itertools import chain
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from fase import Fase, Ponto, OBSTACULOS, PORCOS, PASSAROS
+
+
+def _atores_sob_demanda(nome):
+    '''
+    Lista de atores que, numa fase montada com de_arrays, só é criada no primeiro acesso, e cujos objetos recebem o
+    estado dos arrays quando ela é lida depois de uma jogada
+    '''
+    atributo = '_lista' + nome
+
+    def ler(fase):
+        if fase._atores_pendentes or fase._atores_desatualizados:
+            fase.sincronizar_atores()
+        return getattr(fase, atributo)
+
+    def escrever(fase, atores):
+        setattr(fase, atributo, atores)
+
+    return property(ler, escrever)
+
+
+class FaseVetorizada(Fase):
+    '''
+    Fase que guarda o estado dos atores em arrays NumPy contíguos (x/y, ângulo e tempo de lançamento, tempo de
+    colisão e tipo) e calcula posições, colisões e choque com o chão de todos atores numa única passada por tempo.
+
+    Os atores adicionados são copiados para os arrays na primeira consulta; a partir daí os arrays são a fonte da
+    verdade. Os objetos de _passaros, _obstaculos e _porcos recebem o estado dos arrays quando essas listas são
+    lidas depois de lançamentos ou cálculos; sincronizar_atores faz a cópia a qualquer momento.
+    '''
+    _atores_pendentes = False
+    _atores_desatualizados = False
+    _passaros = _atores_sob_demanda('_passaros')
+    _obstaculos = _atores_sob_demanda('_obstaculos')
+    _porcos = _atores_sob_demanda('_porcos')
+
+    def __init__(self, intervalo_de_colisao=1, duracao_do_tique=None, fisica=None):
+        if np is None:
+            raise ImportError('FaseVetorizada depende do NumPy')
+        super().__init__(intervalo_de_colisao, duracao_do_tique, fisica)
+        self._sujo = True
+        self._construida = False
+
+    @classmethod
+    def de_arrays(cls, classes, tipos, x, y, quantidades, intervalo_de_colisao=1, duracao_do_tique=None,
+                  fisica=None):
+        '''
+        Monta a fase diretamente de arrays com o tipo (índice em classes), x e y de cada ator, na ordem pássaros,
+        obstáculos e porcos; quantidades é o par (quantidade de pássaros, quantidade de obstáculos).
+
+        Os objetos Ator só são criados no primeiro acesso a _passaros, _obstaculos ou _porcos, então mesmo fases
+        com milhões de atores são montadas sem passar por adicionar_passaro, adicionar_obstaculo e adicionar_porco.
+        '''
+        fase = cls(intervalo_de_colisao, duracao_do_tique, fisica)
+        n_passaros, n_obstaculos = quantidades
+        tipos = np.asarray(tipos, dtype=np.intp)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        fase._usar_arrays(list(classes), tipos[:n_passaros], x[:n_passaros].copy(), y[:n_passaros].copy(),
+                          tipos[n_passaros:], x[n_passaros:], y[n_passaros:], n_obstaculos)
+        fase._tempo_de_lancamento = np.full(n_passaros, math.nan)
+        fase._angulo_de_lancamento = np.full(n_passaros, math.nan)
+        fase._cos = np.full(n_passaros, math.nan)
+        fase._sin = np.full(n_passaros, math.nan)
+        fase._colisao_passaro = np.full(n_passaros, math.inf)
+        fase._colisao_alvo = np.full(len(fase._tipo_alvo), math.inf)
+        fase._atores_pendentes = True
+        fase._passaros_criados = {}
+        return fase
+
+    def _materializar_atores(self):
+        'Cria os objetos Ator de uma fase montada com de_arrays e copia para eles o estado dos arrays'
+        self._atores_pendentes = False
+        tipos = self._tipos
+        criados = self._passaros_criados
+        passaros = [criados.get(i) or tipos[t](x, y) for i, (t, x, y) in
+                    enumerate(zip(self._tipo_passaro.tolist(), self._x_inicial.tolist(), self._y_inicial.tolist()))]
+        for passaro in passaros:
+            passaro.usar_fisica(self.fisica)
+        alvos = [tipos[t](x, y) for t, x, y in zip(self._tipo_alvo.tolist(), self._x_alvo.tolist(),
+                                                    self._y_alvo.tolist())]
+        for grupo, lista, atores in ((PASSAROS, self._lista_passaros, passaros),
+                                     (OBSTACULOS, self._lista_obstaculos, alvos[:self._inicio_porcos]),
+                                     (PORCOS, self._lista_porcos, alvos[self._inicio_porcos:])):
+            lista.extend(atores)
+            self._registrar(grupo, lista, atores)
+        self.sincronizar_atores()
+
+    def _adicionar_ator(self, lista, *atores):
+        if self._construida:
+            self.sincronizar_atores()
+        super()._adicionar_ator(lista, *atores)
+        self._sujo = True
+
+    def _construir_arrays(self):
+        if not self._sujo:
+            return
+        tipos = []
+        indices_de_tipo = {}
+
+        def tag(ator):
+            tipo = type(ator)
+            if tipo not in indices_de_tipo:
+                indices_de_tipo[tipo] = len(tipos)
+                tipos.append(tipo)
+            return indices_de_tipo[tipo]
+
+        def tempo_ou(valor, padrao):
+            return padrao if valor is None else valor
+
+        passaros = self._passaros
+        alvos = list(chain(self._obstaculos, self._porcos))
+        self._usar_arrays(tipos, np.array([tag(p) for p in passaros], dtype=np.intp),
+                          np.array([p._x_inicial for p in passaros], dtype=float),
+                          np.array([p._y_inicial for p in passaros], dtype=float),
+                          np.array([tag(a) for a in alvos], dtype=np.intp),
+                          np.array([a.x for a in alvos], dtype=float), np.array([a.y for a in alvos], dtype=float),
+                          len(self._obstaculos))
+        self._tempo_de_lancamento = np.array([tempo_ou(p._tempo_de_lancamento, math.nan) for p in passaros],
+                                             dtype=float)
+        self._angulo_de_lancamento = np.array([tempo_ou(p._angulo_de_lancamento, math.nan) for p in passaros],
+                                              dtype=float)
+        # cosseno e seno calculados com math no lançamento para reproduzir exatamente o cálculo de Passaro
+        self._cos = np.array([math.cos(a) for a in self._angulo_de_lancamento])
+        self._sin = np.array([math.sin(a) for a in self._angulo_de_lancamento])
+        self._colisao_passaro = np.array([tempo_ou(p._tempo_de_colisao, math.inf) for p in passaros], dtype=float)
+        self._colisao_alvo = np.array([tempo_ou(a._tempo_de_colisao, math.inf) for a in alvos], dtype=float)
+
+    def _usar_arrays(self, tipos, tipo_passaro, x_inicial, y_inicial, tipo_alvo, x_alvo, y_alvo, inicio_porcos):
+        'Guarda os arrays que não mudam durante o jogo: tipos, posições iniciais e posições dos alvos'
+        self._tipos = tipos
+        self._tipo_passaro = tipo_passaro
+        self._velocidade_passaro = self._velocidades()
+        self._x_inicial = x_inicial
+        self._y_inicial = y_inicial
+        self._x_passaro = np.round(x_inicial).astype(np.int64)
+        self._y_passaro = np.round(y_inicial).astype(np.int64)
+        self._tipo_alvo = tipo_alvo
+        self._x_alvo = np.round(x_alvo).astype(np.int64)
+        self._y_alvo = np.round(y_alvo).astype(np.int64)
+        self._inicio_porcos = inicio_porcos
+        self._ordem_dos_alvos = np.argsort(self._x_alvo, kind='stable')
+        self._x_alvo_ordenado = self._x_alvo[self._ordem_dos_alvos]
+        self._caracteres_ativos = [t._caracter_ativo for t in tipos]
+        self._caracteres_destruidos = [t._caracter_destruido for t in tipos]
+        self._sujo = False
+        self._construida = True
+
+    def _velocidades(self):
+        # uma consulta à física por tipo de pássaro, não por pássaro
+        tabela = np.zeros(len(self._tipos))
+        for tipo in np.unique(self._tipo_passaro).tolist():
+            tabela[tipo] = self.fisica.velocidade(self._tipos[tipo])
+        return tabela[self._tipo_passaro]
+
+    def usar_fisica(self, fisica):
+        if self._atores_pendentes:
+            self.fisica = fisica  # os pássaros recebem a física quando forem criados
+        else:
+            super().usar_fisica(fisica)
+        if self._construida and not self._sujo:
+            self._velocidade_passaro = self._velocidades()
+
+    def sincronizar_atores(self):
+        'Copia o estado dos arrays para os objetos Ator originais'
+        if self._atores_pendentes:
+            self._materializar_atores()  # que volta aqui depois de criar os objetos
+            return
+        if not self._construida:
+            return
+        self._atores_desatualizados = False
+
+        def tempo_ou_none(valor):
+            return None if math.isinf(valor) or math.isnan(valor) else valor
+
+        for i, passaro in enumerate(self._lista_passaros):
+            passaro._tempo_de_colisao = tempo_ou_none(self._colisao_passaro[i])
+            passaro._tempo_de_lancamento = tempo_ou_none(self._tempo_de_lancamento[i])
+            passaro._angulo_de_lancamento = tempo_ou_none(self._angulo_de_lancamento[i])
+            passaro._trajetoria = None
+            passaro.x, passaro.y = int(self._x_passaro[i]), int(self._y_passaro[i])
+        for i, ator in enumerate(chain(self._lista_obstaculos, self._lista_porcos)):
+            ator._tempo_de_colisao = tempo_ou_none(self._colisao_alvo[i])
+
+    def para_bytes(self):
+        self.sincronizar_atores()
+        return super().para_bytes()
+
+    def lancar(self, angulo, tempo):
+        tempo = self._quantizar(tempo)
+        self._construir_arrays()
+        nao_lancados = np.flatnonzero(np.isnan(self._tempo_de_lancamento))
+        if len(nao_lancados):
+            i = int(nao_lancados[0])
+            radianos = math.radians(angulo)
+            self._tempo_de_lancamento[i] = tempo
+            self._angulo_de_lancamento[i] = radianos
+            self._cos[i] = math.cos(radianos)
+            self._sin[i] = math.sin(radianos)
+            self._linha_do_tempo.registrar_lancamento(tempo)
+            self._atores_desatualizados = True
+            passaro = self._passaro(i)
+            passaro.lancar(angulo, tempo)
+            if self.duracao_do_tique is not None:
+                passaro.usar_ponto_fixo(self.duracao_do_tique)
+            return passaro
+
+    def _passaro(self, i):
+        'Objeto do pássaro i; numa fase montada com de_arrays, só ele é criado, e reaproveitado ao criar os demais'
+        if not self._atores_pendentes:
+            return self._lista_passaros[i]
+        passaro = self._passaros_criados.get(i)
+        if passaro is None:
+            passaro = self._tipos[self._tipo_passaro[i]](float(self._x_inicial[i]), float(self._y_inicial[i]))
+            passaro.usar_fisica(self.fisica)
+            self._passaros_criados[i] = passaro
+        return passaro
+
+    def resetar(self):
+        if self._atores_pendentes:
+            self._linha_do_tempo.limpar_lancamentos()
+            self._proximo_passaro = 0
+        else:
+            super().resetar()
+        if self._construida:
+            self._tempo_de_lancamento[:] = math.nan
+            self._angulo_de_lancamento[:] = math.nan
+            self._cos[:] = math.nan
+            self._sin[:] = math.nan
+            self._colisao_passaro[:] = math.inf
+            self._colisao_alvo[:] = math.inf
+            self._atores_desatualizados = False  # os objetos já foram resetados junto com os arrays
+
+    def _existe_porco_ativo(self, tempo):
+        self._construir_arrays()
+        return bool(np.any(self._colisao_alvo[self._inicio_porcos:] > tempo))
+
+    def porcos_destruidos(self, tempo):
+        self._construir_arrays()
+        tempo = self._quantizar(tempo)
+        return int(np.count_nonzero(self._colisao_alvo[self._inicio_porcos:] <= tempo))
+
+    def quantidade_de_passaros(self):
+        # sem criar os objetos de uma fase montada com de_arrays
+        self._construir_arrays()
+        return len(self._tipo_passaro)
+
+    def quantidade_de_obstaculos(self):
+        self._construir_arrays()
+        return self._inicio_porcos
+
+    def alvos_em_colunas(self):
+        self._construir_arrays()
+        return self._x_alvo.copy(), self._y_alvo.copy(), self._colisao_alvo.copy()
+
+    def _existe_passaro_ativo(self, tempo):
+        self._construir_arrays()
+        return bool(np.any(self._colisao_passaro > tempo))
+
+    def calcular_pontos(self, tempo):
+        self._construir_arrays()
+        return super().calcular_pontos(tempo)
+
+    def calcular_posicoes(self, tempo):
+        self._construir_arrays()
+        return super().calcular_posicoes(tempo)
+
+    def consultar_pontos(self, tempo):
+        self._construir_arrays()
+        tempo = self._quantizar(tempo)
+        return self._pontos(tempo, *self._posicoes_dos_passaros(tempo))
+
+    def calcular_alteracoes(self, tempo, desde=None):
+        self._construir_arrays()
+        return super().calcular_alteracoes(tempo, desde)
+
+    def consultar_alteracoes(self, tempo, desde):
+        self._construir_arrays()
+        tempo, desde = self._quantizar(tempo), self._quantizar(desde)
+        x_antes, y_antes = self._posicoes_dos_passaros(desde)
+        x, y = self._posicoes_dos_passaros(tempo)
+        return self._pontos_alterados(tempo, x, y, x_antes, y_antes, self._colisao_passaro > desde,
+                                      self._colisao_alvo > desde)
+
+    def _quantidade_de_atores(self):
+        return len(self._tipo_passaro) + len(self._tipo_alvo)
+
+    def _guardar_referencia(self, tempo, pontos):
+        self._referencia = (self._x_passaro, self._y_passaro, self._colisao_passaro > tempo,
+                            self._colisao_alvo > tempo)
+        self._tamanho_da_referencia = len(pontos)
+
+    def _alteracoes(self, tempo):
+        alteracoes = self._pontos_alterados(tempo, self._x_passaro, self._y_passaro, *self._referencia)
+        self._referencia = (self._x_passaro, self._y_passaro, self._colisao_passaro > tempo,
+                            self._colisao_alvo > tempo)
+        return alteracoes
+
+    def _pontos_alterados(self, tempo, x, y, x_antes, y_antes, passaro_ativo_antes, alvo_ativo_antes):
+        ativos, destruidos = self._caracteres_ativos, self._caracteres_destruidos
+        passaro_ativo = self._colisao_passaro > tempo
+        alvo_ativo = self._colisao_alvo > tempo
+        alteracoes = []
+        for i in np.flatnonzero((x != x_antes) | (y != y_antes) | (passaro_ativo != passaro_ativo_antes)).tolist():
+            tipo = self._tipo_passaro[i]
+            alteracoes.append((i, Ponto(int(x[i]), int(y[i]), ativos[tipo] if passaro_ativo[i] else destruidos[tipo])))
+        inicio = len(x)
+        for j in np.flatnonzero(alvo_ativo != alvo_ativo_antes).tolist():
+            tipo = self._tipo_alvo[j]
+            alteracoes.append((inicio + j, Ponto(int(self._x_alvo[j]), int(self._y_alvo[j]),
+                                                 ativos[tipo] if alvo_ativo[j] else destruidos[tipo])))
+        return alteracoes
+
+    def _calcular_posicoes(self, tempo):
+        self._x_passaro, self._y_passaro = self._posicoes_dos_passaros(tempo)
+        self._atores_desatualizados = True
+
+    def _posicoes_dos_passaros(self, tempo):
+        tempo_de_lancamento = self._tempo_de_lancamento
+        colisao = self._colisao_passaro
+        with np.errstate(invalid='ignore'):
+            aguardando = np.isnan(tempo_de_lancamento) | (tempo < tempo_de_lancamento)
+            ja_colidiu = ~aguardando & (colisao <= tempo)
+        delta_t = np.where(ja_colidiu, colisao, tempo) - tempo_de_lancamento
+        velocidade = self._velocidade_passaro
+        # mesma ordem de operações de Trajetoria, para obter exatamente as mesmas posições
+        x = self._x_inicial + (velocidade * self._cos) * delta_t
+        y = self._y_inicial + (velocidade * self._sin) * delta_t - (self.fisica.gravidade / 2) * delta_t * delta_t
+        x = np.where(aguardando, self._x_inicial, x)
+        y = np.where(aguardando, self._y_inicial, y)
+        return np.round(x).astype(np.int64), np.round(y).astype(np.int64)
+
+    def _calcular_colisoes(self, tempo):
+        if len(self._tipo_alvo) == 0:
+            return
+        ativos = np.flatnonzero(self._colisao_passaro > tempo)
+        if len(ativos) == 0:
+            return
+        intervalo = self.intervalo_de_colisao
+        x, y = self._x_passaro[ativos], self._y_passaro[ativos]
+        alvo_ativo = self._colisao_alvo > tempo
+        no_chao = y <= 0
+        # pares (pássaro, alvos candidatos em ordem) dos pássaros que podem colidir com algum alvo
+        colisoes = []
+        chao = ativos[no_chao]
+        if len(chao):
+            # Passaro confere o chão logo após o primeiro alvo, então apenas ele pode ser atingido
+            if alvo_ativo[0]:
+                perto = ((np.abs(x[no_chao] - self._x_alvo[0]) <= intervalo) &
+                         (np.abs(y[no_chao] - self._y_alvo[0]) <= intervalo))
+                colisoes.extend((i, (0,)) for i in chao[perto].tolist())
+            self._colisao_passaro[chao] = tempo
+        no_ar = ~no_chao
+        if no_ar.any():
+            colisoes.extend(self._candidatos_por_posicao(ativos[no_ar], x[no_ar], y[no_ar], alvo_ativo))
+        # Resolução sequencial apenas para os pássaros com algum candidato, respeitando a ordem dos pássaros:
+        # um alvo destruído por um pássaro não pode ser atingido pelos seguintes no mesmo tempo.
+        colisoes.sort(key=itemgetter(0))
+        destruidos = set()
+        for i, candidatos in colisoes:
+            for j in candidatos:
+                if j not in destruidos:
+                    self._colidir_com_alvo(i, j, tempo, destruidos)
+                    break
+
+    def _candidatos_por_posicao(self, passaros, x, y, alvo_ativo):
+        '''
+        Pares (pássaro, alvos candidatos) procurados uma vez por posição: os pássaros parados no mesmo lugar, como os
+        que aguardam lançamento, são testados juntos. Só os alvos da faixa de x em torno da posição, achada por
+        busca binária nos alvos ordenados por x, são comparados.
+        '''
+        intervalo = self.intervalo_de_colisao
+        posicoes, grupos = np.unique(np.stack([x, y], axis=1), axis=0, return_inverse=True)
+        grupos = grupos.reshape(-1)
+        inicios, fins = self._faixas_de_alvos(posicoes[:, 0])
+        com_faixa = np.flatnonzero(fins > inicios)
+        if len(com_faixa) == 0:
+            return []
+        ordem = np.argsort(grupos, kind='stable')
+        limites = np.searchsorted(grupos[ordem], np.arange(len(posicoes) + 1))
+        colisoes = []
+        for grupo in com_faixa.tolist():
+            faixa = self._ordem_dos_alvos[inicios[grupo]:fins[grupo]]
+            faixa = faixa[(np.abs(self._y_alvo[faixa] - posicoes[grupo, 1]) <= intervalo) & alvo_ativo[faixa]]
+            if len(faixa) == 0:
+                continue
+            # na ordem dos alvos, obstáculos e depois porcos, a mesma da GradeEspacial
+            candidatos = np.sort(faixa).tolist()
+            # cada pássaro do grupo destrói um candidato ou encontra todos destruídos, então os que passam da
+            # quantidade de candidatos nunca colidem
+            membros = passaros[ordem[limites[grupo]:limites[grupo + 1]][:len(candidatos)]]
+            colisoes.extend((i, candidatos) for i in membros.tolist())
+        return colisoes
+
+    def _faixas_de_alvos(self, x):
+        'Início e fim, em _ordem_dos_alvos, dos alvos a até intervalo_de_colisao de cada x'
+        intervalo = self.intervalo_de_colisao
+        return (np.searchsorted(self._x_alvo_ordenado, x - intervalo, 'left'),
+                np.searchsorted(self._x_alvo_ordenado, x + intervalo, 'right'))
+
+    def _colidir_com_alvo(self, i, j, tempo, destruidos):
+        self._colisao_passaro[i] = tempo
+        self._colisao_alvo[j] = tempo
+        destruidos.add(j)
+
+    def _gerar_pontos(self, tempo):
+        return self._pontos(tempo, self._x_passaro, self._y_passaro)
+
+    def _pontos(self, tempo, x_passaro, y_passaro):
+        ativos, destruidos = self._caracteres_ativos, self._caracteres_destruidos
+        pontos = [Ponto(x, y, ativos[t] if ativo else destruidos[t])
+                  for x, y, t, ativo in zip(x_passaro.tolist(), y_passaro.tolist(),
+                                            self._tipo_passaro.tolist(), (self._colisao_passaro > tempo).tolist())]
+        pontos.extend(Ponto(x, y, ativos[t] if ativo else destruidos[t])
+                      for x, y, t, ativo in zip(self._x_alvo.tolist(), self._y_alvo.tolist(),
+                                                self._tipo_alvo.tolist(), (self._colisao_alvo > tempo).tolist()))
+        return pontos
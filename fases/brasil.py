@@ -8,9 +8,9 @@ sys.path.append(project_dir)
 
 from atores import PassaroAmarelo, PassaroVermelho, Obstaculo, Porco
 from fase import Fase
-from placa_grafica_tkinter import rodar_fase
 
-if __name__ == '__main__':
+
+def criar_fase():
     fase = Fase(intervalo_de_colisao=10)
 
 
@@ -40,5 +40,10 @@ if __name__ == '__main__':
         fase.adicionar_porco(Porco(x0 + delta_x * i, meio - delta_y * i))
         fase.adicionar_porco(Porco(x0 + (n + i - 1) * delta_x, meio + (n - i) * delta_y))
         fase.adicionar_porco(Porco(x0 + (n + i - 1) * delta_x, meio + (i - n) * delta_y))
+    return fase
+
+
+if __name__ == '__main__':
+    from placa_grafica_tkinter import rodar_fase
 
-    rodar_fase(fase)
\ No newline at end of file
+    rodar_fase(criar_fase())
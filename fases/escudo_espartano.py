@@ -9,10 +9,10 @@ sys.path.append(project_dir)
 
 from atores import PassaroAmarelo, PassaroVermelho, Obstaculo, Porco
 from fase import Fase
-from placa_grafica_tkinter import rodar_fase
 from random import randint
 
-if __name__ == '__main__':
+
+def criar_fase():
     fase = Fase(intervalo_de_colisao=10)
 
 
@@ -39,5 +39,10 @@ if __name__ == '__main__':
         x = randint(590, 631)
         y = randint(0, 21)
         fase.adicionar_porco(Porco(x, y))
+    return fase
+
+
+if __name__ == '__main__':
+    from placa_grafica_tkinter import rodar_fase
 
-    rodar_fase(fase)
\ No newline at end of file
+    rodar_fase(criar_fase())
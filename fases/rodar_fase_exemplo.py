@@ -8,9 +8,9 @@ sys.path.append(project_dir)
 
 from atores import PassaroAmarelo, PassaroVermelho, Obstaculo, Porco
 from fase import Fase
-from placa_grafica_tkinter import rodar_fase
 
-if __name__ == '__main__':
+
+def criar_fase():
     fase = Fase(intervalo_de_colisao=10)
 
 
@@ -29,5 +29,10 @@ if __name__ == '__main__':
     # Porcos
     for i in range(30, 300, 32):
         fase.adicionar_porco(Porco(600, i))
+    return fase
+
+
+if __name__ == '__main__':
+    from placa_grafica_tkinter import rodar_fase
 
-    rodar_fase(fase)
\ No newline at end of file
+    rodar_fase(criar_fase())
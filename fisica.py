@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+GRAVIDADE = 10  # m/s^2
+
+
+class Fisica():
+    '''
+    Parâmetros físicos de uma fase: gravidade, velocidade escalar de cada tipo de pássaro e escala.
+
+    Cada Fase tem a sua, então fases em escalas diferentes (ASCII e Tk, por exemplo) podem ser simuladas lado a lado
+    no mesmo processo ou pool de threads. Tipos de pássaro ausentes em velocidades usam o atributo de classe
+    velocidade_escalar. A escala multiplica gravidade e velocidades, mantendo a forma das trajetórias em unidades
+    maiores. Uma Fisica não muda depois de criada; use escalada para obter outra.
+    '''
+    __slots__ = ('_gravidade', '_velocidades', '_escala', '_cache')
+
+    def __init__(self, gravidade=GRAVIDADE, velocidades=None, escala=1):
+        self._gravidade = gravidade
+        self._velocidades = dict(velocidades or {})
+        self._escala = escala
+        self._cache = {}
+
+    def __getstate__(self):
+        return self._gravidade, self._velocidades, self._escala
+
+    def __setstate__(self, estado):
+        self.__init__(*estado)
+
+    def __eq__(self, outra):
+        return isinstance(outra, Fisica) and self.__getstate__() == outra.__getstate__()
+
+    def __hash__(self):
+        return hash((self._gravidade, self._escala, tuple(sorted(self._velocidades.items(), key=repr))))
+
+    def __repr__(self):
+        return 'Fisica(gravidade=%r, velocidades=%r, escala=%r)' % self.__getstate__()
+
+    @property
+    def gravidade(self):
+        'Aceleração da gravidade já na escala'
+        return self._gravidade * self._escala
+
+    @property
+    def escala(self):
+        return self._escala
+
+    def velocidade(self, tipo_de_passaro):
+        'Velocidade escalar, já na escala, dos pássaros de tipo_de_passaro'
+        try:
+            velocidade = self._cache[tipo_de_passaro]
+        except KeyError:
+            velocidade = self._cache[tipo_de_passaro] = next(
+                (self._velocidades[classe] for classe in tipo_de_passaro.__mro__ if classe in self._velocidades), None)
+        if velocidade is None:
+            # o atributo de classe é lido a cada consulta, então alterá-lo vale também para as físicas já criadas
+            velocidade = tipo_de_passaro.velocidade_escalar
+        return velocidade * self._escala
+
+    def escalada(self, fator):
+        'Nova Fisica com a escala multiplicada por fator'
+        return Fisica(self._gravidade, self._velocidades, self._escala * fator)
+
+
+FISICA_PADRAO = Fisica()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+'''
+Gerador procedural de fases: a mesma semente e os mesmos parâmetros geram sempre a mesma fase.
+
+Os porcos são espalhados nos dois terços mais distantes do mundo e os obstáculos ficam na frente de porcos
+sorteados, como escudos. Opcionalmente só são mantidas as fases que solucionador.resolver consegue vencer com até
+N lançamentos; essa verificação roda num pool de processos e o resultado é o mesmo de uma execução serial.
+
+O solucionador usa o modelo analítico de FaseAnalitica, que não depende da taxa de quadros. Como as fases jogadas
+amostram as colisões a cada quadro, a solução encontrada é repetida com simulador.simular na fase padrão de
+arquivo_de_fase.criar_fase, com o passo delta_t do jogo, e a fase só é mantida se também vencer ali.
+
+    python gerador_de_fases.py fases/geradas --quantidade 1000 --semente 42 --porcos 8 --lancamentos 12
+'''
+import argparse
+import multiprocessing
+import os
+import random
+from array import array
+from collections import namedtuple
+
+from arquivo_de_fase import EXTENSAO_BINARIA, EXTENSAO_DE_TEXTO, Nivel, criar_fase, salvar
+from atores import Obstaculo, PassaroAmarelo, PassaroVermelho, Porco
+from fase_analitica import FaseAnalitica
+from fisica import FISICA_PADRAO
+from simulador import simular
+from solucionador import resolver
+
+PASSAROS_PADRAO = ((PassaroVermelho, 1), (PassaroAmarelo, 1))
+DELTA_T_PADRAO = 0.1  # passo de placa_grafica.animar
+
+FaseGerada = namedtuple('FaseGerada', 'indice nivel lancamentos')
+
+_parametros = None
+
+
+def gerar_nivel(semente, porcos=5, densidade_de_obstaculos=0.05, largura=80, passaros=PASSAROS_PADRAO,
+                quantidade_de_passaros=None, intervalo_de_colisao=1, posicao_de_lancamento=(3, 3), fisica=None):
+    '''
+    Nivel gerado a partir de semente. densidade_de_obstaculos é a quantidade de obstáculos por unidade de largura do
+    mundo e passaros a mistura de pássaros, como pares (classe, peso). Sem quantidade_de_passaros são criados dois
+    pássaros por porco.
+    '''
+    aleatorio = random.Random(semente)
+    inicio, altura = largura // 3, max(largura // 4, 1)
+    posicoes_dos_porcos = [(aleatorio.randrange(inicio, largura), aleatorio.randint(0, altura))
+                           for _ in range(porcos)]
+    posicoes_dos_obstaculos = []
+    for _ in range(round(densidade_de_obstaculos * largura)):
+        if posicoes_dos_porcos:
+            x, y = aleatorio.choice(posicoes_dos_porcos)
+            x -= aleatorio.randint(intervalo_de_colisao + 1, 3 * (intervalo_de_colisao + 1))
+            y = max(y + aleatorio.randint(-intervalo_de_colisao, 2 * intervalo_de_colisao), 0)
+        else:
+            x, y = aleatorio.randrange(inicio, largura), aleatorio.randint(0, altura)
+        posicoes_dos_obstaculos.append((x, y))
+
+    classes, pesos = zip(*passaros)
+    if quantidade_de_passaros is None:
+        quantidade_de_passaros = 2 * porcos
+    tipos_dos_passaros = aleatorio.choices(range(len(classes)), pesos, k=quantidade_de_passaros)
+    x0, y0 = posicao_de_lancamento
+    classes = list(classes) + [Obstaculo, Porco]
+    posicoes = posicoes_dos_obstaculos + posicoes_dos_porcos
+    tipos = array('B', tipos_dos_passaros)
+    tipos.extend([len(classes) - 2] * len(posicoes_dos_obstaculos))
+    tipos.extend([len(classes) - 1] * len(posicoes_dos_porcos))
+    x = array('d', [x0] * quantidade_de_passaros + [p[0] for p in posicoes])
+    y = array('d', [y0] * quantidade_de_passaros + [p[1] for p in posicoes])
+    return Nivel(intervalo_de_colisao, None, fisica or FISICA_PADRAO, classes, tipos, x, y,
+                 (quantidade_de_passaros, len(posicoes_dos_obstaculos)))
+
+
+def gerar_fase(semente, classe_de_fase=None, **parametros):
+    'Fase de classe_de_fase gerada a partir de semente, ver gerar_nivel e arquivo_de_fase.criar_fase'
+    return criar_fase(gerar_nivel(semente, **parametros), classe_de_fase)
+
+
+def semente_da_fase(semente, indice):
+    'Semente da fase indice de uma série gerada com semente'
+    return '%s:%s' % (semente, indice)
+
+
+def _iniciar_trabalhador(parametros):
+    global _parametros
+    _parametros = parametros
+
+
+def _gerar(indice):
+    semente, lancamentos_maximos, delta_t, parametros = _parametros
+    nivel = gerar_nivel(semente_da_fase(semente, indice), **parametros)
+    if lancamentos_maximos is None:
+        return FaseGerada(indice, nivel, None)
+    analitica = criar_fase(nivel, FaseAnalitica)
+    lancamentos = resolver(analitica, lancamentos_maximos)
+    if lancamentos is None or not _vence_no_jogo(nivel, lancamentos, delta_t, analitica._fim_dos_porcos):
+        return None
+    return FaseGerada(indice, nivel, lancamentos)
+
+
+def _vence_no_jogo(nivel, lancamentos, delta_t, fim_analitico):
+    '''
+    Se os lançamentos também vencem a fase padrão de criar_fase, que amostra as colisões a cada delta_t. Os pássaros
+    que sobram nunca são lançados, então a simulação para pouco depois de quando o modelo analítico vence.
+    '''
+    return 'ganhou' in simular(criar_fase(nivel), lancamentos, delta_t, fim_analitico + 1).status
+
+
+def gerar_fases(semente, quantidade, lancamentos_maximos=None, tentativas=None, processos=None,
+                tamanho_do_lote=16, delta_t=DELTA_T_PADRAO, **parametros):
+    '''
+    Gera até quantidade FaseGerada, com os parâmetros de gerar_nivel, a de índice i a partir de
+    semente_da_fase(semente, i). Com lancamentos_maximos só são mantidas as fases vencidas por solucionador.resolver
+    com até esse número de lançamentos, que ficam em lancamentos, e que esses lançamentos também vencem quando
+    simulados na fase padrão com passo delta_t; são testados no máximo tentativas índices, por padrão 100 por fase
+    pedida. processos=1 executa tudo no processo atual.
+    '''
+    argumentos = ((semente, lancamentos_maximos, delta_t, parametros),)
+    if tentativas is None:
+        tentativas = quantidade if lancamentos_maximos is None else 100 * quantidade
+    if processos == 1:
+        _iniciar_trabalhador(*argumentos)
+        yield from _primeiras(map(_gerar, range(tentativas)), quantidade)
+        return
+    with multiprocessing.Pool(processos, _iniciar_trabalhador, argumentos) as pool:
+        # rodadas limitadas, para não enfileirar todas as tentativas quando as fases pedidas aparecem cedo
+        rodada = tamanho_do_lote * 4 * (processos or os.cpu_count() or 1)
+        for inicio in range(0, tentativas, rodada):
+            geradas = pool.imap(_gerar, range(inicio, min(inicio + rodada, tentativas)), tamanho_do_lote)
+            for gerada in _primeiras(geradas, quantidade):
+                yield gerada
+                quantidade -= 1
+            if quantidade <= 0:
+                return
+
+
+def _primeiras(geradas, quantidade):
+    if quantidade <= 0:
+        return
+    for gerada in geradas:
+        if gerada is not None:
+            yield gerada
+            quantidade -= 1
+            if quantidade == 0:
+                return
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Gera fases a partir de uma semente e as grava como arquivos de fase')
+    parser.add_argument('destino', help='diretório onde as fases são gravadas')
+    parser.add_argument('--quantidade', type=int, default=100)
+    parser.add_argument('--semente', default='0')
+    parser.add_argument('--porcos', type=int, default=5)
+    parser.add_argument('--densidade-de-obstaculos', type=float, default=0.05)
+    parser.add_argument('--largura', type=int, default=80)
+    parser.add_argument('--vermelhos', type=float, default=1, help='peso dos pássaros vermelhos na mistura')
+    parser.add_argument('--amarelos', type=float, default=1, help='peso dos pássaros amarelos na mistura')
+    parser.add_argument('--lancamentos', type=int, help='mantém só as fases vencidas com até tantos lançamentos')
+    parser.add_argument('--delta-t', type=float, default=DELTA_T_PADRAO,
+                        help='passo do jogo em que as soluções são conferidas')
+    parser.add_argument('--processos', type=int, help='padrão: número de CPUs')
+    parser.add_argument('--binario', action='store_true', help='grava no formato binário')
+    argumentos = parser.parse_args(argumentos)
+
+    os.makedirs(argumentos.destino, exist_ok=True)
+    passaros = [(classe, peso) for classe, peso in ((PassaroVermelho, argumentos.vermelhos),
+                                                    (PassaroAmarelo, argumentos.amarelos)) if peso > 0]
+    extensao = EXTENSAO_BINARIA if argumentos.binario else EXTENSAO_DE_TEXTO
+    geradas = gerar_fases(argumentos.semente, argumentos.quantidade, argumentos.lancamentos,
+                          processos=argumentos.processos, delta_t=argumentos.delta_t, porcos=argumentos.porcos,
+                          densidade_de_obstaculos=argumentos.densidade_de_obstaculos, largura=argumentos.largura,
+                          passaros=passaros)
+    for gerada in geradas:
+        salvar(gerada.nivel, os.path.join(argumentos.destino, 'fase_%06d%s' % (gerada.indice, extensao)))
+
+
+if __name__ == '__main__':
+    main()
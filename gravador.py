@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+'''
+Gravação de partidas para replay: quadros-chave periódicos com todos os pontos e, entre eles, apenas as alterações
+de cada quadro, como em Fase.calcular_alteracoes.
+
+Os quadros são agrupados em segmentos de tamanho fixo que começam sempre num quadro-chave. Um segmento completo é
+codificado, opcionalmente comprimido com zlib, e gravado no armazenamento (memória ou arquivo), de onde só volta
+quando algum quadro dele é pedido. O índice guarda apenas a posição de cada segmento, então achar um quadro é uma
+divisão e reconstruí-lo custa no máximo um segmento, independentemente da duração da partida. Gravando direto em
+arquivo, a memória usada fica limitada a um segmento e ao índice.
+
+Layout do arquivo, em little-endian:
+
+    cabeçalho   magic 'PBGR', versão, quadros por segmento (uint32), comprimido (uint8)
+    segmentos   quantidade de quadros (uint32) e, para cada quadro: tempo (float64), quantidade de pontos e bytes
+                dos caracteres (uint32), índices dos pontos (uint32, ausentes no quadro-chave), x e y (int32) e
+                caracteres em utf-8, um por ponto; comprimido com zlib se indicado no cabeçalho
+    índice      posição e tamanho de cada segmento (uint64)
+    rodapé      quantidade de quadros, de segmentos e posição do índice (uint64), magic 'PBGI'
+'''
+import io
+import shutil
+import struct
+import sys
+import zlib
+from array import array
+
+from empacotamento import FormatoInvalido
+from fase import Ponto
+
+MAGICO = b'PBGR'
+MAGICO_DO_RODAPE = b'PBGI'
+VERSAO = 1
+_CABECALHO = struct.Struct('<4sHIB')
+_RODAPE = struct.Struct('<QQQ4s')
+_QUANTIDADE = struct.Struct('<I')
+_QUADRO = struct.Struct('<dII')
+_MENOR_INT32, _MAIOR_INT32 = -2 ** 31, 2 ** 31 - 1
+
+
+def _para_bytes(tipo, valores):
+    coluna = array(tipo, valores)
+    if sys.byteorder != 'little':
+        coluna.byteswap()
+    return coluna.tobytes()
+
+
+def _de_bytes(tipo, dados, posicao, quantidade):
+    coluna = array(tipo)
+    fim = posicao + coluna.itemsize * quantidade
+    coluna.frombytes(dados[posicao:fim])
+    if sys.byteorder != 'little':
+        coluna.byteswap()
+    return coluna, fim
+
+
+def _validar(pontos):
+    # o formato guarda x e y como int32 e separa os caracteres do quadro contando um por ponto
+    for ponto in pontos:
+        if not (_MENOR_INT32 <= ponto.x <= _MAIOR_INT32 and _MENOR_INT32 <= ponto.y <= _MAIOR_INT32):
+            raise ValueError('Ponto fora do intervalo gravável: (%s, %s)' % (ponto.x, ponto.y))
+        if len(ponto.caracter) != 1:
+            raise ValueError('Ponto com caracter de tamanho diferente de 1: %r' % (ponto.caracter,))
+
+
+def _codificar_segmento(quadros, comprimir):
+    partes = [_QUANTIDADE.pack(len(quadros))]
+    for numero, (tempo, indices, pontos) in enumerate(quadros):
+        caracteres = ''.join(ponto.caracter for ponto in pontos).encode('utf-8')
+        partes.append(_QUADRO.pack(tempo, len(pontos), len(caracteres)))
+        if numero:
+            partes.append(_para_bytes('I', indices))
+        partes.append(_para_bytes('i', [ponto.x for ponto in pontos]))
+        partes.append(_para_bytes('i', [ponto.y for ponto in pontos]))
+        partes.append(caracteres)
+    dados = b''.join(partes)
+    return zlib.compress(dados) if comprimir else dados
+
+
+def _decodificar_segmento(dados, comprimido):
+    if comprimido:
+        dados = zlib.decompress(dados)
+    quantidade, = _QUANTIDADE.unpack_from(dados)
+    posicao = _QUANTIDADE.size
+    quadros = []
+    for numero in range(quantidade):
+        tempo, n_pontos, n_caracteres = _QUADRO.unpack_from(dados, posicao)
+        posicao += _QUADRO.size
+        indices = None
+        if numero:
+            indices, posicao = _de_bytes('I', dados, posicao, n_pontos)
+        xs, posicao = _de_bytes('i', dados, posicao, n_pontos)
+        ys, posicao = _de_bytes('i', dados, posicao, n_pontos)
+        caracteres = dados[posicao:posicao + n_caracteres].decode('utf-8')
+        posicao += n_caracteres
+        quadros.append((tempo, indices, [Ponto(x, y, c) for x, y, c in zip(xs, ys, caracteres)]))
+    return quadros
+
+
+def _aplicar(estado, indices, pontos):
+    for indice, ponto in zip(indices, pontos):
+        if indice >= len(estado):
+            estado.extend([None] * (indice + 1 - len(estado)))
+        estado[indice] = ponto
+
+
+class Gravacao():
+    '''
+    Quadros gravados, com acesso aleatório. Use Gravacao.abrir para ler um arquivo gravado por Gravador; o arquivo
+    fica aberto até fechar.
+    '''
+
+    def __init__(self, armazenamento, quadros_por_segmento, comprimida):
+        self.quadros_por_segmento = quadros_por_segmento
+        self.comprimida = comprimida
+        self._armazenamento = armazenamento
+        self._posicoes = array('Q')
+        self._tamanhos = array('Q')
+        self._quantidade_de_quadros = 0
+        self._segmento_decodificado = (None, None)
+        self._estado = (None, None, None, None)  # segmento, quadro, tempo e pontos do último quadro reconstruído
+
+    @classmethod
+    def abrir(cls, caminho):
+        arquivo = open(caminho, 'rb')
+        try:
+            magico, versao, quadros_por_segmento, comprimida = _CABECALHO.unpack(arquivo.read(_CABECALHO.size))
+            if magico != MAGICO:
+                raise FormatoInvalido('Não é uma gravação')
+            if versao != VERSAO:
+                raise FormatoInvalido('Versão %s não suportada' % versao)
+            if arquivo.seek(0, io.SEEK_END) < _CABECALHO.size + _RODAPE.size:
+                raise FormatoInvalido('Gravação incompleta: o gravador não foi fechado')
+            arquivo.seek(-_RODAPE.size, io.SEEK_END)
+            quadros, segmentos, posicao_do_indice, magico = _RODAPE.unpack(arquivo.read(_RODAPE.size))
+            if magico != MAGICO_DO_RODAPE:
+                raise FormatoInvalido('Gravação incompleta: o gravador não foi fechado')
+            gravacao = cls(arquivo, quadros_por_segmento, bool(comprimida))
+            arquivo.seek(posicao_do_indice)
+            indice, _ = _de_bytes('Q', arquivo.read(16 * segmentos), 0, 2 * segmentos)
+            gravacao._posicoes = indice[0::2]
+            gravacao._tamanhos = indice[1::2]
+            gravacao._quantidade_de_quadros = quadros
+            return gravacao
+        except Exception:
+            arquivo.close()
+            raise
+
+    def __len__(self):
+        return self._quantidade_de_quadros
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def fechar(self):
+        self._armazenamento.close()
+
+    def quadro(self, numero):
+        'Tempo e lista de pontos do quadro numero, reconstruída a partir do quadro-chave do seu segmento'
+        self._verificar(numero)
+        segmento = numero // self.quadros_por_segmento
+        quadros = self._quadros_do_segmento(segmento)
+        ultimo_segmento, ultimo_quadro, tempo, estado = self._estado
+        if ultimo_segmento == segmento and ultimo_quadro <= numero:
+            inicio = ultimo_quadro - segmento * self.quadros_por_segmento + 1
+            estado = list(estado)
+        else:
+            inicio = 1
+            tempo, _, pontos = quadros[0]
+            estado = list(pontos)
+        for tempo, indices, pontos in quadros[inicio:numero - segmento * self.quadros_por_segmento + 1]:
+            _aplicar(estado, indices, pontos)
+        self._estado = (segmento, numero, tempo, estado)
+        return tempo, list(estado)
+
+    def pontos(self, numero):
+        return self.quadro(numero)[1]
+
+    def tempo(self, numero):
+        self._verificar(numero)
+        return self._quadros_do_segmento(numero // self.quadros_por_segmento)[numero % self.quadros_por_segmento][0]
+
+    def alteracoes(self, numero):
+        '''
+        Pontos que mudaram do quadro numero - 1 para numero, como pares (índice, Ponto); num quadro-chave são
+        todos os pontos.
+        '''
+        self._verificar(numero)
+        tempo, indices, pontos = self._quadros_do_segmento(numero // self.quadros_por_segmento)[
+            numero % self.quadros_por_segmento]
+        return list(zip(range(len(pontos)) if indices is None else indices, pontos))
+
+    def _verificar(self, numero):
+        if not 0 <= numero < len(self):
+            raise IndexError('Quadro %s fora da gravação' % numero)
+
+    def _quadros_do_segmento(self, segmento):
+        decodificado, quadros = self._segmento_decodificado
+        if decodificado != segmento:
+            self._armazenamento.seek(self._posicoes[segmento])
+            quadros = _decodificar_segmento(self._armazenamento.read(self._tamanhos[segmento]), self.comprimida)
+            self._segmento_decodificado = (segmento, quadros)
+        return quadros
+
+
+class Gravador(Gravacao):
+    '''
+    Grava os quadros de uma fase enquanto ela é jogada. Use calcular_pontos ou calcular_alteracoes no lugar dos
+    métodos da fase: o gravador é quem consulta a fase, já que as alterações são relativas à chamada anterior.
+
+    Sem arquivo a gravação fica em memória, crescendo com a partida, e fechar a descarta: guarde-a antes com salvar
+    ou para_bytes. Com arquivo os segmentos são escritos à medida que ficam completos e fechar grava o índice.
+    arquivo pode ser um caminho ou um arquivo binário aberto para leitura e escrita, como tempfile.TemporaryFile(),
+    que passa a pertencer ao gravador e é fechado por fechar.
+
+    Cada ponto gravado precisa ter x e y no intervalo de int32 e caracter com exatamente um caractere; senão
+    calcular_alteracoes lança ValueError.
+    '''
+
+    def __init__(self, fase, quadros_por_segmento=64, comprimir=True, arquivo=None):
+        if arquivo is None:
+            armazenamento = io.BytesIO()
+        elif hasattr(arquivo, 'write'):
+            armazenamento = arquivo
+        else:
+            armazenamento = open(arquivo, 'w+b')
+        super().__init__(armazenamento, quadros_por_segmento, comprimir)
+        self.fase = fase
+        self._segmento_aberto = []
+        armazenamento.write(_CABECALHO.pack(MAGICO, VERSAO, quadros_por_segmento, comprimir))
+
+    def calcular_alteracoes(self, tempo):
+        'Calcula a fase em tempo, grava o quadro e retorna os pontos alterados, como Fase.calcular_alteracoes'
+        if len(self._segmento_aberto) == self.quadros_por_segmento:
+            self._fechar_segmento()
+        if self._segmento_aberto:
+            alteracoes = self.fase.calcular_alteracoes(tempo)
+            _validar(ponto for _, ponto in alteracoes)
+            self._segmento_aberto.append((tempo, array('I', [indice for indice, _ in alteracoes]),
+                                          [ponto for _, ponto in alteracoes]))
+        else:
+            pontos = self.fase.quadro_chave(tempo)
+            _validar(pontos)
+            alteracoes = list(enumerate(pontos))
+            self._segmento_aberto.append((tempo, None, pontos))
+        self._quantidade_de_quadros += 1
+        return alteracoes
+
+    def calcular_pontos(self, tempo):
+        'Calcula a fase em tempo, grava o quadro e retorna todos os pontos, como Fase.calcular_pontos'
+        self.calcular_alteracoes(tempo)
+        return self.pontos(len(self) - 1)
+
+    def salvar(self, caminho):
+        'Grava o que já foi gravado em caminho, sem interromper a gravação'
+        with open(caminho, 'wb') as arquivo:
+            self._copiar(arquivo)
+
+    def para_bytes(self):
+        'O que já foi gravado, no formato de arquivo, sem interromper a gravação'
+        arquivo = io.BytesIO()
+        self._copiar(arquivo)
+        return arquivo.getvalue()
+
+    def _copiar(self, arquivo):
+        self._armazenamento.seek(0)
+        shutil.copyfileobj(self._armazenamento, arquivo)
+        fim = arquivo.tell()
+        posicoes, tamanhos = array('Q', self._posicoes), array('Q', self._tamanhos)
+        if self._segmento_aberto:
+            segmento = _codificar_segmento(self._segmento_aberto, self.comprimida)
+            posicoes.append(fim)
+            tamanhos.append(len(segmento))
+            arquivo.write(segmento)
+        self._escrever_indice(arquivo, posicoes, tamanhos)
+
+    def fechar(self):
+        '''
+        Termina a gravação; gravando em arquivo, escreve o índice e o arquivo pode ser lido com Gravacao.abrir. Em
+        memória a gravação é descartada.
+        '''
+        if self._segmento_aberto:
+            self._fechar_segmento()
+        if not isinstance(self._armazenamento, io.BytesIO):
+            self._armazenamento.seek(0, io.SEEK_END)
+            self._escrever_indice(self._armazenamento, self._posicoes, self._tamanhos)
+        super().fechar()
+
+    def _escrever_indice(self, arquivo, posicoes, tamanhos):
+        posicao_do_indice = arquivo.tell()
+        indice = array('Q', [0]) * (2 * len(posicoes))
+        indice[0::2] = posicoes
+        indice[1::2] = tamanhos
+        arquivo.write(_para_bytes('Q', indice))
+        arquivo.write(_RODAPE.pack(len(self), len(posicoes), posicao_do_indice, MAGICO_DO_RODAPE))
+
+    def _fechar_segmento(self):
+        segmento = _codificar_segmento(self._segmento_aberto, self.comprimida)
+        self._armazenamento.seek(0, io.SEEK_END)
+        self._posicoes.append(self._armazenamento.tell())
+        self._tamanhos.append(len(segmento))
+        self._armazenamento.write(segmento)
+        self._segmento_aberto = []
+
+    def _quadros_do_segmento(self, segmento):
+        if segmento == len(self._posicoes):
+            return self._segmento_aberto
+        return super()._quadros_do_segmento(segmento)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from operator import itemgetter
+
+from atores import ATIVO
+
+
+class GradeEspacial():
+    '''
+    Índice espacial de grade uniforme para atores estáticos (obstáculos e porcos).
+
+    Cada ator é guardado com uma chave que define sua ordem de colisão. Atores destruídos são retirados da grade
+    quando aparecem numa consulta e podem ser devolvidos com restaurar ao voltar no tempo. Atores adicionados só
+    são distribuídos nas células na consulta seguinte, o que deixa barato montar ou carregar fases grandes.
+    '''
+
+    def __init__(self, tamanho_da_celula=1):
+        self.tamanho_da_celula = max(tamanho_da_celula, 1)
+        self._celulas = {}
+        self._removidos = []
+        self._pendentes = []
+
+    def _celula(self, x, y):
+        return int(x // self.tamanho_da_celula), int(y // self.tamanho_da_celula)
+
+    def adicionar(self, chave, ator):
+        self.adicionar_varios([(chave, ator)])
+
+    def adicionar_varios(self, itens):
+        'Adiciona pares (chave, ator) de uma vez, usado ao montar fases grandes'
+        self._pendentes.extend(itens)
+
+    def _indexar_pendentes(self):
+        pendentes, self._pendentes = self._pendentes, []
+        tamanho = self.tamanho_da_celula
+        celulas = self._celulas
+        for item in pendentes:
+            ator = item[1]
+            x, y = ator.coordenadas()
+            celula = (int(x // tamanho), int(y // tamanho))
+            lista = celulas.get(celula)
+            if lista is None:
+                celulas[celula] = [item]
+            else:
+                lista.append(item)
+
+    def candidatos(self, x, y, raio, tempo):
+        'Atores ativos em tempo cujas células podem estar a até raio de (x, y), na ordem de suas chaves'
+        if self._pendentes:
+            self._indexar_pendentes()
+        x_min, y_min = self._celula(x - raio, y - raio)
+        x_max, y_max = self._celula(x + raio, y + raio)
+        encontrados = []
+        for cx in range(x_min, x_max + 1):
+            for cy in range(y_min, y_max + 1):
+                celula = self._celulas.get((cx, cy))
+                if not celula:
+                    continue
+                destruidos = [item for item in celula if item[1].status(tempo) != ATIVO]
+                for item in destruidos:
+                    celula.remove(item)
+                self._removidos.extend(destruidos)
+                encontrados.extend(celula)
+        encontrados.sort(key=itemgetter(0))
+        return [ator for _, ator in encontrados]
+
+    def restaurar(self, tempo):
+        'Devolve à grade os atores removidos que voltam a estar ativos em tempo'
+        removidos, self._removidos = self._removidos, []
+        for item in removidos:
+            if item[1].status(tempo) == ATIVO:
+                self._pendentes.append(item)
+            else:
+                self._removidos.append(item)
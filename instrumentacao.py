@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+'''
+Instrumentação opcional de uma fase e das placas gráficas: contadores dos caminhos críticos e tempo de relógio de
+cada fase do quadro.
+
+Nada no motor conhece a instrumentação. Ao ligá-la, os métodos da fase e as funções de desenho da placa são
+envolvidos por versões que medem e contam; ao desligá-la, os originais são devolvidos. Desligada, portanto, ela
+não custa nada.
+
+    with Instrumentacao() as instrumentacao:
+        instrumentacao.instrumentar_fase(fase)
+        instrumentacao.instrumentar_placa(placa_grafica)
+        placa_grafica.animar(fase)
+    print(instrumentacao.estatisticas.resumo())
+
+Contadores:
+
+    testes_de_colisao       pares pássaro e alvo examinados pelo motor de colisão da fase
+    avaliacoes_de_posicao   posições de pássaros calculadas por calcular_pontos e consultar_pontos
+    pontos_criados          objetos Ponto criados pela fase, em quadros completos ou alterações
+    quadros_desenhados      chamadas às funções de desenho da placa
+
+Fases do quadro: posicoes, colisoes, pontos e desenho. Um quadro começa em cada chamada externa a calcular_pontos,
+consultar_pontos, calcular_alteracoes ou consultar_alteracoes e termina quando o próximo começa ou a
+instrumentação é desligada; o desenho feito entre eles conta para esse quadro.
+'''
+import time
+from collections import Counter
+
+from fase_analitica import FaseAnalitica
+from fase_vetorizada import FaseVetorizada
+
+TESTES_DE_COLISAO = 'testes_de_colisao'
+AVALIACOES_DE_POSICAO = 'avaliacoes_de_posicao'
+PONTOS_CRIADOS = 'pontos_criados'
+QUADROS_DESENHADOS = 'quadros_desenhados'
+
+POSICOES = 'posicoes'
+COLISOES = 'colisoes'
+PONTOS = 'pontos'
+DESENHO = 'desenho'
+
+
+class Ganchos():
+    'Interface dos ganchos de instrumentação; a implementação padrão de cada método não faz nada'
+
+    def ao_contar(self, contador, quantidade):
+        pass
+
+    def ao_terminar_quadro(self, quadro, duracoes):
+        'duracoes é um dicionário fase do quadro -> segundos gastos nela durante o quadro de número quadro'
+        pass
+
+
+class Estatisticas(Ganchos):
+    'Ganchos que acumulam os contadores e as durações de cada quadro'
+
+    def __init__(self):
+        self.contadores = Counter()
+        self.quadros = []
+
+    def ao_contar(self, contador, quantidade):
+        self.contadores[contador] += quantidade
+
+    def ao_terminar_quadro(self, quadro, duracoes):
+        self.quadros.append(duracoes)
+
+    def resumo(self):
+        'Contadores, quantidade de quadros e tempo total e médio por quadro de cada fase do quadro'
+        totais = Counter()
+        for duracoes in self.quadros:
+            totais.update(duracoes)
+        quadros = len(self.quadros)
+        return {'contadores': dict(self.contadores), 'quadros': quadros,
+                'segundos': {fase: total for fase, total in totais.items()},
+                'segundos_por_quadro': {fase: total / quadros for fase, total in totais.items()}}
+
+
+class Instrumentacao():
+    '''
+    Liga a instrumentação nas fases e placas gráficas indicadas e repassa contadores e quadros aos ganchos. Sem
+    ganchos, usa um Estatisticas, disponível em estatisticas.
+    '''
+
+    def __init__(self, *ganchos):
+        self.estatisticas = None
+        if not ganchos:
+            self.estatisticas = Estatisticas()
+            ganchos = (self.estatisticas,)
+        self.ganchos = list(ganchos)
+        self._originais = []
+        self._quadro = None
+        self._quantidade_de_quadros = 0
+        self._profundidade = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.desligar()
+
+    def instrumentar_fase(self, fase):
+        for nome in ('calcular_pontos', 'consultar_pontos', 'calcular_alteracoes', 'consultar_alteracoes'):
+            self._envolver(fase, nome, self._como_quadro)
+        self._envolver(fase, '_calcular_posicoes', self._medindo(POSICOES))
+        self._envolver(fase, '_calcular_posicoes', self._contando(AVALIACOES_DE_POSICAO,
+                                                                 lambda *_: _quantidade_de_passaros(fase)))
+        self._envolver(fase, 'consultar_pontos', self._contando(AVALIACOES_DE_POSICAO,
+                                                               lambda *_: _quantidade_de_passaros(fase)))
+        self._envolver(fase, '_calcular_colisoes', self._medindo(COLISOES))
+        for nome in ('_gerar_pontos', '_alteracoes', 'consultar_pontos', 'consultar_alteracoes'):
+            self._envolver(fase, nome, self._medindo(PONTOS))
+        for nome in ('_gerar_pontos', '_alteracoes', 'consultar_pontos', 'consultar_alteracoes'):
+            self._envolver(fase, nome, self._contando(PONTOS_CRIADOS, resultado=len))
+        self._contar_testes_de_colisao(fase)
+        return fase
+
+    def instrumentar_placa(self, placa):
+        'Envolve as funções de desenho listadas em FUNCOES_DE_DESENHO do módulo da placa gráfica'
+        for nome in placa.FUNCOES_DE_DESENHO:
+            self._envolver(placa, nome, self._medindo(DESENHO))
+            self._envolver(placa, nome, self._contando(QUADROS_DESENHADOS, lambda *_: 1))
+        return placa
+
+    def desligar(self):
+        'Termina o quadro em andamento e devolve todos os métodos e funções originais'
+        self._terminar_quadro()
+        while self._originais:
+            dono, nome, original = self._originais.pop()
+            if original is None:
+                delattr(dono, nome)
+            else:
+                setattr(dono, nome, original)
+
+    def contar(self, contador, quantidade=1):
+        for gancho in self.ganchos:
+            gancho.ao_contar(contador, quantidade)
+
+    def _contar_testes_de_colisao(self, fase):
+        if isinstance(fase, FaseAnalitica):
+            # as colisões são resolvidas no lançamento, testando a trajetória contra os alvos dentro da caixa do voo
+            self._envolver(fase, '_alvos_ao_alcance', self._contando(TESTES_DE_COLISAO, resultado=len))
+        elif isinstance(fase, FaseVetorizada):
+            # cada posição ocupada por pássaros ativos é comparada com os alvos da sua faixa de x
+            self._envolver(fase, '_faixas_de_alvos', self._contando(
+                TESTES_DE_COLISAO, resultado=lambda faixas: int((faixas[1] - faixas[0]).sum())))
+        else:
+            self._envolver(fase._indice, 'candidatos', self._contando(TESTES_DE_COLISAO, resultado=len))
+
+    def _envolver(self, dono, nome, envoltorio):
+        # atributos que vêm da classe são apenas removidos do dono ao desligar
+        original = vars(dono).get(nome)
+        setattr(dono, nome, envoltorio(getattr(dono, nome)))
+        self._originais.append((dono, nome, original))
+
+    def _como_quadro(self, funcao):
+        def quadro(*argumentos, **nomeados):
+            if self._profundidade == 0:
+                self._terminar_quadro()
+                self._quadro = {}
+            self._profundidade += 1
+            try:
+                return funcao(*argumentos, **nomeados)
+            finally:
+                self._profundidade -= 1
+        return quadro
+
+    def _terminar_quadro(self):
+        if self._quadro is not None:
+            quadro, self._quadro = self._quadro, None
+            self._quantidade_de_quadros += 1
+            for gancho in self.ganchos:
+                gancho.ao_terminar_quadro(self._quantidade_de_quadros, quadro)
+
+    def _medindo(self, fase_do_quadro):
+        relogio = time.perf_counter
+
+        def envoltorio(funcao):
+            def medida(*argumentos, **nomeados):
+                inicio = relogio()
+                try:
+                    return funcao(*argumentos, **nomeados)
+                finally:
+                    if self._quadro is None:
+                        self._quadro = {}
+                    self._quadro[fase_do_quadro] = self._quadro.get(fase_do_quadro, 0) + relogio() - inicio
+            return medida
+        return envoltorio
+
+    def _contando(self, contador, argumentos=None, resultado=None):
+        'Conta quantidade(*argumentos) antes ou quantidade(resultado) depois de cada chamada'
+        def envoltorio(funcao):
+            def contada(*args, **nomeados):
+                if argumentos is not None:
+                    self.contar(contador, argumentos(*args))
+                retorno = funcao(*args, **nomeados)
+                if resultado is not None:
+                    self.contar(contador, resultado(retorno))
+                return retorno
+            return contada
+        return envoltorio
+
+
+def _quantidade_de_passaros(fase):
+    if isinstance(fase, FaseVetorizada):
+        return len(fase._tipo_passaro)
+    return len(fase._passaros)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left, bisect_right, insort
+
+
+class TemposOrdenados():
+    '''
+    Multiconjunto ordenado de tempos de colisão de um grupo de atores.
+
+    Serve de observador dos atores: cada vez que o tempo de colisão de um ator muda, o tempo antigo é retirado e o
+    novo inserido, de modo que a quantidade de atores destruídos até um tempo qualquer sai de uma busca binária,
+    ou em tempo constante quando o tempo consultado está depois da última colisão. versao muda a cada alteração.
+    '''
+
+    def __init__(self):
+        self._tempos = []
+        self.versao = 0
+
+    def __len__(self):
+        return len(self._tempos)
+
+    def adicionar(self, tempo):
+        insort(self._tempos, tempo)
+        self.versao += 1
+
+    def adicionar_varios(self, tempos):
+        self._tempos.extend(tempos)
+        self._tempos.sort()
+        self.versao += 1
+
+    def remover(self, tempo):
+        del self._tempos[bisect_left(self._tempos, tempo)]
+        self.versao += 1
+
+    def contar_ate(self, tempo):
+        tempos = self._tempos
+        # consultas no fim do jogo ou antes de qualquer colisão, as mais comuns, não precisam de busca binária
+        if not tempos or tempo >= tempos[-1]:
+            return len(tempos)
+        if tempo < tempos[0]:
+            return 0
+        return bisect_right(tempos, tempo)
+
+    def ultimo(self):
+        return self._tempos[-1] if self._tempos else None
+
+    def ao_alterar_colisao(self, ator, antigo, novo):
+        if antigo is not None:
+            self.remover(antigo)
+        if novo is not None:
+            self.adicionar(novo)
+
+
+class LinhaDoTempo():
+    'Linha do tempo ordenada com lançamentos e colisões de uma fase, separadas por grupo de atores'
+
+    def __init__(self, *grupos):
+        self._colisoes = {grupo: TemposOrdenados() for grupo in grupos}
+        self.lancamentos = TemposOrdenados()
+
+    def registrar(self, grupo, *atores):
+        'Passa a acompanhar as colisões dos atores, inclusive colisões que eles já tenham'
+        colisoes = self._colisoes[grupo]
+        for ator in atores:
+            ator._observador = colisoes
+        colisoes.adicionar_varios([ator._colisao for ator in atores if ator._colisao is not None])
+
+    def registrar_lancamento(self, tempo):
+        self.lancamentos.adicionar(tempo)
+
+    def limpar_lancamentos(self):
+        self.lancamentos = TemposOrdenados()
+
+    def destruidos_ate(self, grupo, tempo):
+        return self._colisoes[grupo].contar_ate(tempo)
+
+    def ativos_ate(self, grupo, quantidade, tempo):
+        'Quantos dos quantidade atores do grupo continuam ativos em tempo'
+        return quantidade - self._colisoes[grupo].contar_ate(tempo)
+
+    def lancados_ate(self, tempo):
+        return self.lancamentos.contar_ate(tempo)
+
+    def ultima_colisao(self, grupo):
+        return self._colisoes[grupo].ultimo()
+
+    def versao(self, grupo):
+        'Muda sempre que algum tempo de colisão do grupo muda'
+        return self._colisoes[grupo].versao
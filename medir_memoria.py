@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+'''
+Mede quantos bytes cada ator ocupa em memória, comparando as classes com __slots__ com classes equivalentes que
+guardam os atributos num __dict__, como era antes.
+
+    python medir_memoria.py [quantidade]
+'''
+import sys
+import tracemalloc
+
+from atores import Obstaculo, Porco, PassaroAmarelo, PassaroVermelho
+from fase import Ponto
+from fisica import FISICA_PADRAO
+
+
+class _AtorComDict():
+    'Mesmos atributos de Ator, guardados num __dict__'
+
+    def __init__(self, x=0, y=0):
+        self.y = y
+        self.x = x
+        self._observador = None
+        self._colisao = None
+
+
+class _PassaroComDict(_AtorComDict):
+    'Mesmos atributos de Passaro, guardados num __dict__'
+
+    def __init__(self, x=0, y=0):
+        super().__init__(x, y)
+        self._x_inicial = x
+        self._y_inicial = y
+        self._tempo_de_lancamento = None
+        self._angulo_de_lancamento = None
+        self._trajetoria = None
+        self._fisica = FISICA_PADRAO
+
+
+class _PontoComDict():
+    def __init__(self, x, y, caracter):
+        self.caracter = caracter
+        self.x = x
+        self.y = y
+
+
+def atributos(instancia):
+    'Nomes dos atributos da instância, estejam em __slots__ ou em __dict__'
+    if hasattr(instancia, '__dict__'):
+        return set(vars(instancia))
+    return {nome for classe in type(instancia).__mro__ for nome in getattr(classe, '__slots__', ())}
+
+
+def bytes_por_instancia(fabrica, quantidade=100000):
+    'Memória alocada por instância criada com fabrica(), medida com tracemalloc'
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    instancias = [fabrica() for _ in range(quantidade)]
+    fim = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # descontando a lista que guarda as instâncias
+    return (fim - inicio - sys.getsizeof(instancias)) / quantidade
+
+
+MEDICOES = [
+    ('Obstaculo', lambda: _AtorComDict(31, 10), lambda: Obstaculo(31, 10)),
+    ('Porco', lambda: _AtorComDict(78, 1), lambda: Porco(78, 1)),
+    ('PassaroVermelho', lambda: _PassaroComDict(3, 3), lambda: PassaroVermelho(3, 3)),
+    ('PassaroAmarelo', lambda: _PassaroComDict(3, 3), lambda: PassaroAmarelo(3, 3)),
+    ('Ponto', lambda: _PontoComDict(78, 1, '@'), lambda: Ponto(78, 1, '@')),
+]
+
+
+def medir(quantidade=100000):
+    return [(nome, bytes_por_instancia(antes, quantidade), bytes_por_instancia(depois, quantidade))
+            for nome, antes, depois in MEDICOES]
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print('%-16s %14s %14s' % ('Classe', 'Com __dict__', 'Com __slots__'))
+    for nome, antes, depois in medir(quantidade):
+        print('%-16s %12.1f B %12.1f B' % (nome, antes, depois))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+'''
+Avaliação de Monte Carlo de uma fase: muitas sequências aleatórias de lançamentos simuladas em paralelo.
+
+A fase é enviada uma única vez para cada processo do pool; depois disso só as sequências de lançamentos trafegam
+entre os processos. Com a mesma semente, o resultado é idêntico ao de uma execução serial.
+
+    python monte_carlo.py python_birds --simulacoes 10000 --semente 42
+'''
+import argparse
+import importlib
+import multiprocessing
+import pickle
+import random
+from collections import namedtuple
+
+from simulador import simular
+
+Estatisticas = namedtuple('Estatisticas', 'simulacoes vitorias taxa_de_vitoria porcos_destruidos_em_media '
+                                          'tempo_medio_das_vitorias')
+
+_fase_serializada = None
+_parametros = None
+
+
+def gerar_sequencias(semente, quantidade, lancamentos_por_sequencia, angulos=(0, 90), intervalo=(0.5, 3)):
+    'Gera quantidade sequências de (angulo, tempo) a partir da semente, com intervalos aleatórios entre lançamentos'
+    aleatorio = random.Random(semente)
+    for _ in range(quantidade):
+        tempo = 0
+        sequencia = []
+        for _ in range(lancamentos_por_sequencia):
+            tempo += aleatorio.uniform(*intervalo)
+            sequencia.append((aleatorio.uniform(*angulos), tempo))
+        yield sequencia
+
+
+def _iniciar_trabalhador(fase_serializada, parametros):
+    global _fase_serializada, _parametros
+    _fase_serializada = fase_serializada
+    _parametros = parametros
+
+
+def _avaliar_sequencia(sequencia):
+    'Simula uma sequência numa cópia nova da fase e retorna (ganhou, porcos destruídos, tempo final)'
+    fase = pickle.loads(_fase_serializada)
+    delta_t, tempo_maximo = _parametros
+    resultado = simular(fase, sequencia, delta_t, tempo_maximo)
+    return 'ganhou' in resultado.status, fase.porcos_destruidos(resultado.tempo), resultado.tempo
+
+
+def _agregar(resultados):
+    simulacoes = vitorias = porcos_destruidos = 0
+    tempo_das_vitorias = 0.0
+    for ganhou, porcos, tempo in resultados:
+        simulacoes += 1
+        porcos_destruidos += porcos
+        if ganhou:
+            vitorias += 1
+            tempo_das_vitorias += tempo
+    return Estatisticas(simulacoes, vitorias, vitorias / simulacoes if simulacoes else 0,
+                        porcos_destruidos / simulacoes if simulacoes else 0,
+                        tempo_das_vitorias / vitorias if vitorias else None)
+
+
+def avaliar(fase, sequencias, delta_t=0.01, tempo_maximo=1000, processos=None, tamanho_do_lote=16):
+    '''
+    Simula cada sequência de lançamentos numa cópia da fase e agrega taxa de vitória, porcos destruídos e tempo
+    até a vitória. sequencias pode ser um gerador: elas são enviadas aos processos em lotes, conforme consumidas.
+    processos=1 executa tudo no processo atual.
+    '''
+    argumentos = (pickle.dumps(fase), (delta_t, tempo_maximo))
+    if processos == 1:
+        _iniciar_trabalhador(*argumentos)
+        return _agregar(map(_avaliar_sequencia, sequencias))
+    with multiprocessing.Pool(processos, _iniciar_trabalhador, argumentos) as pool:
+        # imap preserva a ordem, então a agregação é a mesma da execução serial
+        return _agregar(pool.imap(_avaliar_sequencia, sequencias, tamanho_do_lote))
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Avalia uma fase com sequências aleatórias de lançamentos')
+    parser.add_argument('modulo', help='módulo com uma função criar_fase(), ex: python_birds ou fases.brasil')
+    parser.add_argument('--simulacoes', type=int, default=1000)
+    parser.add_argument('--lancamentos', type=int, help='lançamentos por sequência, padrão: número de pássaros')
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--delta-t', type=float, default=0.01)
+    parser.add_argument('--tempo-maximo', type=float, default=1000)
+    parser.add_argument('--processos', type=int, help='padrão: número de CPUs')
+    argumentos = parser.parse_args(argumentos)
+
+    fase = importlib.import_module(argumentos.modulo).criar_fase()
+    lancamentos = argumentos.lancamentos or fase.quantidade_de_passaros()
+    sequencias = gerar_sequencias(argumentos.semente, argumentos.simulacoes, lancamentos)
+    estatisticas = avaliar(fase, sequencias, argumentos.delta_t, argumentos.tempo_maximo, argumentos.processos)
+    for campo, valor in estatisticas._asdict().items():
+        print('%-28s %s' % (campo, valor))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,91 +1,202 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import os
 import platform
-import time
-import sys
+import signal
+import tempfile
+import threading
+from contextlib import contextmanager
+from gravador import Gravador
+from relogio import Cadencia, Relogio
+from terminal import LeitorDeLinhas, Terminal
+from visor import Visor
 from templates import FIM
 
-try:
-    import msvcrt
-except:
-    pass
-import select
-
-
 eh_windows = platform.system() == 'Windows'
-apagar_tela = lambda: os.system('cls') if eh_windows else lambda: os.system('clear')
-
-# workaround retirado de http://stackoverflow.com/questions/292095/polling-the-keyboard-in-python
-
-
-def ouvir_teclado_fn():
-    i, o, e = select.select([sys.stdin], [], [], 0.0001)
-    for s in i:
-        if s == sys.stdin:
-            return True
-    return False
-
-
-if eh_windows:
-    ouvir_teclado = msvcrt.kbhit
-else:
-    ouvir_teclado = ouvir_teclado_fn
 
 LARGURA = 80
 ALTURA = 20
 
-
-def desenhar_e_esperar(delta_t, fase, passo, tempo, msg):
-    time.sleep(passo)
-    apagar_tela()
-    pontos_cartesianos = fase.calcular_pontos(tempo)
-    print('%s Tempo: %.2f' % (msg, tempo))
-    print(desenhar(*pontos_cartesianos))
-    tempo += delta_t
-    return tempo
-
-
-def _animar(delta_t, fase, passo, tempo, msg):
-    while not fase.acabou(tempo):
-        tempo = desenhar_e_esperar(delta_t, fase, passo, tempo, msg)
-    return tempo
-
-
-def _jogar(delta_t, fase, passo, tempo, msg):
-    while not fase.acabou(tempo):
-        tempo = desenhar_e_esperar(delta_t, fase, passo, tempo, msg)
-        entrada = ouvir_teclado()
-        if entrada:
-            while True:
+# funções que desenham um quadro, envolvidas por instrumentacao para medir o tempo de desenho
+FUNCOES_DE_DESENHO = ('desenhar',)
+
+
+class Tela():
+    '''
+    Terminal e visor de uma partida. São criados por animar, e não na importação do módulo, que também é usado por
+    benchmarks, instrumentacao e testes.
+    '''
+
+    def __init__(self, terminal=None, visor=None):
+        # guarda o último quadro exibido para escrever só as células que mudaram
+        self.terminal = Terminal() if terminal is None else terminal
+        # janela do mundo exibida, do tamanho do terminal
+        self.visor = Visor() if visor is None else visor
+        self.redimensionada = False
+
+    def ao_redimensionar(self, *_):
+        self.redimensionada = True
+
+    def exibir_quadro(self, msg, tempo):
+        'Exibe os pontos do visor que estão dentro dele'
+        visor = self.visor
+        if self.redimensionada:
+            self.redimensionada = False
+            visor.ajustar_ao_terminal()
+            self.terminal.apagar()
+        quadro = desenhar(*visor.pontos_visiveis(), largura=visor.largura, altura=visor.altura)
+        # uma linha mais larga que o terminal quebraria e desalinharia as linhas do quadro
+        cabecalho = ('%s Tempo: %.2f' % (msg, tempo))[:visor.largura]
+        self.terminal.exibir(cabecalho + os.linesep + quadro)
+
+    def rolar_visor(self, comando):
+        'Trata comandos de rolagem: cada < ou > anda meia tela e c volta a seguir os pássaros'
+        if comando == 'c':
+            self.visor.seguir()
+        elif comando and set(comando) <= set('<>'):
+            self.visor.rolar((comando.count('>') - comando.count('<')) * (self.visor.largura // 2))
+        else:
+            return False
+        return True
+
+    @contextmanager
+    def observar_redimensionamento(self):
+        '''
+        Trata SIGWINCH enquanto ativo e devolve o tratador anterior ao sair. Sinais só podem ser tratados na thread
+        principal; fora dela, e em sistemas sem SIGWINCH, o tamanho do visor fica fixo.
+        '''
+        if not hasattr(signal, 'SIGWINCH') or threading.current_thread() is not threading.main_thread():
+            yield self
+            return
+        anterior = signal.signal(signal.SIGWINCH, self.ao_redimensionar)
+        try:
+            yield self
+        finally:
+            signal.signal(signal.SIGWINCH, anterior)
+
+
+async def _jogar(tela, relogio, tiques, fase, cadencia, msg, calcular_alteracoes=None, entrada=None):
+    '''
+    Joga a fase até ela acabar e retorna o tempo final. A física, o desenho e o teclado são tarefas separadas do
+    asyncio, então a animação continua enquanto o jogador digita um ângulo ou um comando de rolagem.
+    '''
+    calcular_alteracoes = calcular_alteracoes or fase.calcular_alteracoes
+    quadro_pronto = asyncio.Event()
+    tempo_do_quadro = relogio.tempo
+    aviso = ''
+
+    def exibir():
+        tela.exibir_quadro(aviso or msg, tempo_do_quadro)
+
+    async def simular():
+        nonlocal tempo_do_quadro
+        tempo = relogio.tempo
+        while not fase.acabou(tempo):
+            # a física roda em todo quadro; só o desenho é pulado quando o quadro está atrasado
+            desenhar_quadro = await cadencia.aguardar()
+            tela.visor.atualizar(calcular_alteracoes(tempo))
+            if desenhar_quadro:
+                tempo_do_quadro = tempo
+                quadro_pronto.set()
+            tempo = relogio.avancar(tiques)
+        return tempo
+
+    async def desenhar():
+        while True:
+            await quadro_pronto.wait()
+            quadro_pronto.clear()
+            exibir()
+
+    async def ler_comandos(leitor):
+        nonlocal aviso
+        while True:
+            comando = await leitor.proxima_linha()
+            if comando is None:
+                return
+            comando = comando.strip().lower()
+            aviso = ''
+            if not tela.rolar_visor(comando):
                 try:
-                    if not eh_windows:
-                        input()
-                    angulo = float(input('Digite o Ângulo de Lançamento: '))
-                    fase.lancar(angulo, tempo)
-                    break
-                except:
-                    print('Erro: valor tem que ser númerico!')
-    return tempo
-
-
-def rebobina(delta_t, fase, passo, tempo, msg):
-    while tempo > 0:
-        tempo = desenhar_e_esperar(-delta_t, fase, passo, tempo, msg)
-    return tempo
+                    fase.lancar(float(comando), relogio.tempo)
+                except ValueError:
+                    aviso = 'Erro: valor tem que ser númerico!'
+            # o eco da linha digitada rolou a tela, então o próximo quadro é escrito por completo
+            tela.terminal.apagar()
+
+    leitor = LeitorDeLinhas(entrada).iniciar()
+    tarefas = [asyncio.ensure_future(desenhar()), asyncio.ensure_future(ler_comandos(leitor))]
+    try:
+        tempo_final = await simular()
+        if quadro_pronto.is_set():
+            exibir()
+        return tempo_final
+    finally:
+        leitor.parar()
+        for tarefa in tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+
+
+def exibir_gravacao(tela, gravacao, quadros, cadencia, msg):
+    'Desenha os quadros gravados indicados, na ordem, sem consultar a fase'
+    anterior = None
+    for numero in quadros:
+        desenhar_quadro = cadencia.esperar()
+        # indo para frente bastam as alterações gravadas; nos saltos e ao rebobinar o quadro é reconstruído
+        if anterior is not None and numero == anterior + 1:
+            tela.visor.atualizar(gravacao.alteracoes(numero))
+        else:
+            tela.visor.usar_pontos(gravacao.pontos(numero))
+        if desenhar_quadro:
+            tela.exibir_quadro(msg, gravacao.tempo(numero))
+        anterior = numero
+
+
+def rebobina(tela, gravacao, cadencia, msg):
+    exibir_gravacao(tela, gravacao, range(len(gravacao) - 1, -1, -1), cadencia, msg)
+
+
+def relatar_desempenho(nome, cadencia):
+    desempenho = cadencia.desempenho()
+    return '%s: %.1f quadros por segundo (meta: %.1f), %s de %s quadros sem desenho' % (
+        nome, desempenho.fps, 1 / cadencia.periodo, desempenho.descartados, desempenho.quadros)
 
 
 def animar(fase, passo=0.1, delta_t=0.1):
-    tempo = 0
-    tempo_final = _jogar(delta_t, fase, passo, tempo, 'Play!')
-    if input('Deseja ver o Replay? (s para sim): ').lower() == 's':
+    if eh_windows:
+        os.system('')  # habilita as sequências ANSI no console do Windows
+    with Tela().observar_redimensionamento() as tela:
+        _animar(tela, fase, passo, delta_t)
+
+
+def _animar(tela, fase, passo, delta_t):
+    # o tempo é contado em tiques inteiros para que cada quadro do replay tenha exatamente o tempo que teve no jogo
+    relogio = Relogio(getattr(fase, 'duracao_do_tique', None) or delta_t)
+    tiques = relogio.tiques_por_quadro(delta_t)
+    terminal = tela.terminal
+    # rebobinar e replay leem os quadros gravados durante o jogo, sem refazer a física nem consultar a fase; os
+    # segmentos vão para um arquivo temporário, então uma partida longa não acumula a gravação na memória
+    gravador = Gravador(fase, arquivo=tempfile.TemporaryFile())
+    jogo = Cadencia(passo)
+    tempo_final = asyncio.run(_jogar(tela, relogio, tiques, fase, jogo,
+                                     'Play! (ângulo e Enter lança, < > rola, c segue)', gravador.calcular_alteracoes))
+    desempenhos = [relatar_desempenho('Jogo', jogo)]
+    replay = input('Deseja ver o Replay? (s para sim): ').lower() == 's'
+    terminal.apagar()
+    if replay:
         velocidade_rebobina = 10
-        rebobina(delta_t, fase, passo / velocidade_rebobina, tempo_final,
-                 'Rebobinando %s vezes mais rápido!' % velocidade_rebobina)
+        rebobinar = Cadencia(passo / velocidade_rebobina)
+        rebobina(tela, gravador, rebobinar, 'Rebobinando %s vezes mais rápido!' % velocidade_rebobina)
         velocidade_replay = 1
-        _animar(delta_t, fase, passo / velocidade_replay, tempo, 'Replay %s vezes mais rápido!' % velocidade_replay)
-    apagar_tela()
+        reproduzir = Cadencia(passo / velocidade_replay)
+        exibir_gravacao(tela, gravador, range(len(gravador)), reproduzir,
+                        'Replay %s vezes mais rápido!' % velocidade_replay)
+        desempenhos += [relatar_desempenho('Rebobinar', rebobinar), relatar_desempenho('Replay', reproduzir)]
+    gravador.fechar()
+    terminal.apagar()
     print(fase.status(tempo_final))
     print(FIM)
+    print(os.linesep.join(desempenhos))
 
 
 def normalizar_coordenadas(x, y):
@@ -112,16 +223,26 @@ def escolher_caracter(x, y, *pontos_cartesianos):
     return ' '
 
 
-def desenhar(*pontos_cartesianos):
-    frame = ''
-    for y in range(ALTURA):
-        for x in range(LARGURA):
-            if esta_dentro_da_tela(x, y):
-                frame += escolher_caracter(x, y, *pontos_cartesianos)
-            else:
-                frame += escolher_caracter_limitrofe(x, y)
-        frame += os.linesep
-    return frame
+def desenhar(*pontos_cartesianos, largura=None, altura=None):
+    'Quadro com a borda da tela e os pontos dentro dela; sem largura e altura, a tela tem LARGURA x ALTURA'
+    largura = LARGURA if largura is None else largura
+    altura = ALTURA if altura is None else altura
+    if altura <= 0:
+        return ''
+    if largura < 2:
+        # sem lugar para as duas bordas, cada linha é só a borda esquerda, ou vazia
+        return ('|' * max(largura, 0) + os.linesep) * altura
+    # a borda é montada uma vez e cada ponto é escrito direto na sua linha, sem percorrer os pontos a cada célula
+    linha_interna = '|' + ' ' * (largura - 2) + '|'
+    linhas = [list(linha_interna) for _ in range(altura - 2)]
+    # de trás para frente, para que prevaleça o primeiro ponto de cada célula, como em escolher_caracter
+    for ponto in reversed(pontos_cartesianos):
+        x, y = ponto.x, altura - ponto.y - 1
+        if 0 < x < largura - 1 and 0 < y < altura - 1 and x == int(x) and y == int(y):
+            linhas[int(y) - 1][int(x)] = ponto.caracter
+    quadro = ['|' + '-' * (largura - 2) + '|'] + [''.join(linha) for linha in linhas] + \
+             ['|' + 'T' * (largura - 2) + '|']
+    return os.linesep.join(quadro[:altura]) + os.linesep
 
 
 def main():
@@ -138,16 +259,19 @@ def main():
             return self
 
     class Fase():
-        def __init__(self):
-            self.p = Ponto('>')
-
         def calcular_pontos(self, tempo):
-            return [self.p(tempo)]
+            # um ponto novo a cada quadro, já que o gravador guarda os pontos do segmento em andamento
+            return [Ponto('>')(tempo)]
+
+        quadro_chave = calcular_pontos
+
+        def calcular_alteracoes(self, tempo):
+            return list(enumerate(self.calcular_pontos(tempo)))
 
         def acabou(self, tempo):
             return tempo > 10
 
-        def status(self):
+        def status(self, tempo):
             return 'Você ganhou'
 
     animar(Fase())
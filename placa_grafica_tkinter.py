@@ -1,15 +1,18 @@
 # coding: utf-8
+import tempfile
 import time
 from tkinter import PhotoImage, NW, Tk, Canvas
 from tkinter.constants import ALL
 import math
 from os import path
-import atores
 
 from fase import Fase
+from gravador import Gravador
+from relogio import Relogio
 from atores import PassaroVermelho, PassaroAmarelo, Porco, Obstaculo
 
 ALTURA_DA_TELA = 600  # px
+ESCALA = 10  # pixels por unidade das fases em ASCII
 
 root = Tk()
 
@@ -35,48 +38,98 @@ CARACTER_PARA__IMG_DCT = {'V': PASSARO_VERMELHO,
                           ' ': TRANSPARENTE}
 
 
-def plotar(camada_de_atores, ponto):
-    if ponto.caracter != ' ':
-        x = ponto.x
-        y = ALTURA_DA_TELA - ponto.y - 120  # para coincidir com o chao da tela
-        image = CARACTER_PARA__IMG_DCT.get(ponto.caracter, TRANSPARENTE)
-        camada_de_atores.create_image((x, y), image=image, anchor=NW)
+def _coordenadas(ponto):
+    return ponto.x, ALTURA_DA_TELA - ponto.y - 120  # para coincidir com o chao da tela
+
+
+def _imagem(ponto):
+    return CARACTER_PARA__IMG_DCT.get(ponto.caracter, TRANSPARENTE)
+
+
+def criar_itens(camada_de_atores, pontos):
+    'Um item do canvas por ponto, inclusive os transparentes, para que os índices coincidam com os da fase'
+    return [camada_de_atores.create_image(_coordenadas(ponto), image=_imagem(ponto), anchor=NW) for ponto in pontos]
+
+
+def atualizar_itens(camada_de_atores, itens, alteracoes):
+    'Move e troca a imagem apenas dos itens dos pontos alterados, ver Fase.calcular_alteracoes'
+    for indice, ponto in alteracoes:
+        camada_de_atores.coords(itens[indice], _coordenadas(ponto))
+        camada_de_atores.itemconfigure(itens[indice], image=_imagem(ponto))
+
+
+# funções que desenham um quadro, envolvidas por instrumentacao para medir o tempo de desenho
+FUNCOES_DE_DESENHO = ('criar_itens', 'atualizar_itens')
 
 
 def animar(tela, camada_de_atores, fase, passo=0.01, delta_t=0.01):
-    tempo = 0
+    # o tempo é contado em tiques inteiros, então o replay passa exatamente pelos mesmos tempos do jogo
+    relogio = Relogio(fase.duracao_do_tique or delta_t)
+    tiques = relogio.tiques_por_quadro(delta_t)
     passo = int(1000 * passo)
     angulo = 0
     multiplicador_rebobinar = 20
+    # rebobinar e replay leem os quadros gravados durante o jogo, sem refazer a física nem consultar a fase; os
+    # segmentos vão para um arquivo temporário, então uma partida longa não acumula a gravação na memória
+    gravador = Gravador(fase, arquivo=tempfile.TemporaryFile())
+    quadro = 0
+    reproduzindo = rebobinando = fim_exibido = False
+    # um item do canvas por ponto da fase; vazio quando a tela precisa ser redesenhada por completo
+    itens = []
+    seta = texto = None
+
+    def _desenhar_quadro_chave(pontos):
+        nonlocal seta, texto
+        camada_de_atores.delete(ALL)
+        camada_de_atores.create_image((0, 0), image=BACKGROUND, anchor=NW)
+        seta = camada_de_atores.create_line(0, 0, 0, 0, width=1.5)
+        texto = camada_de_atores.create_text(35, 493)
+        itens[:] = criar_itens(camada_de_atores, pontos)
+
+    def _exibir_fim():
+        nonlocal fim_exibido
+        camada_de_atores.create_image(162, 55, image=PYTHONBIRDS_LOGO, anchor=NW)
+        camada_de_atores.create_image(54, 540, image=MENU, anchor=NW)
+        if 'ganhou' in fase.status(relogio.tempo):
+            img = VOCE_GANHOU
+        else:
+            img = VOCE_PERDEU
+        camada_de_atores.create_image(192, 211, image=img, anchor=NW)
+        itens.clear()
+        fim_exibido = True
 
     def _animar():
-        nonlocal tempo
-        nonlocal delta_t
-        nonlocal angulo
-        tempo += delta_t
-        if tempo <= 0:
-            tempo = 0
-            delta_t /= -multiplicador_rebobinar
-        if fase.acabou(tempo):
-            camada_de_atores.create_image(162, 55, image=PYTHONBIRDS_LOGO, anchor=NW)
-            camada_de_atores.create_image(54, 540, image=MENU, anchor=NW)
-            if 'ganhou' in fase.status(tempo):
-                img = VOCE_GANHOU
+        nonlocal quadro, rebobinando
+        if not reproduzindo:
+            tempo = relogio.avancar(tiques)
+            if fase.acabou(tempo):
+                _exibir_fim()
+                return
+            if not itens:
+                _desenhar_quadro_chave(gravador.calcular_pontos(tempo))
+            else:
+                # só os atores que mudaram de posição ou de imagem são atualizados no canvas
+                atualizar_itens(camada_de_atores, itens, gravador.calcular_alteracoes(tempo))
+        elif rebobinando:
+            quadro = max(quadro - multiplicador_rebobinar, 0)
+            rebobinando = quadro > 0
+            if not itens:
+                _desenhar_quadro_chave(gravador.pontos(quadro))
             else:
-                img = VOCE_PERDEU
-            camada_de_atores.create_image(192, 211, image=img, anchor=NW)
+                atualizar_itens(camada_de_atores, itens, enumerate(gravador.pontos(quadro)))
         else:
-            camada_de_atores.delete(ALL)
-            camada_de_atores.create_image((0, 0), image=BACKGROUND, anchor=NW)
-            tamanho_seta = 60
-            angulo_rad = math.radians(-angulo)
-
-            camada_de_atores.create_line(52, 493, 52 + tamanho_seta * math.cos(angulo_rad),
-                                         493 + tamanho_seta * math.sin(angulo_rad), width=1.5)
-            camada_de_atores.create_text(35, 493, text=u"%d°" % angulo)
-            for ponto in fase.calcular_pontos(tempo):
-                plotar(camada_de_atores, ponto)
-            tela.after(passo, _animar)
+            quadro += 1
+            if quadro >= len(gravador):
+                _exibir_fim()
+                return
+            atualizar_itens(camada_de_atores, itens, gravador.alteracoes(quadro))
+        tamanho_seta = 60
+        angulo_rad = math.radians(-angulo)
+
+        camada_de_atores.coords(seta, 52, 493, 52 + tamanho_seta * math.cos(angulo_rad),
+                                493 + tamanho_seta * math.sin(angulo_rad))
+        camada_de_atores.itemconfigure(texto, text=u"%d°" % angulo)
+        tela.after(passo, _animar)
 
     def _ouvir_comandos_lancamento(evento):
         nonlocal angulo
@@ -85,21 +138,23 @@ def animar(tela, camada_de_atores, fase, passo=0.01, delta_t=0.01):
         elif evento.keysym == 'Down':
             angulo -= 1
         elif evento.keysym == 'Return' or evento.keysym == 'space':
-            fase.lancar(angulo, tempo)
+            fase.lancar(angulo, relogio.tempo)
 
     def _replay(event):
-        nonlocal tempo
-        nonlocal delta_t
-        if fase.acabou(tempo):
-            delta_t *= -multiplicador_rebobinar
+        nonlocal quadro, reproduzindo, rebobinando, fim_exibido
+        if fim_exibido and len(gravador):
+            reproduzindo = rebobinando = True
+            fim_exibido = False
+            quadro = len(gravador)
             _animar()
 
-
     def _jogar_novamente(event):
-        nonlocal tempo
-        nonlocal delta_t
-        if fase.acabou(tempo):
-            tempo = delta_t
+        nonlocal gravador, reproduzindo, fim_exibido
+        if fim_exibido:
+            reproduzindo = fim_exibido = False
+            gravador.fechar()
+            gravador = Gravador(fase, arquivo=tempfile.TemporaryFile())
+            relogio.tique = 0
             fase.resetar()
             _animar()
 
@@ -124,10 +179,8 @@ def rodar_fase(fase):
     root.resizable(0, 0)
     stage = Canvas(root, width=800, height=ALTURA_DA_TELA)
 
-    multiplicador = 10
-    PassaroAmarelo.velocidade_escalar *= multiplicador
-    PassaroVermelho.velocidade_escalar *= multiplicador
-    atores.GRAVIDADE = 100
+    # a escala vale só para esta fase, sem alterar as classes de pássaro nem outras fases do processo
+    fase.usar_fisica(fase.fisica.escalada(ESCALA))
     animar(root, stage, fase)
 
 
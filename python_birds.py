@@ -3,14 +3,22 @@ from atores import PassaroVermelho, PassaroAmarelo, Porco, Obstaculo
 from fase import Fase
 import placa_grafica
 
-fase_exemplo = Fase()
-passaros = [PassaroVermelho(3, 3), PassaroAmarelo(3, 3), PassaroAmarelo(3, 3)]
-porcos = [Porco(78, 1), Porco(70, 1)]
-obstaculos = [Obstaculo(31, 10)]
 
-fase_exemplo.adicionar_passaro(*passaros)
-fase_exemplo.adicionar_porco(*porcos)
-fase_exemplo.adicionar_obstaculo(*obstaculos)
+def criar_fase(classe_de_fase=Fase, escala=1, **parametros):
+    'Fase de exemplo, de classe_de_fase criada com parametros; escala multiplica as coordenadas dos atores'
+    fase = classe_de_fase(**parametros)
+    passaros = [PassaroVermelho(3 * escala, 3 * escala), PassaroAmarelo(3 * escala, 3 * escala),
+                PassaroAmarelo(3 * escala, 3 * escala)]
+    porcos = [Porco(78 * escala, 1 * escala), Porco(70 * escala, 1 * escala)]
+    obstaculos = [Obstaculo(31 * escala, 10 * escala)]
+
+    fase.adicionar_passaro(*passaros)
+    fase.adicionar_porco(*porcos)
+    fase.adicionar_obstaculo(*obstaculos)
+    return fase
+
+
+fase_exemplo = criar_fase()
 
 # Solução para ganhar
 # fase_exemplo.lancar(45, 1)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+from collections import namedtuple
+
+Desempenho = namedtuple('Desempenho', 'quadros desenhados descartados segundos fps')
+
+
+class Relogio():
+    '''
+    Base de tempo em tiques inteiros. O tempo é sempre calculado como tique * duracao_do_tique, então o mesmo quadro
+    gera sempre o mesmo valor de tempo, sem o erro que se acumula ao somar delta_t a cada quadro. Assim os tempos
+    podem ser usados como chaves exatas de cache e os replays são reproduzíveis.
+    '''
+
+    def __init__(self, duracao_do_tique=0.01, tique=0):
+        if duracao_do_tique <= 0:
+            raise ValueError('A duração do tique deve ser positiva')
+        self.duracao_do_tique = duracao_do_tique
+        self.tique = tique
+
+    @property
+    def tempo(self):
+        return self.tique * self.duracao_do_tique
+
+    def avancar(self, tiques=1):
+        'Avança (ou volta, com tiques negativo) o relógio e retorna o novo tempo'
+        self.tique += tiques
+        return self.tempo
+
+    def tique_em(self, tempo):
+        'Tique mais próximo de tempo'
+        return round(tempo / self.duracao_do_tique)
+
+    def tiques_por_quadro(self, delta_t):
+        'Quantidade de tiques, no mínimo um, mais próxima de um passo delta_t'
+        return max(1, round(delta_t / self.duracao_do_tique))
+
+
+class Cadencia():
+    '''
+    Mantém uma taxa de quadros fixa medindo o tempo com um relógio monotônico: o prazo de cada quadro é o do anterior
+    mais periodo, então o tempo gasto simulando e desenhando não se soma à espera. Um quadro que começa com mais de
+    um período de atraso não deve ser desenhado, só simulado, mas nunca são descartados mais que
+    maximo_de_descartes seguidos. Atrasos longos não são compensados: o prazo recomeça do instante atual, mas o
+    quadro conta como atrasado e o tempo perdido conta no desempenho. Como o jogo lê o teclado sem parar a
+    animação, não há pausas a descontar: cada Cadencia mede um trecho contínuo do jogo, do rebobinar ou do replay.
+    '''
+
+    def __init__(self, periodo, maximo_de_descartes=5, agora=time.monotonic, dormir=time.sleep):
+        self.periodo = periodo
+        self.maximo_de_descartes = maximo_de_descartes
+        self._agora = agora
+        self._dormir = dormir
+        self._prazo = self._inicio = None
+        self._descartes_seguidos = 0
+        self.desenhados = 0
+        self.descartados = 0
+
+    def esperar(self):
+        'Espera o prazo do próximo quadro e retorna se ele deve ser desenhado'
+        espera, desenhar = self._agendar()
+        if espera > 0:
+            self._dormir(espera)
+        return desenhar
+
+    async def aguardar(self):
+        'Como esperar, mas sem bloquear o laço de eventos do asyncio, que roda as outras tarefas durante a espera'
+        espera, desenhar = self._agendar()
+        await asyncio.sleep(max(espera, 0))
+        return desenhar
+
+    def _agendar(self):
+        'Segundos até o prazo do próximo quadro e se ele deve ser desenhado'
+        agora = self._agora()
+        if self._prazo is None:
+            self._inicio = self._prazo = agora
+        atraso = agora - self._prazo
+        if atraso > self.periodo * (self.maximo_de_descartes + 1):
+            # atrasado demais para alcançar os prazos, que recomeçam daqui sem descontar o atraso
+            self._prazo = agora
+        self._prazo += self.periodo
+        if atraso > self.periodo and self._descartes_seguidos < self.maximo_de_descartes:
+            self._descartes_seguidos += 1
+            self.descartados += 1
+            return -atraso, False
+        self._descartes_seguidos = 0
+        self.desenhados += 1
+        return -atraso, True
+
+    def desempenho(self):
+        '''
+        Quadros simulados, desenhados e descartados, segundos desde o primeiro quadro e quadros desenhados por
+        segundo
+        '''
+        segundos = 0 if self._inicio is None else self._agora() - self._inicio
+        return Desempenho(self.desenhados + self.descartados, self.desenhados, self.descartados, segundos,
+                          self.desenhados / segundos if segundos > 0 else 0.0)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+'''
+Formato binário compacto e versionado para salvar e restaurar o estado de uma fase, feito com struct e array.
+
+Layout, em little-endian:
+
+    cabeçalho   magic 'PBFS', versão, intervalo de colisão, último tempo calculado, duração do tique,
+                gravidade e escala da física, quantidade de pássaros, obstáculos, porcos, classes de atores e
+                velocidades da física
+    classes     para cada classe: tamanho (uint16) e nome 'modulo.Classe' em utf-8
+    velocidades para cada velocidade da física: nome da classe, como na tabela de classes, e valor (float64)
+    atores      na ordem pássaros, obstáculos, porcos: tipo (uint8, índice na tabela de classes),
+                x, y e tempo de colisão (float64)
+    pássaros    x e y iniciais, tempo e ângulo de lançamento (float64)
+
+Valores None são gravados como NaN. A versão 2 não tinha gravidade, escala nem velocidades no cabeçalho, nem a
+seção de velocidades; a 1 também não tinha a duração do tique. Ambas ainda são lidas, com a física padrão.
+'''
+import gc
+import math
+import struct
+from array import array
+from contextlib import contextmanager
+from itertools import chain, groupby
+
+from empacotamento import FormatoInvalido, coluna, escrever_nome, ler_coluna, ler_nome, para_float, para_valor
+from fisica import GRAVIDADE, Fisica
+
+MAGICO = b'PBFS'
+VERSAO = 3
+_CABECALHO = struct.Struct('<4sHdddddIIIHH')
+_VERSAO = struct.Struct('<4sH')
+# versões anteriores continuam sendo lidas: a 1 não tinha a duração do tique nem a física, e a 2 não tinha a física
+_CABECALHOS = {1: struct.Struct('<4sHddIIIH'), 2: struct.Struct('<4sHdddIIIH'), VERSAO: _CABECALHO}
+_VELOCIDADE = struct.Struct('<d')
+
+
+@contextmanager
+def _sem_coleta_de_lixo():
+    # criar centenas de milhares de atores dispara o coletor de ciclos repetidas vezes, sem que haja ciclos para
+    # recolher, e isso custava mais da metade do tempo de carga
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
+
+
+def serializar(fase):
+    'Estado completo da fase em bytes'
+    passaros, obstaculos, porcos = fase._passaros, fase._obstaculos, fase._porcos
+    atores = list(chain(passaros, obstaculos, porcos))
+    classes = []
+    indices = {}
+    tipos = array('B')
+    for ator in atores:
+        classe = type(ator)
+        if classe not in indices:
+            indices[classe] = len(classes)
+            classes.append(classe)
+        tipos.append(indices[classe])
+
+    gravidade, velocidades, escala = fase.fisica.__getstate__()
+    partes = [_CABECALHO.pack(MAGICO, VERSAO, fase.intervalo_de_colisao, fase._ultimo_tempo,
+                              para_float(fase.duracao_do_tique), gravidade, escala, len(passaros),
+                              len(obstaculos), len(porcos), len(classes), len(velocidades))]
+    for classe in classes:
+        escrever_nome(partes, classe)
+    for classe, velocidade in velocidades.items():
+        escrever_nome(partes, classe)
+        partes.append(_VELOCIDADE.pack(velocidade))
+    partes.append(tipos.tobytes())
+    partes.append(coluna([a.x for a in atores]).tobytes())
+    partes.append(coluna([a.y for a in atores]).tobytes())
+    partes.append(coluna([para_float(a._colisao) for a in atores]).tobytes())
+    partes.append(coluna([p._x_inicial for p in passaros]).tobytes())
+    partes.append(coluna([p._y_inicial for p in passaros]).tobytes())
+    partes.append(coluna([para_float(p._tempo_de_lancamento) for p in passaros]).tobytes())
+    partes.append(coluna([para_float(p._angulo_de_lancamento) for p in passaros]).tobytes())
+    return b''.join(partes)
+
+
+def _ler_cabecalho(dados):
+    'Campos do cabeçalho, na ordem do da versão atual, e a posição logo depois dele'
+    if len(dados) < _VERSAO.size:
+        raise FormatoInvalido('Dados truncados')
+    magico, versao = _VERSAO.unpack_from(dados)
+    if magico != MAGICO:
+        raise FormatoInvalido('Não é um estado de fase salvo')
+    cabecalho = _CABECALHOS.get(versao)
+    if cabecalho is None:
+        raise FormatoInvalido('Versão %s não suportada' % versao)
+    if len(dados) < cabecalho.size:
+        raise FormatoInvalido('Dados truncados')
+    campos = cabecalho.unpack_from(dados)[2:]
+    if versao == 1:
+        intervalo_de_colisao, ultimo_tempo, n_passaros, n_obstaculos, n_porcos, n_classes = campos
+        campos = (intervalo_de_colisao, ultimo_tempo, math.nan, GRAVIDADE, 1, n_passaros, n_obstaculos, n_porcos,
+                  n_classes, 0)
+    elif versao == 2:
+        intervalo_de_colisao, ultimo_tempo, duracao_do_tique, n_passaros, n_obstaculos, n_porcos, n_classes = campos
+        campos = (intervalo_de_colisao, ultimo_tempo, duracao_do_tique, GRAVIDADE, 1, n_passaros, n_obstaculos,
+                  n_porcos, n_classes, 0)
+    return campos, cabecalho.size
+
+
+def desserializar(dados, classe_de_fase):
+    '''
+    Reconstrói uma fase de classe_de_fase a partir de bytes gerados por serializar, nesta versão ou numa anterior.
+    Estados das versões 1 e 2, sem a física, são carregados com a física padrão.
+    '''
+    dados = memoryview(dados)
+    ((intervalo_de_colisao, ultimo_tempo, duracao_do_tique, gravidade, escala, n_passaros, n_obstaculos, n_porcos,
+      n_classes, n_velocidades), posicao) = _ler_cabecalho(dados)
+    classes = []
+    for _ in range(n_classes):
+        classe, posicao = ler_nome(dados, posicao)
+        classes.append(classe)
+    velocidades = {}
+    for _ in range(n_velocidades):
+        classe, posicao = ler_nome(dados, posicao)
+        if posicao + _VELOCIDADE.size > len(dados):
+            raise FormatoInvalido('Dados truncados')
+        velocidades[classe], = _VELOCIDADE.unpack_from(dados, posicao)
+        posicao += _VELOCIDADE.size
+
+    total = n_passaros + n_obstaculos + n_porcos
+    tipos, posicao = ler_coluna(dados, posicao, 'B', total)
+    xs, posicao = ler_coluna(dados, posicao, 'd', total)
+    ys, posicao = ler_coluna(dados, posicao, 'd', total)
+    colisoes, posicao = ler_coluna(dados, posicao, 'd', total)
+    xs_iniciais, posicao = ler_coluna(dados, posicao, 'd', n_passaros)
+    ys_iniciais, posicao = ler_coluna(dados, posicao, 'd', n_passaros)
+    lancamentos, posicao = ler_coluna(dados, posicao, 'd', n_passaros)
+    angulos, posicao = ler_coluna(dados, posicao, 'd', n_passaros)
+    maior_tipo = max(tipos, default=-1)
+    if maior_tipo >= n_classes:
+        raise FormatoInvalido('Tipo de ator %s fora da tabela de classes' % maior_tipo)
+
+    with _sem_coleta_de_lixo():
+        # atores de uma mesma classe costumam vir seguidos, e cada trecho é criado de uma vez
+        atores = []
+        inicio = 0
+        for tipo, trecho in groupby(tipos):
+            fim = inicio + sum(1 for _ in trecho)
+            atores.extend(classes[tipo].criar_varios(xs[inicio:fim], ys[inicio:fim]))
+            inicio = fim
+        for ator, colisao in zip(atores, colisoes):
+            if colisao == colisao:
+                ator._colisao = colisao
+        passaros = atores[:n_passaros]
+        for passaro, x, y, lancamento, angulo in zip(passaros, xs_iniciais, ys_iniciais, lancamentos, angulos):
+            passaro._x_inicial = x
+            passaro._y_inicial = y
+            passaro._tempo_de_lancamento = para_valor(lancamento)
+            passaro._angulo_de_lancamento = para_valor(angulo)
+
+        fase = classe_de_fase(intervalo_de_colisao, para_valor(duracao_do_tique),
+                              Fisica(gravidade, velocidades, escala))
+        fase.adicionar_passaro(*passaros)
+        fase.adicionar_obstaculo(*atores[n_passaros:n_passaros + n_obstaculos])
+        fase.adicionar_porco(*atores[n_passaros + n_obstaculos:])
+        fase._restaurar_estado(ultimo_tempo)
+    return fase
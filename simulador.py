@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+'''
+Simulador sem interface gráfica: avança uma fase em passos fixos de tempo, o mais rápido possível, até que ela
+acabe. Útil para medir quantos quadros por segundo o motor consegue simular.
+
+    python simulador.py python_birds --lancamento 45:1 --lancamento 63:3 --lancamento 23:4
+'''
+import argparse
+import importlib
+import time
+from collections import namedtuple
+
+FISICA = 'fisica'
+COLISAO = 'colisao'
+CONTABILIDADE = 'contabilidade'
+
+Resultado = namedtuple('Resultado', 'status tempo quadros tempos_por_fase')
+
+
+def simular(fase, lancamentos=(), delta_t=0.01, tempo_maximo=1000):
+    '''
+    Simula a fase com passo delta_t, lançando os pássaros conforme a lista de (angulo, tempo), até que acabe ou
+    que tempo_maximo seja ultrapassado. Retorna o status final, o tempo final, a quantidade de quadros e o tempo de
+    relógio, em segundos, gasto em cada fase do quadro: física, colisão e contabilidade (lançamentos e fim de jogo).
+    '''
+    lancamentos = sorted(lancamentos, key=lambda lancamento: lancamento[1])
+    proximo_lancamento = 0
+    tempos_por_fase = {FISICA: 0.0, COLISAO: 0.0, CONTABILIDADE: 0.0}
+    relogio = time.perf_counter
+    quadro = 0
+    tempo = 0
+    while True:
+        inicio = relogio()
+        while proximo_lancamento < len(lancamentos) and lancamentos[proximo_lancamento][1] <= tempo:
+            fase.lancar(*lancamentos[proximo_lancamento])
+            proximo_lancamento += 1
+        terminou = fase.acabou(tempo) or tempo > tempo_maximo
+        fim_da_contabilidade = relogio()
+        tempos_por_fase[CONTABILIDADE] += fim_da_contabilidade - inicio
+        if terminou:
+            break
+        tempo_da_fase = fase.calcular_posicoes(tempo)
+        fim_da_fisica = relogio()
+        fase.calcular_colisoes(tempo_da_fase)
+        tempos_por_fase[FISICA] += fim_da_fisica - fim_da_contabilidade
+        tempos_por_fase[COLISAO] += relogio() - fim_da_fisica
+        quadro += 1
+        # tempo calculado a partir do número do quadro para não acumular erro de ponto flutuante
+        tempo = quadro * delta_t
+    return Resultado(fase.status(tempo), tempo, quadro, tempos_por_fase)
+
+
+def _ler_lancamento(texto):
+    angulo, tempo = texto.split(':')
+    return float(angulo), float(tempo)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Simula uma fase sem interface gráfica e mede seu desempenho')
+    parser.add_argument('modulo', help='módulo com uma função criar_fase(), ex: python_birds ou fases.brasil')
+    parser.add_argument('--lancamento', action='append', type=_ler_lancamento, default=[],
+                        metavar='ANGULO:TEMPO', help='lançamento de pássaro, pode ser repetido')
+    parser.add_argument('--delta-t', type=float, default=0.01, help='passo de tempo da simulação')
+    parser.add_argument('--tempo-maximo', type=float, default=1000, help='tempo limite da simulação')
+    parser.add_argument('--repeticoes', type=int, default=1, help='quantas vezes repetir a simulação')
+    argumentos = parser.parse_args(argumentos)
+
+    criar_fase = importlib.import_module(argumentos.modulo).criar_fase
+    for _ in range(argumentos.repeticoes):
+        resultado = simular(criar_fase(), argumentos.lancamento, argumentos.delta_t, argumentos.tempo_maximo)
+        total = sum(resultado.tempos_por_fase.values())
+        print('%s Tempo: %.2f Quadros: %d' % (resultado.status, resultado.tempo, resultado.quadros))
+        for nome, duracao in resultado.tempos_por_fase.items():
+            print('  %-14s %9.4f s' % (nome, duracao))
+        print('  %-14s %9.0f quadros/s' % ('vazão', resultado.quadros / total if total else 0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+'''
+Varredura de ângulos e tempos de lançamento de uma fase, calculada em lote com NumPy.
+
+Usa o mesmo modelo analítico de FaseAnalitica: cada candidato é uma parábola e o alvo atingido é o primeiro
+obstáculo ou porco, ainda ativo no momento, cuja caixa de colisão a parábola cruza antes de tocar o chão.
+
+    varredura = varrer(fase, PassaroAmarelo, range(0, 91), [1, 2, 3])
+    varredura.porcos[45, 0]  # índice do porco destruído lançando a 45 graus no tempo 1, ou -1
+'''
+import math
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from trajetoria import ALTURA_DO_CHAO
+
+Varredura = namedtuple('Varredura', 'angulos tempos alvos tempos_de_colisao porcos')
+
+
+def _posicao_de_lancamento(fase, tipo_de_passaro):
+    passaros = [p for p in fase._passaros if isinstance(p, tipo_de_passaro)] or fase._passaros
+    if not passaros:
+        raise ValueError('Informe a posição de lançamento: a fase não tem pássaros')
+    return passaros[0]._x_inicial, passaros[0]._y_inicial
+
+
+def _tempo_de_chegada_ao_chao(y0, vy, gravidade):
+    # o discriminante só é negativo com o pássaro abaixo do chão, caso em que o tempo é 0
+    raiz = np.sqrt(np.maximum(vy ** 2 - 2 * gravidade * (ALTURA_DO_CHAO - y0), 0))
+    return np.where(y0 <= ALTURA_DO_CHAO, 0.0, (vy + raiz) / gravidade)
+
+
+def _raizes(y0, vy, gravidade, altura):
+    discriminante = vy ** 2 - 2 * gravidade * (altura - y0)
+    raiz = np.sqrt(np.maximum(discriminante, 0))
+    return (vy - raiz) / gravidade, (vy + raiz) / gravidade, discriminante >= 0
+
+
+def _tempos_de_entrada(x0, y0, vx, vy, gravidade, x_alvo, y_alvo, margem, chao):
+    '''
+    Primeiro tempo, relativo ao lançamento, em que cada candidato (linhas) entra na caixa de cada alvo (colunas).
+    math.inf quando não entra antes de tocar o chão.
+    '''
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (x_alvo - margem - x0) / vx
+        t2 = (x_alvo + margem - x0) / vx
+    parado = vx == 0
+    dentro = np.abs(x_alvo - x0) <= margem
+    inicio_x = np.where(parado, np.where(dentro, -math.inf, math.inf), np.minimum(t1, t2))
+    fim_x = np.where(parado, np.where(dentro, math.inf, -math.inf), np.maximum(t1, t2))
+
+    r1, r2, acima = _raizes(y0, vy, gravidade, y_alvo - margem)
+    s1, s2, abaixo = _raizes(y0, vy, gravidade, y_alvo + margem)
+    # sem raízes para o topo da caixa a parábola nunca passa acima dela
+    s1 = np.where(abaixo, s1, math.inf)
+    s2 = np.where(abaixo, s2, math.inf)
+
+    inicio_x = np.maximum(inicio_x, 0)
+    fim_x = np.minimum(fim_x, chao)
+    subida_inicio = np.maximum(inicio_x, r1)
+    subida_fim = np.minimum(fim_x, np.minimum(r2, s1))
+    descida_inicio = np.maximum(inicio_x, np.maximum(r1, s2))
+    descida_fim = np.minimum(fim_x, r2)
+    return np.where(acima & (subida_inicio <= subida_fim), subida_inicio,
+                    np.where(acima & (descida_inicio <= descida_fim), descida_inicio, math.inf))
+
+
+def varrer(fase, tipo_de_passaro, angulos, tempos_de_lancamento=(0,), posicao=None, tamanho_do_bloco=4096):
+    '''
+    Avalia todos os pares (ângulo em graus, tempo de lançamento) contra os obstáculos e porcos da fase, levando em
+    conta os alvos já destruídos em cada tempo. Retorna uma Varredura com matrizes de forma
+    (len(angulos), len(tempos_de_lancamento)):
+
+    - alvos: índice do alvo atingido em obstáculos + porcos, ou -1 se o pássaro cai no chão
+    - tempos_de_colisao: tempo absoluto da colisão com o alvo ou o chão
+    - porcos: índice do porco destruído em fase._porcos, ou -1
+    '''
+    if np is None:
+        raise ImportError('solucionador depende do NumPy')
+    gravidade = fase.fisica.gravidade
+    if gravidade <= 0:
+        raise ValueError('A varredura supõe gravidade positiva')
+    x0, y0 = posicao or _posicao_de_lancamento(fase, tipo_de_passaro)
+    angulos = np.asarray(angulos, dtype=float)
+    tempos = np.asarray(tempos_de_lancamento, dtype=float)
+    x_alvo, y_alvo, colisao_alvo = (np.asarray(coluna, dtype=float) for coluna in fase.alvos_em_colunas())
+    x_alvo, y_alvo = np.round(x_alvo), np.round(y_alvo)
+    alvos = len(x_alvo)
+    margem = fase.intervalo_de_colisao + 0.5
+
+    grade_angulos, grade_tempos = np.meshgrid(np.radians(angulos), tempos, indexing='ij')
+    grade_angulos, grade_tempos = grade_angulos.ravel(), grade_tempos.ravel()
+    resultado_alvos = np.full(grade_angulos.shape, -1, dtype=np.intp)
+    resultado_tempos = np.empty(grade_angulos.shape)
+    velocidade = fase.fisica.velocidade(tipo_de_passaro)
+
+    for inicio in range(0, len(grade_angulos), tamanho_do_bloco):
+        bloco = slice(inicio, inicio + tamanho_do_bloco)
+        vx = (velocidade * np.cos(grade_angulos[bloco]))[:, None]
+        vy = (velocidade * np.sin(grade_angulos[bloco]))[:, None]
+        lancamento = grade_tempos[bloco][:, None]
+        chao = _tempo_de_chegada_ao_chao(y0, vy, gravidade)
+        resultado_tempos[bloco] = (lancamento + chao)[:, 0]
+        if not alvos:
+            continue
+        entrada = lancamento + _tempos_de_entrada(x0, y0, vx, vy, gravidade, x_alvo, y_alvo, margem, chao)
+        # alvos destruídos antes da chegada do pássaro não contam
+        entrada = np.where(colisao_alvo > entrada, entrada, math.inf)
+        primeiro = np.argmin(entrada, axis=1)
+        tempo_do_primeiro = entrada[np.arange(len(primeiro)), primeiro]
+        atingiu = np.isfinite(tempo_do_primeiro)
+        resultado_alvos[bloco] = np.where(atingiu, primeiro, -1)
+        resultado_tempos[bloco] = np.where(atingiu, tempo_do_primeiro, resultado_tempos[bloco])
+
+    forma = (len(angulos), len(tempos))
+    resultado_alvos = resultado_alvos.reshape(forma)
+    obstaculos = fase.quantidade_de_obstaculos()
+    porcos = np.where(resultado_alvos >= obstaculos, resultado_alvos - obstaculos, -1)
+    return Varredura(angulos, tempos, resultado_alvos, resultado_tempos.reshape(forma), porcos)
+
+
+def resolver(fase, lancamentos_maximos, angulos=range(0, 91)):
+    '''
+    Procura, de forma gulosa, até lancamentos_maximos lançamentos que destruam todos os porcos. fase deve ser uma
+    FaseAnalitica sem lançamentos, e é jogada durante a busca. Cada pássaro é lançado quando o anterior colide, no
+    primeiro ângulo que destrói um porco ou, se nenhum porco está ao alcance, um obstáculo que possa estar no
+    caminho. Retorna a lista de (angulo, tempo) que vence a fase ou None se a busca não encontrou uma.
+    '''
+    tempo = 0
+    lancamentos = []
+    for passaro in fase._passaros[:lancamentos_maximos]:
+        if 'ganhou' in fase.status(tempo):
+            break
+        varredura = varrer(fase, type(passaro), angulos, [tempo], (passaro._x_inicial, passaro._y_inicial))
+        escolhas = np.flatnonzero(varredura.porcos[:, 0] >= 0)
+        if len(escolhas) == 0:
+            escolhas = np.flatnonzero(varredura.alvos[:, 0] >= 0)
+            if len(escolhas) == 0:
+                return None
+        angulo = float(varredura.angulos[escolhas[0]])
+        fase.lancar(angulo, tempo)
+        fase.resolver_colisoes()
+        lancamentos.append((angulo, tempo))
+        tempo = passaro._tempo_de_colisao
+    return lancamentos if 'ganhou' in fase.status(tempo) else None
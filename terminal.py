@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+'''
+Saída diferencial para terminais ANSI: o terminal guarda o último quadro exibido e, no próximo, escreve apenas os
+trechos das linhas que mudaram, cada um precedido por um movimento do cursor. Um quadro igual ao anterior não
+escreve nada, e cada quadro é enviado numa única escrita.
+
+Para a entrada, LeitorDeLinhas junta as linhas digitadas sem bloquear o laço de eventos do asyncio.
+'''
+import asyncio
+import codecs
+import os
+import sys
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+CSI = '\x1b['
+APAGAR_TELA = CSI + '2J'
+APAGAR_ATE_O_FIM_DA_LINHA = CSI + 'K'
+SALVAR_CURSOR = '\x1b7'
+RESTAURAR_CURSOR = '\x1b8'
+
+# trechos alterados separados por até tantos caracteres iguais são escritos juntos, pois reescrever esses
+# caracteres custa menos bytes que um novo movimento do cursor
+INTERVALO_MAXIMO = 6
+
+
+def mover_cursor(linha, coluna):
+    'Sequência que leva o cursor para linha e coluna, contadas a partir de 0'
+    return '%s%d;%dH' % (CSI, linha + 1, coluna + 1)
+
+
+def _trechos_alterados(anterior, atual):
+    'Pares (início, fim) dos trechos de atual diferentes de anterior, com o mesmo comprimento'
+    trechos = []
+    inicio = None
+    iguais = 0
+    for coluna, (a, b) in enumerate(zip(anterior, atual)):
+        if a != b:
+            if inicio is None:
+                inicio = coluna
+            elif iguais > INTERVALO_MAXIMO:
+                trechos.append((inicio, coluna - iguais))
+                inicio = coluna
+            iguais = 0
+        elif inicio is not None:
+            iguais += 1
+    if inicio is not None:
+        trechos.append((inicio, min(len(anterior), len(atual)) - iguais))
+    return trechos
+
+
+class Terminal():
+    '''
+    Exibe quadros de texto num terminal ANSI, escrevendo só as diferenças para o quadro anterior. Use apagar antes
+    de escrever por outros meios, como print ou input, para que o próximo quadro seja escrito por completo.
+    '''
+
+    def __init__(self, saida=None):
+        self._saida = saida
+        self._linhas = None
+        self.caracteres_escritos = 0
+        self.escritas = 0
+
+    @property
+    def saida(self):
+        return sys.stdout if self._saida is None else self._saida
+
+    def exibir(self, quadro):
+        'Exibe quadro, texto com linhas separadas por quebras de linha, e retorna quantos caracteres foram escritos'
+        linhas = quadro.splitlines()
+        anteriores = self._linhas
+        if anteriores is None:
+            partes = [APAGAR_TELA]
+            partes.extend(mover_cursor(numero, 0) + linha for numero, linha in enumerate(linhas))
+            # o cursor fica abaixo do quadro, onde entradas e mensagens podem ser escritas
+            partes.append(mover_cursor(len(linhas), 0))
+        else:
+            partes = []
+            for numero, linha in enumerate(linhas):
+                anterior = anteriores[numero] if numero < len(anteriores) else ''
+                if linha == anterior:
+                    continue
+                for inicio, fim in _trechos_alterados(anterior, linha):
+                    partes.append(mover_cursor(numero, inicio) + linha[inicio:fim])
+                if len(linha) != len(anterior):
+                    # o que sobra da linha nova é escrito inteiro e o que sobra da antiga é apagado
+                    partes.append(mover_cursor(numero, min(len(linha), len(anterior))) +
+                                  linha[len(anterior):] + APAGAR_ATE_O_FIM_DA_LINHA)
+            for numero in range(len(linhas), len(anteriores)):
+                partes.append(mover_cursor(numero, 0) + APAGAR_ATE_O_FIM_DA_LINHA)
+            if partes:
+                # o cursor volta para onde estava, para não atrapalhar o eco do que o jogador está digitando
+                partes.insert(0, SALVAR_CURSOR)
+                partes.append(RESTAURAR_CURSOR)
+        self._linhas = linhas
+        if not partes:
+            return 0
+        texto = ''.join(partes)
+        self.saida.write(texto)
+        self.saida.flush()
+        self.caracteres_escritos += len(texto)
+        self.escritas += 1
+        return len(texto)
+
+    def apagar(self):
+        'Apaga a tela e esquece o quadro anterior'
+        self._linhas = None
+        self.saida.write(APAGAR_TELA + mover_cursor(0, 0))
+        self.saida.flush()
+
+
+class LeitorDeLinhas():
+    '''
+    Lê linhas da entrada sem bloquear o laço de eventos do asyncio: o laço avisa quando há dados, que são lidos sem
+    esperar e separados em linhas, entregues em ordem por proxima_linha. No fim da entrada proxima_linha retorna
+    None. No console do Windows, onde o laço não observa a entrada, o teclado é consultado a cada intervalo.
+    '''
+
+    def __init__(self, entrada=None, intervalo=0.05):
+        self._entrada = sys.stdin if entrada is None else entrada
+        self.intervalo = intervalo
+        self._linhas = asyncio.Queue()
+        self._decodificador = codecs.getincrementaldecoder(getattr(self._entrada, 'encoding', None) or 'utf-8')(
+            'replace')
+        self._parcial = ''
+        self._laco = self._tarefa = None
+
+    def iniciar(self):
+        'Começa a ler; deve ser chamado dentro do laço de eventos'
+        self._laco = asyncio.get_running_loop()
+        try:
+            self._laco.add_reader(self._entrada.fileno(), self._ler)
+        except (NotImplementedError, ValueError, OSError):
+            if msvcrt is None:
+                raise
+            self._laco = None
+            self._tarefa = asyncio.ensure_future(self._consultar_teclado())
+        return self
+
+    def parar(self):
+        if self._laco is not None:
+            self._laco.remove_reader(self._entrada.fileno())
+            self._laco = None
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            self._tarefa = None
+
+    async def proxima_linha(self):
+        'Próxima linha digitada, sem a quebra de linha, ou None no fim da entrada'
+        return await self._linhas.get()
+
+    def _ler(self):
+        dados = os.read(self._entrada.fileno(), 4096)
+        if not dados:
+            self.parar()
+            self._linhas.put_nowait(None)
+            return
+        self._receber(self._decodificador.decode(dados))
+
+    def _receber(self, texto):
+        linhas = (self._parcial + texto).split('\n')
+        self._parcial = linhas.pop()
+        for linha in linhas:
+            self._linhas.put_nowait(linha.rstrip('\r'))
+
+    async def _consultar_teclado(self):
+        while True:
+            while msvcrt.kbhit():
+                caracter = msvcrt.getwche()
+                if caracter == '\r':
+                    msvcrt.putwch('\n')
+                    self._receber('\n')
+                elif caracter == '\b':
+                    self._parcial = self._parcial[:-1]
+                else:
+                    self._receber(caracter)
+            await asyncio.sleep(self.intervalo)
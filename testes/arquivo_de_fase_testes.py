@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import tempfile
+from unittest.case import TestCase, skipIf
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+import arquivo_de_fase
+from arquivo_de_fase import FormatoInvalido, Nivel
+from atores import Obstaculo, Porco, PassaroVermelho, PassaroAmarelo
+from fase import Fase
+from fase_vetorizada import FaseVetorizada, np
+from fases import rodar_fase_exemplo
+from fisica import Fisica
+import python_birds
+
+ARQUIVO_EXEMPLO = os.path.join(project_dir, 'fases', 'exemplo.fase')
+
+
+def criar_fase(classe=Fase):
+    # na metade da escala os pássaros ficam em coordenadas fracionárias, que os formatos precisam preservar
+    return python_birds.criar_fase(classe, 0.5, intervalo_de_colisao=2,
+                                   fisica=Fisica(velocidades={PassaroAmarelo: 25}))
+
+
+def jogar(fase):
+    fase.lancar(45, 1)
+    fase.lancar(63, 3)
+    fase.lancar(23, 4)
+    return [fase.calcular_pontos(i / 10) for i in range(100)] + [fase.status(10)]
+
+
+class ArquivoDeFaseTestes(TestCase):
+    def teste_texto_ida_e_volta(self):
+        nivel = arquivo_de_fase.de_texto(arquivo_de_fase.para_texto(arquivo_de_fase.nivel_da_fase(criar_fase())))
+
+        self.assertEqual(2, nivel.intervalo_de_colisao)
+        self.assertEqual(Fisica(velocidades={PassaroAmarelo: 25}), nivel.fisica)
+        self.assertEqual((3, 1), nivel.quantidades)
+        self.assertEqual([1.5, 1.5, 1.5, 16, 39, 35], list(nivel.x))
+        self.assertEqual(jogar(criar_fase()), jogar(arquivo_de_fase.criar_fase(nivel, Fase)))
+
+    def teste_atores_em_qualquer_ordem(self):
+        nivel = arquivo_de_fase.de_texto('# comentário\nPorco 10 1\nPassaroAmarelo 1 1  # pássaro\nObstaculo 5 5\n'
+                                         'intervalo_de_colisao 3\nduracao_do_tique 0.01\n')
+        self.assertEqual([PassaroAmarelo, Obstaculo, Porco], [nivel.classes[t] for t in nivel.tipos])
+        self.assertEqual((1, 1), nivel.quantidades)
+        self.assertEqual(3, nivel.intervalo_de_colisao)
+        self.assertEqual(0.01, nivel.duracao_do_tique)
+
+    def teste_texto_invalido(self):
+        for texto in ('Porco 1', 'Ponto 1 2', 'Porco a 2', 'fisica.Fisica 1 2', 'gravidade'):
+            with self.assertRaises(FormatoInvalido):
+                arquivo_de_fase.de_texto(texto)
+
+    def teste_binario_ida_e_volta(self):
+        nivel = arquivo_de_fase.de_bytes(arquivo_de_fase.para_bytes(arquivo_de_fase.nivel_da_fase(criar_fase())))
+
+        self.assertEqual(2, nivel.intervalo_de_colisao)
+        self.assertIsNone(nivel.duracao_do_tique)
+        self.assertEqual(Fisica(velocidades={PassaroAmarelo: 25}), nivel.fisica)
+        self.assertEqual(jogar(criar_fase()), jogar(arquivo_de_fase.criar_fase(nivel, Fase)))
+
+    def teste_binario_invalido(self):
+        dados = arquivo_de_fase.para_bytes(arquivo_de_fase.nivel_da_fase(criar_fase()))
+        with self.assertRaises(FormatoInvalido):
+            arquivo_de_fase.de_bytes(b'XXXX' + dados[4:])
+        with self.assertRaises(FormatoInvalido):
+            arquivo_de_fase.de_bytes(dados[:-1])
+        with self.assertRaises(FormatoInvalido):
+            arquivo_de_fase.de_bytes(dados[:-1] + b'\x09')
+
+    def teste_salvar_e_carregar_arquivos(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            for nome in ('fase.fase', 'fase.fasebin'):
+                caminho = os.path.join(diretorio, nome)
+                arquivo_de_fase.salvar(criar_fase(), caminho)
+                self.assertEqual(jogar(criar_fase()), jogar(arquivo_de_fase.carregar(caminho, Fase)))
+
+    def teste_fase_exemplo(self):
+        fase = arquivo_de_fase.carregar(ARQUIVO_EXEMPLO, Fase)
+        self.assertEqual(jogar(rodar_fase_exemplo.criar_fase()), jogar(fase))
+
+    def teste_nao_importa_placas_graficas(self):
+        codigo = ('import sys, arquivo_de_fase; arquivo_de_fase.carregar(%r); '
+                  'print(sorted(m for m in sys.modules if "placa_grafica" in m or "tkinter" in m))' % ARQUIVO_EXEMPLO)
+        saida = subprocess.check_output([sys.executable, '-c', codigo], cwd=project_dir)
+        self.assertEqual(b'[]', saida.strip())
+
+
+@skipIf(np is None, 'NumPy não instalado')
+class FaseVetorizadaDeArraysTestes(TestCase):
+    def teste_carregar_sem_criar_atores(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'fase.fasebin')
+            arquivo_de_fase.salvar(criar_fase(), caminho)
+            fase = arquivo_de_fase.carregar(caminho)
+
+        self.assertIsInstance(fase, FaseVetorizada)
+        self.assertTrue(fase._atores_pendentes)
+        self.assertEqual(jogar(criar_fase()), jogar(fase))
+        self.assertTrue(fase._atores_pendentes)
+
+    def teste_atores_criados_no_primeiro_acesso(self):
+        nivel = arquivo_de_fase.nivel_da_fase(criar_fase())
+        fase = arquivo_de_fase.criar_fase(nivel)
+        fase.lancar(45, 1)
+        fase.calcular_pontos(8)
+
+        passaro = fase._passaros[0]
+        self.assertFalse(fase._atores_pendentes)
+        self.assertIsInstance(passaro, PassaroVermelho)
+        self.assertEqual(1.5, passaro._x_inicial)
+        self.assertEqual(1, passaro._tempo_de_lancamento)
+        self.assertEqual([Obstaculo], [type(ator) for ator in fase._obstaculos])
+        self.assertEqual([(39, 0), (35, 0)], [(porco.x, porco.y) for porco in fase._porcos])
+
+        referencia = criar_fase(FaseVetorizada)
+        referencia.lancar(45, 1)
+        referencia.calcular_pontos(8)
+        fase.adicionar_porco(Porco(90, 1))
+        referencia.adicionar_porco(Porco(90, 1))
+        self.assertEqual(referencia.calcular_pontos(9), fase.calcular_pontos(9))
+
+    def teste_resetar_e_alteracoes_sem_criar_atores(self):
+        fase = arquivo_de_fase.criar_fase(arquivo_de_fase.nivel_da_fase(criar_fase()))
+        referencia = criar_fase(FaseVetorizada)
+        for f in (fase, referencia):
+            f.lancar(45, 1)
+            f.calcular_alteracoes(5)
+            f.resetar()
+            f.lancar(30, 1)
+        self.assertEqual(referencia.calcular_alteracoes(6), fase.calcular_alteracoes(6))
+        self.assertTrue(fase._atores_pendentes)
+
+    def teste_de_arrays(self):
+        fase = FaseVetorizada.de_arrays([PassaroVermelho, Porco], [0, 1], [1, 21], [20, 15], (1, 0))
+        fase.lancar(0, 0)
+        self.assertEqual('Jogo em andamento.', fase.status(0))
+        fase.calcular_pontos(1)
+        self.assertEqual('Jogo em encerrado. Você ganhou!', fase.status(1))
+        self.assertEqual(Nivel, type(arquivo_de_fase.nivel_da_fase(fase)))
+
+    def teste_fase_grande_jogavel_com_o_padrao(self):
+        'Mil pássaros e 200 mil porcos: a fase padrão carrega e calcula cada quadro sem comparar todos com todos'
+        passaros, porcos = 1000, 200000
+        aleatorio = np.random.default_rng(5)
+        nivel = Nivel(1, None, Fisica(), [PassaroVermelho, Porco], np.array([0] * passaros + [1] * porcos),
+                      np.concatenate([np.full(passaros, 3.0), aleatorio.uniform(10, 20000, porcos)]),
+                      np.concatenate([np.full(passaros, 3.0), aleatorio.uniform(0, 50, porcos)]), (passaros, 0))
+        fase = arquivo_de_fase.criar_fase(nivel)
+        self.assertEqual(passaros + porcos, len(fase.calcular_pontos(0)))
+        for i in range(10):
+            fase.lancar(45, i / 10)
+            fase.calcular_alteracoes(i / 10)
+        self.assertEqual('Jogo em andamento.', fase.status(1))
+        self.assertTrue(fase._atores_pendentes)
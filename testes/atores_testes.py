@@ -2,6 +2,7 @@
 
 from __future__ import unicode_literals
 from unittest.case import TestCase
+import medir_memoria
 from atores import Ator, DESTRUIDO, ATIVO, Obstaculo, Porco, PassaroAmarelo, PassaroVermelho
 
 
@@ -147,6 +148,23 @@ class PorcoTestes(AtorBaseTest):
         porco = Porco()
         self.assert_ator_caracteres(porco, '@', '+')
 
+    def teste_criar_varios(self):
+        porcos = Porco.criar_varios([1.4, 2.6], [0.0, 3.5])
+        self.assertListEqual([(1, 0), (3, 4)], [porco.coordenadas() for porco in porcos])
+        self.assertIs(int, type(porcos[1].x))
+        self.assertIsNone(porcos[0]._observador)
+        self.assert_ator_caracteres(porcos[0], '@', '+')
+
+    def teste_criar_varios_com_outro_init(self):
+        class PorcoBlindado(Porco):
+            def __init__(self, x=0, y=0):
+                super().__init__(x, y)
+                self.blindagem = 2
+
+        porcos = PorcoBlindado.criar_varios([5], [6])
+        self.assertEqual((5, 6), porcos[0].coordenadas())
+        self.assertEqual(2, porcos[0].blindagem)
+
 
 class PassaroBaseTests(AtorBaseTest):
     def assert_passaro_posicao(self, x_esperado, y_esperado, status_esperado, passaro, tempo):
@@ -757,3 +775,88 @@ class PassaroAmareloTests(PassaroBaseTests):
         # t = 2 + (delta_t / 100)
         # x, y = passaro_amarelo.calcular_posicao(t)
         # print('        self.assert_passaro_posicao(%s, %s, ATIVO, passaro_amarelo, %s)' % (x, y, t))
+
+
+class PassaroEmPontoFixoTestes(TestCase):
+    def teste_mesmas_posicoes_que_ponto_flutuante(self):
+        for classe in (PassaroVermelho, PassaroAmarelo):
+            for angulo in (10, 23, 45, 63, 90):
+                continuo, fixo = classe(1, 1), classe(1, 1)
+                continuo.lancar(angulo, 1)
+                fixo.lancar(angulo, 1)
+                fixo.usar_ponto_fixo(0.01)
+                for tique in range(0, 400, 7):
+                    tempo = tique * 0.01
+                    self.assertTupleEqual(continuo.calcular_posicao(tempo), fixo.calcular_posicao(tempo))
+
+    def teste_posicao_inteira(self):
+        passaro = PassaroVermelho(1.2, 1.7)
+        passaro.lancar(30, 0)
+        passaro.usar_ponto_fixo(0.05)
+        x, y = passaro.calcular_posicao(0.5)
+        self.assertIsInstance(x, int)
+        self.assertIsInstance(y, int)
+        self.assertTupleEqual((1, 2), passaro.calcular_posicao(-1), 'Antes do lançamento continua na posição inicial')
+
+    def teste_resetar_e_relancar_desliga_ponto_fixo(self):
+        passaro = PassaroVermelho(1, 1)
+        passaro.lancar(30, 0)
+        passaro.usar_ponto_fixo(0.05)
+        passaro.resetar()
+        self.assertIsNone(passaro.trajetoria)
+        passaro.lancar(30, 0)
+        self.assertIsNone(passaro.trajetoria._ponto_fixo)
+
+
+class PosicaoSemEfeitoColateralTestes(TestCase):
+    def teste_posicao_nao_altera_ator(self):
+        ator = Ator(0.6, 2.1)
+        self.assertTupleEqual((1, 2), ator.posicao(0))
+        self.assertTupleEqual((0.6, 2.1), (ator.x, ator.y))
+
+        passaro = PassaroVermelho(1, 1)
+        passaro.lancar(45, 2)
+        self.assertTupleEqual((14, 10), passaro.posicao(2.89))
+        self.assertTupleEqual((1, 1), (passaro.x, passaro.y))
+        self.assertTupleEqual(passaro.posicao(2.89), passaro.calcular_posicao(2.89))
+        self.assertTupleEqual((14, 10), (passaro.x, passaro.y))
+
+    def teste_posicao_depois_da_colisao(self):
+        passaro = PassaroVermelho(1, 1)
+        passaro.lancar(45, 2)
+        passaro._tempo_de_colisao = 2.89
+        self.assertTupleEqual((14, 10), passaro.posicao(5))
+        self.assertTupleEqual((1, 1), passaro.posicao(1), 'Antes do lançamento fica na posição inicial')
+
+    def teste_atores_estaticos_arredondados_na_construcao(self):
+        for classe in (Obstaculo, Porco):
+            ator = classe(2.6, 3.4)
+            self.assertTupleEqual((3, 3), (ator.x, ator.y))
+            self.assertIsInstance(ator.x, int)
+            self.assertTupleEqual((3, 3), ator.posicao(10))
+
+    def teste_colidir_nao_altera_posicoes(self):
+        ator, outro = Ator(0.6, 0.6), Ator(1.4, 1.4)
+        ator.colidir(outro, 1)
+        self.assertEqual(DESTRUIDO, ator.status(1))
+        self.assertTupleEqual((0.6, 0.6), (ator.x, ator.y))
+        self.assertTupleEqual((1.4, 1.4), (outro.x, outro.y))
+
+
+class AtoresCompactosTestes(TestCase):
+    def teste_atores_sem_dict(self):
+        for ator in (Ator(), Obstaculo(), Porco(), PassaroVermelho(), PassaroAmarelo()):
+            self.assertFalse(hasattr(ator, '__dict__'), '%s deveria usar __slots__' % type(ator).__name__)
+            with self.assertRaises(AttributeError):
+                ator.atributo_inexistente = 1
+
+    def teste_comparacao_de_memoria_com_os_mesmos_atributos(self):
+        for nome, antes, depois in medir_memoria.MEDICOES:
+            self.assertSetEqual(medir_memoria.atributos(depois()), medir_memoria.atributos(antes()), nome)
+
+    def teste_status_como_inteiro(self):
+        ator = Ator()
+        self.assertIsInstance(ator.status(0), int)
+        ator._tempo_de_colisao = 1
+        self.assertEqual(DESTRUIDO, ator.status(1))
+        self.assertNotEqual(ATIVO, DESTRUIDO)
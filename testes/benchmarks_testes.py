@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+from unittest.case import TestCase
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+import placa_grafica
+from benchmarks import carregar, casos, comparar, medir, salvar
+
+
+class BenchmarksTestes(TestCase):
+    def teste_casos_cobrem_caminhos_criticos(self):
+        nomes = [caso.nome for caso in casos()]
+        for prefixo in ('Ator.colidir', 'Passaro.calcular_posicao', 'Fase.calcular_pontos', 'Fase.acabou',
+                        'placa_grafica.desenhar'):
+            self.assertTrue(any(nome.startswith(prefixo) for nome in nomes), prefixo)
+        self.assertEqual(len(nomes), len(set(nomes)))
+
+    def teste_medir(self):
+        resultados = medir('desenhar[tela=160x48,atores=10]', repeticoes=1, tempo_minimo=0.001)
+        self.assertEqual(['placa_grafica.desenhar[tela=160x48,atores=10]'], list(resultados))
+        self.assertGreater(resultados['placa_grafica.desenhar[tela=160x48,atores=10]'], 0)
+        self.assertEqual((80, 20), (placa_grafica.LARGURA, placa_grafica.ALTURA))
+
+    def teste_salvar_e_carregar(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'linha_de_base.json')
+            salvar({'Ator.colidir': 1e-6}, caminho)
+            self.assertEqual({'Ator.colidir': 1e-6}, carregar(caminho))
+
+    def teste_comparar(self):
+        base = {'a': 1.0, 'b': 1.0, 'c': 1.0, 'so_na_base': 1.0}
+        atual = {'a': 1.05, 'b': 1.2, 'c': 0.5, 'novo': 1.0}
+        comparacoes = {comparacao.nome: comparacao for comparacao in comparar(base, atual, limite=0.1)}
+        self.assertEqual({'a', 'b', 'c'}, set(comparacoes))
+        self.assertFalse(comparacoes['a'].regressao)
+        self.assertTrue(comparacoes['b'].regressao)
+        self.assertFalse(comparacoes['c'].regressao)
+        self.assertAlmostEqual(1.2, comparacoes['b'].razao)
+        self.assertFalse(comparar(base, atual, limite=0.5)[1].regressao)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import math
+import os
+from unittest.case import TestCase
+import sys
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import PassaroAmarelo
+from empacotamento import FormatoInvalido, TAMANHO_DO_NOME, coluna, escrever_nome, ler_coluna, ler_nome, \
+    para_float, para_valor
+
+
+class EmpacotamentoTestes(TestCase):
+    def teste_nome_de_classe_ida_e_volta(self):
+        partes = []
+        escrever_nome(partes, PassaroAmarelo)
+        dados = b''.join(partes)
+        self.assertEqual((PassaroAmarelo, len(dados)), ler_nome(dados, 0))
+
+    def teste_classe_que_nao_e_ator(self):
+        nome = b'math.sqrt'
+        with self.assertRaises(FormatoInvalido):
+            ler_nome(TAMANHO_DO_NOME.pack(len(nome)) + nome, 0)
+
+    def teste_coluna_ida_e_volta(self):
+        dados = b'\0' + coluna([1.5, -2, 3]).tobytes()
+        valores, fim = ler_coluna(dados, 1, 'd', 3)
+        self.assertEqual([1.5, -2, 3], list(valores))
+        self.assertEqual(len(dados), fim)
+
+    def teste_coluna_truncada(self):
+        with self.assertRaises(FormatoInvalido):
+            ler_coluna(coluna([1, 2]).tobytes(), 0, 'd', 3)
+
+    def teste_none_vira_nan(self):
+        self.assertTrue(math.isnan(para_float(None)))
+        self.assertIsNone(para_valor(para_float(None)))
+        self.assertEqual(2.5, para_valor(para_float(2.5)))
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import sys
+from unittest.case import TestCase
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import Obstaculo, Porco, PassaroAmarelo, DESTRUIDO, ATIVO
+from fase import Ponto
+from fase_analitica import FaseAnalitica
+from python_birds import criar_fase
+
+
+class FaseAnaliticaTestes(TestCase):
+    def teste_colisoes_resolvidas_no_lancamento(self):
+        fase = criar_fase(FaseAnalitica)
+        passaro_vermelho, passaro_amarelo, _ = fase._passaros
+        obstaculo = fase._obstaculos[0]
+        fase.lancar(45, 1)
+        fase.resolver_colisoes()
+        self.assertAlmostEqual(2.96, passaro_vermelho._tempo_de_colisao, 2)
+        self.assertEqual(passaro_vermelho._tempo_de_colisao, obstaculo._tempo_de_colisao)
+        self.assertEqual(ATIVO, passaro_vermelho.status(2.9))
+        self.assertEqual(DESTRUIDO, passaro_vermelho.status(3))
+        self.assertFalse(fase.acabou(100))
+
+        fase.lancar(63, 3)
+        fase.lancar(23, 4)
+        self.assertEqual('Jogo em andamento.', fase.status(8.3))
+        self.assertEqual('Jogo em encerrado. Você ganhou!', fase.status(8.4))
+        # o pássaro vermelho para exatamente na borda superior da caixa do obstáculo, y = 11.5
+        self.assertListEqual([Ponto(31, 12, 'v'), Ponto(76, 2, 'a'), Ponto(69, 2, 'a'), Ponto(31, 10, ' '),
+                              Ponto(78, 1, '+'), Ponto(70, 1, '+')], fase.calcular_pontos(8.5))
+
+    def teste_independente_da_taxa_de_quadros(self):
+        fase = criar_fase(FaseAnalitica)
+        fase.lancar(45, 1)
+        fase.lancar(63, 3)
+        fase.lancar(23, 4)
+        esperado = fase.calcular_pontos(8.5)
+        for tempo in range(0, 900, 7):
+            fase.calcular_pontos(tempo / 100)
+        self.assertListEqual(esperado, fase.calcular_pontos(8.5))
+
+    def teste_alvo_destruido_nao_e_atingido_novamente(self):
+        fase = FaseAnalitica()
+        primeiro, segundo = PassaroAmarelo(0, 20), PassaroAmarelo(0, 20)
+        porco = Porco(30, 15)
+        fase.adicionar_passaro(primeiro, segundo)
+        fase.adicionar_porco(porco)
+        fase.lancar(0, 0)
+        fase.lancar(0, 0.1)
+        fase.resolver_colisoes()
+        self.assertEqual(primeiro._tempo_de_colisao, porco._tempo_de_colisao)
+        self.assertLess(porco._tempo_de_colisao, segundo._tempo_de_colisao)
+        self.assertEqual('Jogo em encerrado. Você ganhou!', fase.status(segundo._tempo_de_colisao))
+
+    def teste_resetar(self):
+        fase = criar_fase(FaseAnalitica)
+        fase.lancar(45, 1)
+        fase.resetar()
+        for ator in fase._passaros + fase._obstaculos + fase._porcos:
+            self.assertEqual(ATIVO, ator.status(100))
+        self.assertFalse(fase.acabou(100))
+
+    def teste_calcular_alteracoes(self):
+        fase = criar_fase(FaseAnalitica)
+        pontos = fase.quadro_chave(0)
+        fase.lancar(45, 1)
+        fase.lancar(63, 3)
+        fase.lancar(23, 4)
+        for i in range(1, 90):
+            for indice, ponto in fase.calcular_alteracoes(i / 10):
+                pontos[indice] = ponto
+            self.assertListEqual(fase.consultar_pontos(i / 10), pontos)
+
+    def teste_atores_e_lancamentos_um_a_um(self):
+        'Adicionar e lançar um de cada vez, entre consultas, dá o mesmo resultado que montar a fase de uma vez'
+        aleatorio = random.Random(3)
+        porcos = [(aleatorio.randint(10, 120), aleatorio.randint(0, 30)) for _ in range(200)]
+        obstaculos = [(aleatorio.randint(10, 120), aleatorio.randint(0, 30)) for _ in range(100)]
+        lancamentos = [(aleatorio.randint(0, 80), i / 2) for i in range(10)]
+
+        de_uma_vez = FaseAnalitica()
+        de_uma_vez.adicionar_passaro(*[PassaroAmarelo(3, 3) for _ in lancamentos])
+        de_uma_vez.adicionar_obstaculo(*[Obstaculo(x, y) for x, y in obstaculos])
+        de_uma_vez.adicionar_porco(*[Porco(x, y) for x, y in porcos])
+        for angulo, tempo in lancamentos:
+            de_uma_vez.lancar(angulo, tempo)
+
+        um_a_um = FaseAnalitica()
+        for _ in lancamentos:
+            um_a_um.adicionar_passaro(PassaroAmarelo(3, 3))
+        for i, (angulo, tempo) in enumerate(lancamentos):
+            um_a_um.lancar(angulo, tempo)
+            um_a_um.adicionar_porco(*[Porco(x, y) for x, y in porcos[20 * i:20 * (i + 1)]])
+            um_a_um.status(tempo)
+        for x, y in obstaculos:
+            um_a_um.adicionar_obstaculo(Obstaculo(x, y))
+        for tempo in range(0, 150, 3):
+            self.assertListEqual(de_uma_vez.calcular_pontos(tempo / 10), um_a_um.calcular_pontos(tempo / 10))
+            self.assertEqual(de_uma_vez.status(tempo / 10), um_a_um.status(tempo / 10))
+
+    def teste_resolucao_apenas_na_consulta(self):
+        fase = criar_fase(FaseAnalitica)
+        resolucoes = []
+        resolver = fase._resolver
+        fase._resolver = lambda: resolucoes.append(1) or resolver()
+        fase.lancar(45, 1)
+        fase.lancar(63, 3)
+        for _ in range(100):
+            fase.adicionar_porco(Porco(90, 1))
+        self.assertEqual([], resolucoes)
+        self.assertEqual('Jogo em andamento.', fase.status(5))
+        fase.calcular_pontos(5)
+        self.assertEqual([1], resolucoes)
@@ -135,6 +135,20 @@ class FaseTestes(TestCase):
         self.assertEqual(math.radians(45), passaro_amarelo._angulo_de_lancamento)
         self.assertEqual(3, passaro_amarelo._tempo_de_lancamento)
 
+    def teste_lancar_apos_resetar(self):
+        passaros = [PassaroAmarelo(1, 1) for i in range(3)]
+        fase = Fase()
+        fase.adicionar_passaro(*passaros)
+        passaros[1].lancar(10, 0)  # pássaro lançado fora da fase é pulado
+        self.assertIs(passaros[0], fase.lancar(45, 1))
+        self.assertIs(passaros[2], fase.lancar(45, 2))
+        self.assertIsNone(fase.lancar(45, 3))
+        fase.resetar()
+        self.assertIs(passaros[0], fase.lancar(30, 4))
+        self.assertEqual(4, passaros[0]._tempo_de_lancamento)
+        fase.adicionar_passaro(PassaroVermelho(1, 1))
+        self.assertIs(passaros[1], fase.lancar(30, 5))
+
     def teste_intervalo_de_colisao_padrão(self):
         '''
         Método que testa se o intervalo de colisão da Fase é repassado aos atores. Padrão de intervalo é 1
@@ -206,9 +220,95 @@ class FaseTestes(TestCase):
         for p in fase_exemplo._passaros:
             self.assertFalse(p.foi_lancado(), 'Nenhum pássaro foi lançado')
 
+    def teste_calcular_alteracoes(self):
+        fase = criar_fase_exemplo()
+        fase.resetar()
+        fase.lancar(45, 1)
+        fase.lancar(63, 3)
+        fase.lancar(23, 4)
+        pontos = [ponto for _, ponto in fase.calcular_alteracoes(0)]
+        self.assertEqual(6, len(pontos), 'Primeira chamada deveria retornar todos os pontos')
+        quadro_chave = list(pontos)
+        for i in range(1, 86):
+            alteracoes = fase.calcular_alteracoes(i / 10)
+            aplicar_alteracoes(pontos, alteracoes)
+            self.assertListEqual(fase.consultar_pontos(i / 10), pontos)
+            self.assertTrue(all(indice < 3 or pontos[indice].caracter in ' +' for indice, _ in alteracoes),
+                            'Atores parados só aparecem quando mudam de caracter')
+        self.assertListEqual([], fase.calcular_alteracoes(8.5))
+
+        aplicar_alteracoes(pontos, fase.consultar_alteracoes(0, 8.5))
+        self.assertListEqual(quadro_chave, pontos)
+        pontos_antes = fase.consultar_pontos(0.5)
+        aplicar_alteracoes(pontos_antes, fase.calcular_alteracoes(3, desde=0.5))
+        self.assertListEqual(fase.consultar_pontos(3), pontos_antes)
+        self.assertListEqual(fase.consultar_pontos(2), fase.quadro_chave(2))
+        aplicar_alteracoes(pontos, fase.calcular_alteracoes(8.5))
+        self.assertListEqual(fase.consultar_pontos(8.5), pontos)
+
+    def teste_calcular_alteracoes_apos_adicionar_ator(self):
+        fase = Fase()
+        fase.adicionar_passaro(PassaroVermelho())
+        fase.calcular_alteracoes(0)
+        self.assertListEqual([], fase.calcular_alteracoes(1))
+        fase.adicionar_porco(Porco(10, 10))
+        self.assertEqual(2, len(fase.calcular_alteracoes(1)))
 
-def criar_fase_exemplo():
-    fase_exemplo = Fase()
+    def teste_consultar_pontos_nao_altera_atores(self):
+        fase_exemplo = criar_fase_exemplo()
+        self.assertListEqual(fase_exemplo.calcular_pontos(3), fase_exemplo.consultar_pontos(3))
+        fase_exemplo.calcular_pontos(8.5)
+        posicoes = [(ator.x, ator.y) for ator in fase_exemplo._passaros]
+        fase_exemplo.consultar_pontos(1.5)
+        self.assertListEqual(posicoes, [(ator.x, ator.y) for ator in fase_exemplo._passaros])
+
+    def teste_fase_em_tiques(self):
+        fase_continua = criar_fase_exemplo()
+        fase_em_tiques = criar_fase_exemplo(duracao_do_tique=0.1)
+        for i in range(90):
+            tempo = i / 10
+            self.assertListEqual(fase_continua.calcular_pontos(tempo), fase_em_tiques.calcular_pontos(tempo))
+            self.assertEqual(fase_continua.status(tempo), fase_em_tiques.status(tempo))
+        for passaro in fase_em_tiques._passaros:
+            self.assertIsInstance(passaro.x, int)
+            self.assertIsInstance(passaro.y, int)
+
+    def teste_tempo_levado_ao_tique_mais_proximo(self):
+        fase = Fase(duracao_do_tique=0.01)
+        passaro = PassaroAmarelo(1, 1)
+        fase.adicionar_passaro(passaro)
+        fase.lancar(45, 0.1 + 0.2)
+        self.assertEqual(0.3, passaro._tempo_de_lancamento)
+        self.assertListEqual(fase.calcular_pontos(1.0000001), fase.calcular_pontos(1))
+
+    def teste_avancar(self):
+        'avancar calcula o mesmo que calcular_pontos, sem gerar os pontos'
+        fase, referencia = criar_fase_exemplo(duracao_do_tique=0.1), criar_fase_exemplo(duracao_do_tique=0.1)
+        for i in range(90):
+            self.assertAlmostEqual(i * 0.1, fase.avancar(i * 0.1 + 0.02))
+            referencia.calcular_pontos(i * 0.1)
+            self.assertListEqual(referencia.consultar_pontos(i * 0.1), fase.consultar_pontos(i * 0.1))
+        self.assertEqual('Jogo em encerrado. Você ganhou!', fase.status(8.9))
+
+    def teste_porcos_destruidos(self):
+        fase = criar_fase_exemplo()
+        self.assertEqual(3, fase.quantidade_de_passaros())
+        for angulo, tempo in ((45, 1), (63, 3), (23, 4)):
+            fase.lancar(angulo, tempo)
+        for i in range(86):
+            fase.calcular_pontos(i / 10)
+        self.assertEqual(0, fase.porcos_destruidos(0))
+        self.assertEqual(1, fase.porcos_destruidos(7))
+        self.assertEqual(2, fase.porcos_destruidos(8.5))
+
+
+def aplicar_alteracoes(pontos, alteracoes):
+    for indice, ponto in alteracoes:
+        pontos[indice] = ponto
+
+
+def criar_fase_exemplo(duracao_do_tique=None):
+    fase_exemplo = Fase(duracao_do_tique=duracao_do_tique)
     passaros = [PassaroVermelho(3, 3), PassaroAmarelo(3, 3), PassaroAmarelo(3, 3)]
     porcos = [Porco(78, 1), Porco(70, 1)]
     obstaculos = [Obstaculo(31, 10)]
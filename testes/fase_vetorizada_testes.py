@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import sys
+from unittest.case import TestCase, skipIf
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import ATIVO, DESTRUIDO, Obstaculo, Porco, PassaroVermelho, PassaroAmarelo
+from fase import Fase, Ponto
+from fase_vetorizada import FaseVetorizada, np
+
+
+def montar_fase(classe_de_fase, semente, intervalo_de_colisao=1):
+    aleatorio = random.Random(semente)
+    fase = classe_de_fase(intervalo_de_colisao)
+    for _ in range(20):
+        classe = aleatorio.choice([PassaroVermelho, PassaroAmarelo])
+        fase.adicionar_passaro(classe(3, 3))
+    for _ in range(30):
+        fase.adicionar_obstaculo(Obstaculo(aleatorio.randint(10, 80), aleatorio.randint(0, 30)))
+    for _ in range(40):
+        fase.adicionar_porco(Porco(aleatorio.randint(10, 80), aleatorio.randint(0, 30)))
+    return fase
+
+
+@skipIf(np is None, 'NumPy não instalado')
+class FaseVetorizadaTestes(TestCase):
+    def teste_calcular_pontos_da_fase_exemplo(self):
+        fase = FaseVetorizada()
+        fase.adicionar_passaro(PassaroVermelho(3, 3), PassaroAmarelo(3, 3), PassaroAmarelo(3, 3))
+        fase.adicionar_porco(Porco(78, 1), Porco(70, 1))
+        fase.adicionar_obstaculo(Obstaculo(31, 10))
+        fase.lancar(45, 1)
+        fase.lancar(63, 3)
+        fase.lancar(23, 4)
+        for i in range(86):
+            fase.calcular_pontos(i / 10)
+
+        expected = [Ponto(31, 11, 'v'), Ponto(77, 2, 'a'), Ponto(69, 2, 'a'), Ponto(31, 10, ' '), Ponto(78, 1, '+'),
+                    Ponto(70, 1, '+')]
+        self.assertListEqual(expected, fase.calcular_pontos(8.5))
+        self.assertFalse(fase.acabou(8.3))
+        self.assertTrue(fase.acabou(8.5))
+        self.assertEqual('Jogo em encerrado. Você ganhou!', fase.status(8.5))
+
+    def teste_mesmo_resultado_que_fase_de_objetos(self):
+        for semente in range(3):
+            fase, vetorizada = montar_fase(Fase, semente, 2), montar_fase(FaseVetorizada, semente, 2)
+            aleatorio = random.Random(semente)
+            for passo in range(300):
+                tempo = passo / 10
+                if passo % 15 == 0:
+                    angulo = aleatorio.randint(0, 90)
+                    fase.lancar(angulo, tempo)
+                    vetorizada.lancar(angulo, tempo)
+                self.assertListEqual(fase.calcular_pontos(tempo), vetorizada.calcular_pontos(tempo))
+                self.assertEqual(fase.status(tempo), vetorizada.status(tempo))
+
+    def teste_calcular_alteracoes_igual_a_fase_de_objetos(self):
+        vetorizada, objetos = montar_fase(FaseVetorizada, 7), montar_fase(Fase, 7)
+        for fase in (vetorizada, objetos):
+            for angulo, tempo in ((10, 0.5), (30, 1), (45, 1.5), (60, 2), (5, 2.5)):
+                fase.lancar(angulo, tempo)
+        for i in range(60):
+            self.assertListEqual(sorted(objetos.calcular_alteracoes(i / 10), key=repr),
+                                 sorted(vetorizada.calcular_alteracoes(i / 10), key=repr))
+        self.assertListEqual(sorted(objetos.consultar_alteracoes(1, 5), key=repr),
+                             sorted(vetorizada.consultar_alteracoes(1, 5), key=repr))
+        vetorizada.resetar()
+        objetos.resetar()
+        self.assertListEqual(sorted(objetos.calcular_alteracoes(0), key=repr),
+                             sorted(vetorizada.calcular_alteracoes(0), key=repr))
+
+    def teste_rebobinar_e_resetar(self):
+        fase, vetorizada = montar_fase(Fase, 7), montar_fase(FaseVetorizada, 7)
+        for f in (fase, vetorizada):
+            f.lancar(30, 0)
+            f.lancar(60, 1)
+        tempos = [i / 10 for i in range(80)]
+        for tempo in tempos + tempos[::-1] + tempos:
+            self.assertListEqual(fase.calcular_pontos(tempo), vetorizada.calcular_pontos(tempo))
+
+        fase.resetar()
+        vetorizada.resetar()
+        self.assertListEqual(fase.calcular_pontos(0), vetorizada.calcular_pontos(0))
+        self.assertFalse(vetorizada.acabou(0))
+
+    def teste_adicionar_apos_calcular_preserva_estado(self):
+        fase = FaseVetorizada()
+        passaro = PassaroAmarelo(1, 1)
+        porco = Porco(2, 2)
+        fase.adicionar_passaro(passaro)
+        fase.adicionar_porco(porco)
+        fase.calcular_pontos(0)
+        fase.adicionar_porco(Porco(50, 50))
+        self.assertListEqual([Ponto(1, 1, 'a'), Ponto(2, 2, '+'), Ponto(50, 50, '@')], fase.calcular_pontos(0))
+        self.assertEqual(0, passaro._tempo_de_colisao)
+        self.assertEqual(0, porco._tempo_de_colisao)
+
+    def teste_atores_acompanham_os_arrays(self):
+        'Os objetos das listas de atores refletem o jogo mesmo quando as listas foram lidas antes de jogar'
+        fase = FaseVetorizada()
+        fase.adicionar_passaro(PassaroVermelho(3, 3), PassaroAmarelo(3, 3), PassaroAmarelo(3, 3))
+        fase.adicionar_porco(Porco(78, 1), Porco(70, 1))
+        fase.adicionar_obstaculo(Obstaculo(31, 10))
+        porcos, passaros = list(fase._porcos), list(fase._passaros)
+        for angulo, tempo in ((45, 1), (63, 3), (23, 4)):
+            fase.lancar(angulo, tempo)
+        for i in range(86):
+            fase.calcular_pontos(i / 10)
+        self.assertTrue(fase.acabou(8.5))
+        self.assertListEqual([DESTRUIDO, DESTRUIDO], [porco.status(8.5) for porco in fase._porcos])
+        self.assertListEqual(porcos, fase._porcos)
+        self.assertTrue(all(passaro._tempo_de_colisao is not None for passaro in passaros))
+        self.assertEqual((31, 11), (passaros[0].x, passaros[0].y))
+        fase.resetar()
+        self.assertListEqual([ATIVO, ATIVO], [porco.status(0) for porco in porcos])
+
+    def teste_atores_de_fase_de_arrays_acompanham_os_arrays(self):
+        fase = FaseVetorizada.de_arrays([PassaroVermelho, Porco], [0, 1], [3, 31], [3, 10], (1, 0))
+        self.assertEqual(ATIVO, fase._porcos[0].status(10))
+        fase.lancar(45, 1)
+        for i in range(60):
+            fase.calcular_pontos(i / 10)
+        self.assertEqual(DESTRUIDO, fase._porcos[0].status(6))
+        self.assertEqual(DESTRUIDO, fase._passaros[0].status(6))
+
+    def teste_passaros_parados_no_mesmo_lugar_que_alvos(self):
+        'Pássaros que aguardam lançamento são testados juntos, mas cada um destrói no máximo um alvo, em ordem'
+        for semente in range(40):
+            aleatorio = random.Random(semente)
+            passaros = [(aleatorio.choice([PassaroVermelho, PassaroAmarelo]), aleatorio.choice([3, 4]),
+                         aleatorio.choice([0, 2, 3])) for _ in range(8)]
+            obstaculos = [(aleatorio.randint(0, 8), aleatorio.randint(0, 6)) for _ in range(aleatorio.randint(0, 6))]
+            porcos = [(aleatorio.randint(0, 8), aleatorio.randint(0, 6)) for _ in range(aleatorio.randint(1, 6))]
+            pontos = []
+            for classe_de_fase in (Fase, FaseVetorizada):
+                fase = classe_de_fase(semente % 2 + 1)
+                fase.adicionar_passaro(*[classe(x, y) for classe, x, y in passaros])
+                fase.adicionar_obstaculo(*[Obstaculo(x, y) for x, y in obstaculos])
+                fase.adicionar_porco(*[Porco(x, y) for x, y in porcos])
+                fase.lancar(45, 0.5)
+                pontos.append([fase.calcular_pontos(i / 10) for i in range(40)])
+            self.assertListEqual(pontos[0], pontos[1])
+
+    def teste_lancar_retorna_passaro(self):
+        fase = FaseVetorizada()
+        passaros = [PassaroVermelho(3, 3), PassaroAmarelo(3, 3)]
+        fase.adicionar_passaro(*passaros)
+        fase.adicionar_porco(Porco(78, 1))
+        self.assertIs(passaros[0], fase.lancar(45, 1))
+        self.assertIs(passaros[1], fase.lancar(30, 2))
+        self.assertIsNone(fase.lancar(30, 3))
+        self.assertEqual(2, passaros[1]._tempo_de_lancamento)
+        self.assertEqual(2, fase._linha_do_tempo.lancados_ate(2))
+
+    def teste_lancar_em_fase_de_arrays_cria_apenas_o_passaro(self):
+        fase = FaseVetorizada.de_arrays([PassaroVermelho, Porco], [0, 0, 1], [3, 3, 78], [3, 3, 1], (2, 0))
+        passaro = fase.lancar(45, 1)
+        self.assertIsInstance(passaro, PassaroVermelho)
+        self.assertTrue(fase._atores_pendentes)
+        ponto = fase.calcular_pontos(2)[0]
+        self.assertEqual(passaro.posicao(2), (ponto.x, ponto.y))
+        self.assertIs(passaro, fase._passaros[0])
+        self.assertIsNone(fase._passaros[1]._tempo_de_lancamento)
+
+    def teste_muitos_alvos_sem_matriz_densa(self):
+        'Um milhão de alvos e mil pássaros: só os alvos perto de cada pássaro são comparados'
+        quantidade, passaros = 1000000, 1000
+        aleatorio = np.random.default_rng(3)
+        x = np.concatenate([np.full(passaros, 3.0), aleatorio.uniform(10, 100000, quantidade)])
+        y = np.concatenate([np.full(passaros, 3.0), aleatorio.uniform(0, 50, quantidade)])
+        fase = FaseVetorizada.de_arrays([PassaroVermelho, Porco], [0] * passaros + [1] * quantidade, x, y,
+                                        (passaros, 0))
+        fase.lancar(45, 0)
+        for i in range(20):
+            fase.calcular_alteracoes(i / 10)
+        self.assertEqual('Jogo em andamento.', fase.status(2))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+from unittest.case import TestCase, skipIf
+import sys
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+import atores
+from atores import Passaro, PassaroAmarelo, PassaroVermelho
+from fase import Fase
+from fase_analitica import FaseAnalitica
+from fase_vetorizada import FaseVetorizada, np
+from fisica import Fisica, FISICA_PADRAO, GRAVIDADE
+from python_birds import criar_fase
+
+
+def criar_fase_lancada(classe=Fase, escala=1):
+    fase = criar_fase(classe, escala, intervalo_de_colisao=escala, fisica=Fisica(escala=escala))
+    fase.lancar(45, 1)
+    fase.lancar(63, 3)
+    fase.lancar(23, 4)
+    return fase
+
+
+class FisicaTestes(TestCase):
+    def teste_valores_padrao(self):
+        self.assertEqual(GRAVIDADE, FISICA_PADRAO.gravidade)
+        self.assertEqual(30, FISICA_PADRAO.velocidade(PassaroAmarelo))
+        self.assertEqual(20, FISICA_PADRAO.velocidade(PassaroVermelho))
+
+    def teste_velocidades_por_classe(self):
+        fisica = Fisica(velocidades={PassaroVermelho: 25})
+        self.assertEqual(25, fisica.velocidade(PassaroVermelho))
+        self.assertEqual(30, fisica.velocidade(PassaroAmarelo))
+        fisica = Fisica(velocidades={Passaro: 5})
+        self.assertEqual(5, fisica.velocidade(PassaroAmarelo), 'Deveria valer para subclasses')
+
+    def teste_velocidade_escalar_alterada_depois_de_consultada(self):
+        self.assertEqual(30, FISICA_PADRAO.velocidade(PassaroAmarelo))
+        original = PassaroAmarelo.velocidade_escalar
+        PassaroAmarelo.velocidade_escalar = 40
+        try:
+            self.assertEqual(40, FISICA_PADRAO.velocidade(PassaroAmarelo))
+            self.assertEqual(400, FISICA_PADRAO.escalada(10).velocidade(PassaroAmarelo))
+            fase = Fase()
+            passaro = PassaroAmarelo(3, 3)
+            fase.adicionar_passaro(passaro)
+            fase.lancar(0, 0)
+            self.assertEqual(43, passaro.posicao(1)[0])
+        finally:
+            PassaroAmarelo.velocidade_escalar = original
+        self.assertEqual(30, FISICA_PADRAO.velocidade(PassaroAmarelo))
+        self.assertEqual(25, Fisica(velocidades={PassaroAmarelo: 25}).velocidade(PassaroAmarelo))
+
+    def teste_gravidade_em_atores(self):
+        self.assertEqual(GRAVIDADE, atores.GRAVIDADE)
+
+    def teste_escala(self):
+        fisica = FISICA_PADRAO.escalada(10)
+        self.assertEqual(100, fisica.gravidade)
+        self.assertEqual(300, fisica.velocidade(PassaroAmarelo))
+        self.assertEqual(10, FISICA_PADRAO.gravidade, 'Física original não deveria mudar')
+        self.assertEqual(Fisica(escala=10), fisica)
+
+    def teste_pickle(self):
+        fisica = Fisica(12, {PassaroVermelho: 25}, 3)
+        copia = pickle.loads(pickle.dumps(fisica))
+        self.assertEqual(fisica, copia)
+        self.assertEqual(75, copia.velocidade(PassaroVermelho))
+
+
+class FaseComFisicaTestes(TestCase):
+    def assert_escalas_independentes(self, classe):
+        ascii, tk = criar_fase_lancada(classe), criar_fase_lancada(classe, 10)
+        self.assertEqual(30, PassaroAmarelo.velocidade_escalar, 'Classes de pássaro não deveriam mudar')
+        for tempo in (1.5, 3.5, 6):
+            pontos_ascii, pontos_tk = ascii.calcular_pontos(tempo), tk.calcular_pontos(tempo)
+            for ponto_ascii, ponto_tk in zip(pontos_ascii, pontos_tk):
+                self.assertEqual(ponto_ascii.caracter, ponto_tk.caracter)
+                self.assertAlmostEqual(ponto_ascii.x * 10, ponto_tk.x, delta=10)
+                self.assertAlmostEqual(ponto_ascii.y * 10, ponto_tk.y, delta=10)
+
+    def teste_fase(self):
+        self.assert_escalas_independentes(Fase)
+
+    def teste_fase_analitica(self):
+        self.assert_escalas_independentes(FaseAnalitica)
+
+    @skipIf(np is None, 'NumPy não instalado')
+    def teste_fase_vetorizada(self):
+        self.assert_escalas_independentes(FaseVetorizada)
+
+    def teste_usar_fisica(self):
+        fase = criar_fase_lancada()
+        fase.usar_fisica(fase.fisica.escalada(2))
+        self.assertEqual(20, fase.fisica.gravidade)
+        for passaro in fase._passaros:
+            self.assertIs(fase.fisica, passaro._fisica)
+        outra = criar_fase_lancada()
+        self.assertEqual(10, outra.fisica.gravidade, 'Outras fases não deveriam mudar')
+
+    def teste_preservada_ao_serializar(self):
+        fase = Fase(fisica=Fisica(12, {PassaroVermelho: 25}, 3))
+        fase.adicionar_passaro(PassaroVermelho())
+        restaurada = Fase.de_bytes(fase.para_bytes())
+        self.assertEqual(fase.fisica, restaurada.fisica)
+        self.assertIs(restaurada.fisica, restaurada._passaros[0]._fisica)
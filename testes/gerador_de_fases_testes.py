@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+from unittest.case import TestCase, skipIf
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import Obstaculo, Porco, PassaroAmarelo
+from fase import Fase
+from fase_analitica import FaseAnalitica
+from gerador_de_fases import gerar_fase, gerar_fases, gerar_nivel, semente_da_fase
+from simulador import simular
+from solucionador import np, resolver
+
+
+class GeradorDeFasesTestes(TestCase):
+    def teste_mesma_semente_mesma_fase(self):
+        self.assertEqual(gerar_nivel(3, porcos=7), gerar_nivel(3, porcos=7))
+        self.assertNotEqual(gerar_nivel(3, porcos=7), gerar_nivel(4, porcos=7))
+
+    def teste_parametros(self):
+        fase = gerar_fase(5, Fase, porcos=12, densidade_de_obstaculos=0.1, largura=200,
+                          passaros=[(PassaroAmarelo, 1)], quantidade_de_passaros=9, intervalo_de_colisao=2)
+        self.assertEqual(2, fase.intervalo_de_colisao)
+        self.assertEqual(12, len(fase._porcos))
+        self.assertEqual(20, len(fase._obstaculos))
+        self.assertEqual([PassaroAmarelo] * 9, [type(passaro) for passaro in fase._passaros])
+        self.assertTrue(all(isinstance(porco, Porco) and 66 <= porco.x < 200 and 0 <= porco.y <= 50
+                            for porco in fase._porcos))
+        self.assertTrue(all(isinstance(obstaculo, Obstaculo) and obstaculo.y >= 0 for obstaculo in fase._obstaculos))
+
+    def teste_gerar_fases_sem_filtro(self):
+        geradas = list(gerar_fases(1, 5, processos=1, porcos=3))
+        self.assertEqual([0, 1, 2, 3, 4], [gerada.indice for gerada in geradas])
+        self.assertTrue(all(gerada.lancamentos is None for gerada in geradas))
+
+
+@skipIf(np is None, 'NumPy não instalado')
+class FiltroDeFasesSoluveisTestes(TestCase):
+    def teste_fases_mantidas_sao_vencidas(self):
+        geradas = list(gerar_fases(2, 5, lancamentos_maximos=6, processos=1, porcos=3))
+        self.assertEqual(5, len(geradas))
+        for gerada in geradas:
+            self.assertLessEqual(len(gerada.lancamentos), 6)
+            fase = gerar_fase(semente_da_fase(2, gerada.indice), FaseAnalitica, porcos=3)
+            for angulo, tempo in gerada.lancamentos:
+                fase.lancar(angulo, tempo)
+            self.assertEqual('Jogo em encerrado. Você ganhou!', fase.status(1000))
+            jogada = simular(gerar_fase(semente_da_fase(2, gerada.indice), porcos=3), gerada.lancamentos, 0.1)
+            self.assertEqual('Jogo em encerrado. Você ganhou!', jogada.status, 'Também vence jogando quadro a quadro')
+
+    def teste_solucao_conferida_no_passo_do_jogo(self):
+        'Fases vencidas só no modelo analítico, e não jogando quadro a quadro, são descartadas'
+        analiticas = [indice for indice in range(12) if resolver(
+            gerar_fase(semente_da_fase(4, indice), FaseAnalitica, porcos=3), 6) is not None]
+        mantidas = [gerada.indice for gerada in gerar_fases(4, 12, lancamentos_maximos=6, tentativas=12, processos=1,
+                                                           porcos=3)]
+        self.assertLess(set(mantidas), set(analiticas))
+
+    def teste_paralelo_igual_ao_serial(self):
+        serial = list(gerar_fases(7, 6, lancamentos_maximos=6, processos=1, porcos=4))
+        paralelo = list(gerar_fases(7, 6, lancamentos_maximos=6, processos=2, tamanho_do_lote=2, porcos=4))
+        self.assertEqual(serial, paralelo)
+
+    def teste_tentativas(self):
+        self.assertEqual([], list(gerar_fases(7, 3, lancamentos_maximos=1, tentativas=5, processos=1, porcos=4)))
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import tempfile
+from unittest.case import TestCase
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import Porco
+from empacotamento import FormatoInvalido
+from fase import Fase
+from gravador import Gravacao, Gravador
+from python_birds import criar_fase
+
+
+def criar_fase_lancada():
+    fase = criar_fase()
+    fase.lancar(45, 1)
+    fase.lancar(63, 3)
+    fase.lancar(20, 4)
+    return fase
+
+
+class PorcoDesenhadoComDoisCaracteres(Porco):
+    _caracter_ativo = '@@'
+
+
+def pontos_esperados(quadros):
+    fase = criar_fase_lancada()
+    return [fase.calcular_pontos(i / 10) for i in range(quadros)]
+
+
+def gravar(gravador, quadros):
+    return [gravador.calcular_pontos(i / 10) for i in range(quadros)]
+
+
+class GravadorTestes(TestCase):
+    def teste_pontos_gravados_iguais_aos_da_fase(self):
+        esperados = pontos_esperados(100)
+        gravador = Gravador(criar_fase_lancada(), quadros_por_segmento=8)
+        self.assertListEqual(esperados, gravar(gravador, 100))
+        self.assertEqual(100, len(gravador))
+        self.assertListEqual(esperados, [gravador.pontos(i) for i in range(100)])
+
+    def teste_acesso_aleatorio_e_de_tras_para_frente(self):
+        esperados = pontos_esperados(100)
+        gravador = Gravador(criar_fase_lancada(), quadros_por_segmento=8)
+        gravar(gravador, 100)
+        for i in (57, 3, 99, 0, 64, 63, 8):
+            self.assertListEqual(esperados[i], gravador.pontos(i))
+        for i in range(99, -1, -1):
+            self.assertListEqual(esperados[i], gravador.pontos(i))
+        for metodo in (gravador.quadro, gravador.tempo, gravador.alteracoes):
+            self.assertRaises(IndexError, metodo, 100)
+            self.assertRaises(IndexError, metodo, -1)
+
+    def teste_tempo_e_alteracoes(self):
+        esperados = pontos_esperados(30)
+        gravador = Gravador(criar_fase_lancada(), quadros_por_segmento=8)
+        gravar(gravador, 30)
+        self.assertEqual(2.5, gravador.tempo(25))
+        self.assertEqual((2.5, esperados[25]), gravador.quadro(25))
+        self.assertListEqual(list(enumerate(esperados[16])), gravador.alteracoes(16), 'Quadro-chave tem todos')
+        for i in range(1, 30):
+            pontos = list(esperados[i - 1])
+            for indice, ponto in gravador.alteracoes(i):
+                pontos[indice] = ponto
+            self.assertListEqual(esperados[i], pontos)
+
+    def teste_calcular_alteracoes(self):
+        fase = criar_fase_lancada()
+        gravador = Gravador(criar_fase_lancada(), quadros_por_segmento=4)
+        for i in range(10):
+            alteracoes = gravador.calcular_alteracoes(i / 10)
+            self.assertListEqual(gravador.alteracoes(i), alteracoes)
+            self.assertListEqual(fase.calcular_pontos(i / 10), gravador.pontos(i))
+
+    def teste_salvar_e_abrir(self):
+        esperados = pontos_esperados(50)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'partida.gravacao')
+            gravador = Gravador(criar_fase_lancada(), quadros_por_segmento=16)
+            gravar(gravador, 40)
+            gravador.salvar(caminho)
+            for i in range(40, 50):
+                gravador.calcular_pontos(i / 10)
+            with Gravacao.abrir(caminho) as gravacao:
+                self.assertEqual(40, len(gravacao))
+                self.assertEqual(16, gravacao.quadros_por_segmento)
+                self.assertTrue(gravacao.comprimida)
+                self.assertListEqual(esperados[:40], [gravacao.pontos(i) for i in range(40)])
+                self.assertListEqual(esperados[39], gravacao.pontos(39))
+            self.assertEqual(50, len(gravador), 'Gravação continua depois de salvar')
+            gravador.fechar()
+
+    def teste_gravar_em_arquivo(self):
+        esperados = pontos_esperados(70)
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'partida.gravacao')
+            with Gravador(criar_fase_lancada(), quadros_por_segmento=8, arquivo=caminho) as gravador:
+                gravar(gravador, 70)
+                self.assertListEqual(esperados[5], gravador.pontos(5))
+            with Gravacao.abrir(caminho) as gravacao:
+                self.assertEqual(70, len(gravacao))
+                self.assertListEqual(esperados, [gravacao.pontos(i) for i in range(69, -1, -1)][::-1])
+
+    def teste_gravar_em_arquivo_temporario(self):
+        'Os segmentos completos vão para o arquivo recebido, que é fechado junto com o gravador'
+        esperados = pontos_esperados(70)
+        arquivo = tempfile.TemporaryFile()
+        gravador = Gravador(criar_fase_lancada(), quadros_por_segmento=8, arquivo=arquivo)
+        gravar(gravador, 70)
+        self.assertGreater(arquivo.seek(0, os.SEEK_END), 0)
+        self.assertListEqual(esperados, [gravador.pontos(i) for i in range(69, -1, -1)][::-1])
+        gravador.fechar()
+        self.assertTrue(arquivo.closed)
+
+    def teste_sem_compressao(self):
+        esperados = pontos_esperados(20)
+        gravador = Gravador(criar_fase_lancada(), quadros_por_segmento=8, comprimir=False)
+        gravar(gravador, 20)
+        self.assertListEqual(esperados, [gravador.pontos(i) for i in range(20)])
+
+    def teste_ator_adicionado_durante_gravacao(self):
+        fase, gravador = criar_fase_lancada(), Gravador(criar_fase_lancada(), quadros_por_segmento=8)
+        gravar(gravador, 5)
+        for f in (fase, gravador.fase):
+            f.adicionar_porco(Porco(60, 1))
+        self.assertListEqual(fase.calcular_pontos(0.5), gravador.calcular_pontos(0.5))
+        self.assertEqual(7, len(gravador.pontos(5)))
+        self.assertEqual(6, len(gravador.pontos(4)))
+
+    def teste_arquivo_invalido(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'partida.gravacao')
+            with open(caminho, 'wb') as arquivo:
+                arquivo.write(b'nada disso' * 10)
+            self.assertRaises(FormatoInvalido, Gravacao.abrir, caminho)
+
+            gravador = Gravador(criar_fase_lancada(), arquivo=caminho)
+            gravar(gravador, 10)
+            gravador._armazenamento.flush()
+            self.assertRaises(FormatoInvalido, Gravacao.abrir, caminho)
+            gravador.fechar()
+
+    def teste_para_bytes(self):
+        esperados = pontos_esperados(20)
+        gravador = Gravador(criar_fase_lancada(), quadros_por_segmento=8)
+        gravar(gravador, 20)
+        dados = gravador.para_bytes()
+        gravador.fechar()
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'partida.gravacao')
+            with open(caminho, 'wb') as arquivo:
+                arquivo.write(dados)
+            with Gravacao.abrir(caminho) as gravacao:
+                self.assertListEqual(esperados, [gravacao.pontos(i) for i in range(20)])
+
+    def teste_pontos_que_o_formato_nao_guarda(self):
+        for porco in (Porco(2 ** 31, 1), Porco(1, -2 ** 31 - 1), PorcoDesenhadoComDoisCaracteres(70, 1)):
+            fase = Fase()
+            fase.adicionar_porco(porco)
+            self.assertRaises(ValueError, Gravador(fase).calcular_pontos, 0)
+
+        fase = criar_fase_lancada()
+        gravador = Gravador(fase)
+        gravar(gravador, 2)
+        fase.adicionar_porco(PorcoDesenhadoComDoisCaracteres(60, 1))
+        self.assertRaises(ValueError, gravador.calcular_alteracoes, 0.2)
+        self.assertEqual(2, len(gravador), 'Quadro inválido não é gravado')
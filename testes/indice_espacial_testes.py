@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+from unittest.case import TestCase
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import Obstaculo, Porco, PassaroAmarelo, DESTRUIDO, ATIVO
+from fase import Fase
+from indice_espacial import GradeEspacial
+
+
+class GradeEspacialTestes(TestCase):
+    def teste_candidatos_vizinhos_em_ordem(self):
+        grade = GradeEspacial(10)
+        porco, obstaculo, distante = Porco(15, 15), Obstaculo(21, 9), Porco(100, 100)
+        grade.adicionar((1, 0), porco)
+        grade.adicionar((0, 0), obstaculo)
+        grade.adicionar((1, 1), distante)
+        self.assertListEqual([obstaculo, porco], grade.candidatos(12, 12, 10, 0))
+        self.assertListEqual([distante], grade.candidatos(95, 95, 10, 0))
+        self.assertListEqual([], grade.candidatos(50, 50, 10, 0))
+
+    def teste_destruidos_saem_e_voltam_ao_restaurar(self):
+        grade = GradeEspacial(1)
+        porco = Porco(2, 2)
+        grade.adicionar((1, 0), porco)
+        porco._tempo_de_colisao = 3
+        self.assertListEqual([porco], grade.candidatos(2, 2, 1, 2))
+        self.assertListEqual([], grade.candidatos(2, 2, 1, 3))
+        self.assertListEqual([], grade.candidatos(2, 2, 1, 2), 'Ator destruído deveria ter saído da grade')
+        grade.restaurar(2)
+        self.assertListEqual([porco], grade.candidatos(2, 2, 1, 2))
+
+
+class FaseComIndiceTestes(TestCase):
+    def teste_colisao_apos_voltar_no_tempo(self):
+        fase = Fase()
+        passaro = PassaroAmarelo(1, 20)
+        porco = Porco(31, 15)
+        fase.adicionar_passaro(passaro)
+        fase.adicionar_porco(porco)
+        fase.lancar(0, 0)
+        fase.calcular_pontos(1)
+        self.assertEqual(DESTRUIDO, porco.status(1))
+        fase.calcular_pontos(0.5)
+        self.assertEqual(ATIVO, porco.status(0.5))
+        fase.calcular_pontos(0.98)
+        self.assertEqual(DESTRUIDO, porco.status(0.98), 'Porco deveria voltar a ser candidato após voltar no tempo')
+
+    def teste_obstaculo_adicionado_depois_tem_prioridade(self):
+        fase = Fase(2)
+        passaro = PassaroAmarelo(5, 5)
+        porco, obstaculo = Porco(6, 6), Obstaculo(4, 4)
+        fase.adicionar_passaro(passaro)
+        fase.adicionar_porco(porco)
+        fase.adicionar_obstaculo(obstaculo)
+        fase.calcular_pontos(0)
+        self.assertEqual(DESTRUIDO, obstaculo.status(0))
+        self.assertEqual(ATIVO, porco.status(0))
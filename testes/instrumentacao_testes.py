@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+from unittest.case import TestCase, skipIf
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+import placa_grafica
+from atores import Porco
+from fase_analitica import FaseAnalitica
+from fase_vetorizada import FaseVetorizada, np
+from instrumentacao import Ganchos, Instrumentacao, AVALIACOES_DE_POSICAO, PONTOS_CRIADOS, QUADROS_DESENHADOS, \
+    TESTES_DE_COLISAO, POSICOES, COLISOES, PONTOS, DESENHO
+from python_birds import criar_fase
+
+
+def jogar(fase, quadros=50):
+    fase.lancar(45, 1)
+    fase.lancar(63, 3)
+    return [placa_grafica.desenhar(*fase.calcular_pontos(i / 10)) for i in range(quadros)]
+
+
+class GanchosGravados(Ganchos):
+    def __init__(self):
+        self.chamadas = []
+
+    def ao_contar(self, contador, quantidade):
+        self.chamadas.append((contador, quantidade))
+
+    def ao_terminar_quadro(self, quadro, duracoes):
+        self.chamadas.append((quadro, sorted(duracoes)))
+
+
+class InstrumentacaoTestes(TestCase):
+    def teste_contadores_e_fases_do_quadro(self):
+        fase = criar_fase()
+        with Instrumentacao() as instrumentacao:
+            instrumentacao.instrumentar_fase(fase)
+            instrumentacao.instrumentar_placa(placa_grafica)
+            jogar(fase)
+        resumo = instrumentacao.estatisticas.resumo()
+
+        self.assertEqual(50, resumo['quadros'])
+        self.assertEqual(50, resumo['contadores'][QUADROS_DESENHADOS])
+        self.assertEqual(50 * 6, resumo['contadores'][PONTOS_CRIADOS])
+        self.assertEqual(50 * 3, resumo['contadores'][AVALIACOES_DE_POSICAO])
+        self.assertGreater(resumo['contadores'][TESTES_DE_COLISAO], 0)
+        self.assertEqual({POSICOES, COLISOES, PONTOS, DESENHO}, set(resumo['segundos_por_quadro']))
+
+    def teste_desligada_devolve_originais(self):
+        fase = criar_fase()
+        desenhar = placa_grafica.desenhar
+        instrumentacao = Instrumentacao()
+        instrumentacao.instrumentar_fase(fase)
+        instrumentacao.instrumentar_placa(placa_grafica)
+        self.assertIsNot(desenhar, placa_grafica.desenhar)
+        instrumentacao.desligar()
+
+        self.assertIs(desenhar, placa_grafica.desenhar)
+        for nome in ('calcular_pontos', '_calcular_posicoes', '_calcular_colisoes', '_gerar_pontos'):
+            self.assertNotIn(nome, vars(fase))
+        self.assertNotIn('candidatos', vars(fase._indice))
+
+    def teste_nao_altera_resultado(self):
+        fase = criar_fase()
+        with Instrumentacao() as instrumentacao:
+            instrumentacao.instrumentar_fase(fase)
+            instrumentacao.instrumentar_placa(placa_grafica)
+            instrumentada = jogar(fase, 90)
+        self.assertEqual(jogar(criar_fase(), 90), instrumentada)
+
+    def teste_ganchos(self):
+        ganchos = GanchosGravados()
+        fase = criar_fase()
+        with Instrumentacao(ganchos) as instrumentacao:
+            instrumentacao.instrumentar_fase(fase)
+            fase.calcular_alteracoes(0)
+            fase.calcular_alteracoes(0.1)
+        self.assertIn((PONTOS_CRIADOS, 6), ganchos.chamadas)
+        self.assertIn((PONTOS_CRIADOS, 0), ganchos.chamadas)
+        self.assertEqual([1, 2], [chamada[0] for chamada in ganchos.chamadas if isinstance(chamada[0], int)])
+        self.assertIsNone(instrumentacao.estatisticas)
+
+    def teste_fase_analitica_conta_testes_no_lancamento(self):
+        fase = criar_fase(FaseAnalitica)
+        with Instrumentacao() as instrumentacao:
+            instrumentacao.instrumentar_fase(fase)
+            fase.lancar(45, 1)
+        # só o obstáculo está dentro da caixa do voo; os porcos, em x 70 e 78, ficam além de onde o pássaro cai
+        self.assertEqual(1, instrumentacao.estatisticas.contadores[TESTES_DE_COLISAO])
+
+    @skipIf(np is None, 'NumPy não instalado')
+    def teste_fase_vetorizada(self):
+        fase = criar_fase(FaseVetorizada)
+        fase.adicionar_porco(Porco(4, 3))
+        with Instrumentacao() as instrumentacao:
+            instrumentacao.instrumentar_fase(fase)
+            fase.calcular_pontos(0)
+        # os três pássaros parados em (3, 3) são uma só posição, e só o porco em (4, 3) está na sua faixa de x
+        self.assertEqual(1, instrumentacao.estatisticas.contadores[TESTES_DE_COLISAO])
+        self.assertEqual(3, instrumentacao.estatisticas.contadores[AVALIACOES_DE_POSICAO])
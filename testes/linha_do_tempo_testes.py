@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+from unittest.case import TestCase
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import Porco, PassaroAmarelo, ATIVO
+from fase import Fase, Ponto, PORCOS, PASSAROS
+from linha_do_tempo import LinhaDoTempo, TemposOrdenados
+
+
+class TemposOrdenadosTestes(TestCase):
+    def teste_contar_ate(self):
+        tempos = TemposOrdenados()
+        for tempo in (3, 1, 2, 2):
+            tempos.adicionar(tempo)
+        self.assertEqual(0, tempos.contar_ate(0.5))
+        self.assertEqual(3, tempos.contar_ate(2))
+        self.assertEqual(4, tempos.contar_ate(10))
+        tempos.remover(2)
+        self.assertEqual(2, tempos.contar_ate(2))
+        self.assertEqual(3, tempos.ultimo())
+
+    def teste_contar_nas_pontas_sem_busca_binaria(self):
+        tempos = TemposOrdenados()
+        self.assertEqual(0, tempos.contar_ate(5))
+        for tempo in (1, 2, 3):
+            tempos.adicionar(tempo)
+        self.assertEqual(3, tempos.contar_ate(3))
+        self.assertEqual(0, tempos.contar_ate(0))
+        self.assertEqual(1, tempos.contar_ate(1.5))
+
+    def teste_observa_colisoes_dos_atores(self):
+        linha = LinhaDoTempo(PORCOS)
+        porco = Porco()
+        linha.registrar(PORCOS, porco)
+        self.assertEqual(0, linha.destruidos_ate(PORCOS, 10))
+        porco.colidir(porco, 3)
+        self.assertEqual(0, linha.destruidos_ate(PORCOS, 2.9))
+        self.assertEqual(1, linha.destruidos_ate(PORCOS, 3))
+        porco._tempo_de_colisao = 5
+        self.assertEqual(0, linha.destruidos_ate(PORCOS, 3))
+        porco.resetar()
+        self.assertEqual(0, linha.destruidos_ate(PORCOS, 10))
+
+
+class FaseComLinhaDoTempoTestes(TestCase):
+    def criar_fase(self):
+        fase = Fase()
+        fase.adicionar_passaro(PassaroAmarelo(1, 20))
+        fase.adicionar_porco(Porco(31, 15))
+        fase.lancar(0, 0)
+        return fase
+
+    def teste_consultas_em_qualquer_tempo(self):
+        fase = self.criar_fase()
+        for i in range(11):
+            fase.calcular_pontos(i / 10)
+        self.assertEqual(1, fase._linha_do_tempo.lancados_ate(0))
+        self.assertEqual(1, fase._linha_do_tempo.destruidos_ate(PASSAROS, 1))
+        self.assertEqual('Jogo em andamento.', fase.status(0.9))
+        self.assertEqual('Jogo em encerrado. Você ganhou!', fase.status(1))
+        self.assertTrue(fase.acabou(50))
+        self.assertFalse(fase.acabou(0.5))
+
+    def teste_consultar_pontos_nao_procura_colisoes(self):
+        fase = self.criar_fase()
+        self.assertListEqual([Ponto(31, 15, 'A'), Ponto(31, 15, '@')], fase.consultar_pontos(1))
+        self.assertEqual(ATIVO, fase._porcos[0].status(1))
+        fase.calcular_pontos(1)
+        self.assertListEqual([Ponto(31, 15, 'a'), Ponto(31, 15, '+')], fase.consultar_pontos(1))
+        self.assertListEqual([Ponto(16, 19, 'A'), Ponto(31, 15, '@')], fase.consultar_pontos(0.5))
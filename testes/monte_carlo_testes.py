@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+from unittest.case import TestCase, skipIf
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import Obstaculo, Porco, PassaroAmarelo, PassaroVermelho
+from fase import Fase
+from fase_analitica import FaseAnalitica
+from fase_vetorizada import FaseVetorizada, np
+from monte_carlo import avaliar, gerar_sequencias
+from python_birds import criar_fase
+
+
+class MonteCarloTestes(TestCase):
+    def teste_sequencias_reprodutiveis(self):
+        self.assertListEqual(list(gerar_sequencias(3, 5, 3)), list(gerar_sequencias(3, 5, 3)))
+        self.assertNotEqual(list(gerar_sequencias(3, 5, 3)), list(gerar_sequencias(4, 5, 3)))
+
+    def teste_sequencia_vencedora(self):
+        estatisticas = avaliar(criar_fase(), [[(45, 1), (63, 3), (23, 4)]] * 2, delta_t=0.1, processos=1)
+        self.assertEqual(2, estatisticas.simulacoes)
+        self.assertEqual(1, estatisticas.taxa_de_vitoria)
+        self.assertEqual(2, estatisticas.porcos_destruidos_em_media)
+        self.assertAlmostEqual(8.5, estatisticas.tempo_medio_das_vitorias)
+
+    def teste_paralelo_igual_ao_serial(self):
+        serial = avaliar(criar_fase(), gerar_sequencias(7, 20, 3), delta_t=0.1, processos=1)
+        paralelo = avaliar(criar_fase(), gerar_sequencias(7, 20, 3), delta_t=0.1, processos=2, tamanho_do_lote=3)
+        self.assertEqual(serial, paralelo)
+
+    def avaliar_motor(self, classe_de_fase):
+        fase = classe_de_fase()
+        fase.adicionar_obstaculo(Obstaculo(31, 10))
+        fase.adicionar_porco(Porco(78, 1), Porco(70, 1))
+        fase.adicionar_passaro(PassaroVermelho(3, 3), PassaroAmarelo(3, 3), PassaroAmarelo(3, 3))
+        self.assertEqual(3, fase.quantidade_de_passaros())
+        return avaliar(fase, [[(45, 1), (63, 3), (23, 4)]] + list(gerar_sequencias(5, 4, 3)), delta_t=0.1,
+                       processos=1)
+
+    def teste_fase_analitica(self):
+        'O tempo da vitória pode diferir em um passo, pois a fase analítica calcula o instante exato da colisão'
+        objetos, analitica = self.avaliar_motor(Fase), self.avaliar_motor(FaseAnalitica)
+        self.assertEqual(objetos.vitorias, analitica.vitorias)
+        self.assertEqual(objetos.porcos_destruidos_em_media, analitica.porcos_destruidos_em_media)
+
+    @skipIf(np is None, 'NumPy não instalado')
+    def teste_fase_vetorizada(self):
+        estatisticas = self.avaliar_motor(FaseVetorizada)
+        self.assertGreater(estatisticas.porcos_destruidos_em_media, 0)
+        self.assertEqual(self.avaliar_motor(Fase), estatisticas)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import os
+from unittest.case import TestCase
+import sys
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from relogio import Cadencia, Relogio
+
+
+class RelogioTestes(TestCase):
+    def teste_tempo_sem_erro_acumulado(self):
+        relogio = Relogio(0.1)
+        tempo_somado = 0
+        for _ in range(1000):
+            relogio.avancar()
+            tempo_somado += 0.1
+        self.assertEqual(1000, relogio.tique)
+        self.assertEqual(100.0, relogio.tempo)
+        self.assertNotEqual(100.0, tempo_somado)
+
+    def teste_mesmo_tique_mesmo_tempo(self):
+        relogio = Relogio(0.01)
+        relogio.avancar(37)
+        ida = relogio.tempo
+        relogio.avancar(500)
+        relogio.avancar(-500)
+        self.assertEqual(ida, relogio.tempo)
+        self.assertEqual(37, relogio.tique_em(ida))
+
+    def teste_tiques_por_quadro(self):
+        relogio = Relogio(0.01)
+        self.assertEqual(10, relogio.tiques_por_quadro(0.1))
+        self.assertEqual(1, relogio.tiques_por_quadro(0.001))
+
+    def teste_duracao_invalida(self):
+        self.assertRaises(ValueError, Relogio, 0)
+
+
+class RelogioFalso():
+    'Relógio monotônico controlado pelo teste; dormir avança o tempo'
+
+    def __init__(self):
+        self.tempo = 100.0
+        self.esperas = []
+
+    def agora(self):
+        return self.tempo
+
+    def dormir(self, segundos):
+        self.esperas.append(segundos)
+        self.tempo += segundos
+
+
+class CadenciaTestes(TestCase):
+    def criar(self, periodo=0.1, **parametros):
+        relogio = RelogioFalso()
+        return relogio, Cadencia(periodo, agora=relogio.agora, dormir=relogio.dormir, **parametros)
+
+    def teste_trabalho_nao_soma_ao_periodo(self):
+        relogio, cadencia = self.criar()
+        for _ in range(10):
+            self.assertTrue(cadencia.esperar())
+            relogio.tempo += 0.03  # simulação e desenho
+        self.assertAlmostEqual(100.93, relogio.tempo)
+        for espera in relogio.esperas:
+            self.assertAlmostEqual(0.07, espera)
+        desempenho = cadencia.desempenho()
+        self.assertEqual((10, 10, 0), desempenho[:3])
+        self.assertAlmostEqual(10 / 0.93, desempenho.fps)
+
+    def teste_quadros_atrasados_nao_sao_desenhados(self):
+        relogio, cadencia = self.criar()
+        desenhados = []
+        for _ in range(20):
+            desenhado = cadencia.esperar()
+            desenhados.append(desenhado)
+            relogio.tempo += 0.25 if desenhado else 0.01  # desenhar é mais caro que o quadro
+        self.assertIn(False, desenhados)
+        self.assertEqual(20, cadencia.desenhados + cadencia.descartados)
+        self.assertEqual(desenhados.count(False), cadencia.descartados)
+        self.assertLess(relogio.tempo - 100, 20 * 0.15, 'Descartando desenhos, o jogo acompanha o relógio')
+
+    def teste_maximo_de_descartes_seguidos(self):
+        relogio, cadencia = self.criar(maximo_de_descartes=2)
+        desenhados = []
+        for _ in range(12):
+            desenhados.append(cadencia.esperar())
+            relogio.tempo += 0.35
+        for i in range(len(desenhados) - 2):
+            self.assertTrue(any(desenhados[i:i + 3]))
+
+    def teste_atraso_longo_recomeca_prazos(self):
+        relogio, cadencia = self.criar()
+        cadencia.esperar()
+        relogio.tempo += 30
+        self.assertFalse(cadencia.esperar(), 'Quadro atrasado não é desenhado')
+        self.assertTrue(cadencia.esperar(), 'Não tenta compensar o atraso descartando mais quadros')
+        self.assertEqual(1, cadencia.descartados)
+        self.assertAlmostEqual(30.1, cadencia.desempenho().segundos, msg='O atraso conta no desempenho')
+
+    def teste_fase_acima_do_orcamento(self):
+        'Cada quadro leva mais que o período: descarta desenhos sempre que pode e relata a taxa real'
+        relogio, cadencia = self.criar(maximo_de_descartes=5)
+        inicio = relogio.tempo
+        desenhados = []
+        for _ in range(60):
+            desenhado = cadencia.esperar()
+            desenhados.append(desenhado)
+            relogio.tempo += 0.85 if desenhado else 0.2
+        self.assertEqual(10, desenhados.count(True))
+        self.assertEqual(50, cadencia.descartados)
+        desempenho = cadencia.desempenho()
+        self.assertAlmostEqual(relogio.tempo - inicio, desempenho.segundos)
+        self.assertAlmostEqual(10 / (relogio.tempo - inicio), desempenho.fps)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import os
+import struct
+from unittest.case import TestCase, skipIf
+import sys
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import Obstaculo, Porco, PassaroVermelho, PassaroAmarelo, DESTRUIDO, ATIVO
+from fase import Fase
+from fase_analitica import FaseAnalitica
+from fase_vetorizada import FaseVetorizada, np
+from python_birds import criar_fase
+from serializacao import FormatoInvalido, MAGICO, _CABECALHO
+
+
+def estado(fase, tempo):
+    return [(type(ponto.caracter), ponto.x, ponto.y, ponto.caracter) for ponto in fase.calcular_pontos(tempo)]
+
+
+class SerializacaoTestes(TestCase):
+    def assert_mesma_fase(self, classe):
+        fase = criar_fase(classe, intervalo_de_colisao=2)
+        fase.lancar(45, 1)
+        fase.lancar(63, 3)
+        fase.calcular_pontos(4)
+        restaurada = classe.de_bytes(fase.para_bytes())
+
+        self.assertIsInstance(restaurada, classe)
+        self.assertEqual(fase.intervalo_de_colisao, restaurada.intervalo_de_colisao)
+        self.assertEqual(len(fase._passaros), len(restaurada._passaros))
+        for tempo in (4, 5, 7, 10):
+            self.assertEqual(estado(fase, tempo), estado(restaurada, tempo))
+            self.assertEqual(fase.status(tempo), restaurada.status(tempo))
+        fase.lancar(23, 11)
+        restaurada.lancar(23, 11)
+        for tempo in (12, 15):
+            self.assertEqual(estado(fase, tempo), estado(restaurada, tempo))
+            self.assertEqual(fase.status(tempo), restaurada.status(tempo))
+
+    def teste_fase(self):
+        self.assert_mesma_fase(Fase)
+
+    def teste_fase_analitica(self):
+        self.assert_mesma_fase(FaseAnalitica)
+
+    @skipIf(np is None, 'NumPy não instalado')
+    def teste_fase_vetorizada(self):
+        self.assert_mesma_fase(FaseVetorizada)
+
+    def teste_estado_dos_atores(self):
+        fase = criar_fase()
+        fase.lancar(45, 1)
+        fase.calcular_pontos(3)
+        restaurada = Fase.de_bytes(fase.para_bytes())
+        self.assertEqual(fase._ultimo_tempo, restaurada._ultimo_tempo)
+        for original, copia in zip(fase._passaros + fase._obstaculos + fase._porcos,
+                                   restaurada._passaros + restaurada._obstaculos + restaurada._porcos):
+            self.assertIs(type(original), type(copia))
+            self.assertEqual((original.x, original.y, original._tempo_de_colisao),
+                             (copia.x, copia.y, copia._tempo_de_colisao))
+        passaro = restaurada._passaros[0]
+        self.assertTrue(passaro.foi_lancado())
+        self.assertEqual(1, passaro._tempo_de_lancamento)
+        self.assertFalse(restaurada._passaros[1].foi_lancado())
+        self.assertIsNone(restaurada._passaros[1]._angulo_de_lancamento)
+
+    def teste_voltar_no_tempo_apos_restaurar(self):
+        fase = Fase()
+        porco = Porco(31, 15)
+        fase.adicionar_porco(porco)
+        fase.adicionar_passaro(PassaroAmarelo(1, 20))
+        fase.lancar(0, 0)
+        fase.calcular_pontos(1)
+        self.assertEqual(DESTRUIDO, porco.status(1))
+        restaurada = Fase.de_bytes(fase.para_bytes())
+        restaurada.calcular_pontos(0.5)
+        self.assertEqual(ATIVO, restaurada._porcos[0].status(0.5))
+        restaurada.calcular_pontos(0.98)
+        self.assertEqual(DESTRUIDO, restaurada._porcos[0].status(0.98))
+
+    def teste_fase_em_tiques(self):
+        fase = Fase(duracao_do_tique=0.01)
+        fase.adicionar_porco(Porco(78, 1))
+        fase.adicionar_passaro(PassaroVermelho(), PassaroAmarelo())
+        fase.lancar(45, 1)
+        restaurada = Fase.de_bytes(fase.para_bytes())
+        self.assertEqual(0.01, restaurada.duracao_do_tique)
+        self.assertIsNotNone(restaurada._passaros[0].trajetoria._ponto_fixo)
+        self.assertEqual(estado(fase, 2.5), estado(restaurada, 2.5))
+        self.assertIsNone(Fase.de_bytes(Fase().para_bytes()).duracao_do_tique)
+
+    def teste_fase_vazia(self):
+        fase = Fase.de_bytes(Fase().para_bytes())
+        self.assertEqual([], fase._passaros + fase._obstaculos + fase._porcos)
+
+    def teste_versoes_anteriores(self):
+        'Estados salvos antes da duração do tique e da física continuam carregando, com a física padrão'
+        fase = criar_fase()
+        fase.lancar(45, 1)
+        fase.calcular_pontos(3)
+        dados = fase.para_bytes()
+        atores = dados[_CABECALHO.size:]  # a física padrão não tem velocidades, então os atores vêm logo depois
+        contagens = (len(fase._passaros), len(fase._obstaculos), len(fase._porcos), 4)
+        versao_1 = struct.pack('<4sHddIIIH', MAGICO, 1, 2, fase._ultimo_tempo, *contagens) + atores
+        versao_2 = struct.pack('<4sHdddIIIH', MAGICO, 2, 2, fase._ultimo_tempo, 0.01, *contagens) + atores
+        for dados, duracao_do_tique in ((versao_1, None), (versao_2, 0.01)):
+            restaurada = Fase.de_bytes(dados)
+            self.assertEqual(duracao_do_tique, restaurada.duracao_do_tique)
+            self.assertEqual(fase.fisica, restaurada.fisica)
+            self.assertEqual(estado(fase, 6), estado(restaurada, 6))
+        self.assertRaises(FormatoInvalido, Fase.de_bytes, versao_2[:20])
+        total = sum(contagens[:3])
+        inicio_dos_tipos = len(versao_2) - 25 * total - 32 * len(fase._passaros)
+        tipo_invalido = versao_2[:inicio_dos_tipos] + b'\x09' + versao_2[inicio_dos_tipos + 1:]
+        with self.assertRaisesRegex(FormatoInvalido, 'fora da tabela'):
+            Fase.de_bytes(tipo_invalido)
+
+    def teste_muitos_atores(self):
+        fase = Fase()
+        fase.adicionar_obstaculo(*[Obstaculo(x, x % 7) for x in range(2000)])
+        fase.adicionar_porco(*[Porco(x + 0.4, 1) for x in range(0, 2000, 3)])
+        fase.adicionar_porco(*[Obstaculo(x, 30) for x in range(5)])
+        fase.adicionar_passaro(PassaroVermelho(), PassaroAmarelo())
+        fase.lancar(30, 0)
+        fase.lancar(60, 1)
+        restaurada = Fase.de_bytes(fase.para_bytes())
+        for tempo in (0, 2, 5, 9):
+            self.assertEqual(estado(fase, tempo), estado(restaurada, tempo))
+        self.assertIs(Obstaculo, type(restaurada._porcos[-1]))
+
+    def teste_formato_invalido(self):
+        dados = criar_fase().para_bytes()
+        self.assertTrue(dados.startswith(MAGICO))
+        self.assertRaises(FormatoInvalido, Fase.de_bytes, b'XXXX' + dados[4:])
+        self.assertRaises(FormatoInvalido, Fase.de_bytes, dados[:4] + b'\xff\xff' + dados[6:])
+        self.assertRaises(FormatoInvalido, Fase.de_bytes, dados[:-1])
+        self.assertRaises(FormatoInvalido, Fase.de_bytes, dados[:10])
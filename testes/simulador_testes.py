@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+from unittest.case import TestCase, skipIf
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import Obstaculo, Porco, PassaroVermelho, PassaroAmarelo
+from fase import Fase
+from fase_vetorizada import FaseVetorizada, np
+from python_birds import criar_fase
+from simulador import simular, FISICA, COLISAO, CONTABILIDADE
+
+
+def criar_fase_com_tiques(classe_de_fase):
+    fase = classe_de_fase(duracao_do_tique=0.04)
+    fase.adicionar_passaro(PassaroVermelho(3, 3), PassaroAmarelo(3, 3), PassaroAmarelo(3, 3))
+    fase.adicionar_porco(Porco(78, 1), Porco(70, 1))
+    fase.adicionar_obstaculo(Obstaculo(31, 10))
+    return fase
+
+
+class SimuladorTestes(TestCase):
+    def teste_simular_vitoria(self):
+        resultado = simular(criar_fase(), [(63, 3), (45, 1), (23, 4)], delta_t=0.1)
+        self.assertEqual('Jogo em encerrado. Você ganhou!', resultado.status)
+        self.assertAlmostEqual(8.5, resultado.tempo)
+        self.assertEqual(85, resultado.quadros)
+        self.assertSetEqual({FISICA, COLISAO, CONTABILIDADE}, set(resultado.tempos_por_fase))
+
+    def teste_simular_ate_tempo_maximo(self):
+        resultado = simular(criar_fase(), [], delta_t=0.5, tempo_maximo=10)
+        self.assertEqual('Jogo em andamento.', resultado.status)
+        self.assertEqual(21, resultado.quadros)
+
+    def teste_passos_levados_ao_tique(self):
+        'Passos fora da grade de tiques são levados ao tique mais próximo, como em calcular_pontos'
+        fase = criar_fase_com_tiques(Fase)
+        resultado = simular(fase, [(45, 1), (63, 3), (23, 4)], delta_t=0.01, tempo_maximo=10)
+        referencia = criar_fase_com_tiques(Fase)
+        for angulo, tempo in [(45, 1), (63, 3), (23, 4)]:
+            referencia.lancar(angulo, tempo)
+        for quadro in range(resultado.quadros + 1):
+            referencia.calcular_pontos(quadro * 0.01)
+        self.assertEqual(referencia.status(resultado.tempo), resultado.status)
+        self.assertListEqual(referencia.consultar_pontos(resultado.tempo), fase.consultar_pontos(resultado.tempo))
+
+    @skipIf(np is None, 'NumPy não instalado')
+    def teste_fase_vetorizada(self):
+        lancamentos = [(45, 1), (63, 3), (23, 4)]
+        resultados = [simular(criar_fase_com_tiques(classe), lancamentos, delta_t=0.01, tempo_maximo=10)[:3]
+                      for classe in (Fase, FaseVetorizada)]
+        self.assertEqual(resultados[0], resultados[1])
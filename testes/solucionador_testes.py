@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+import warnings
+from unittest.case import TestCase, skipIf
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from atores import Obstaculo, Porco, PassaroVermelho, PassaroAmarelo
+from fase_analitica import FaseAnalitica
+from fase_vetorizada import FaseVetorizada
+from solucionador import resolver, varrer, np
+
+
+def criar_fase(classe_de_fase=FaseAnalitica):
+    fase = classe_de_fase()
+    fase.adicionar_passaro(PassaroVermelho(3, 3), PassaroAmarelo(3, 3), PassaroAmarelo(3, 3))
+    fase.adicionar_porco(Porco(78, 1), Porco(70, 1))
+    fase.adicionar_obstaculo(Obstaculo(31, 10))
+    return fase
+
+
+@skipIf(np is None, 'NumPy não instalado')
+class SolucionadorTestes(TestCase):
+    def teste_mesmo_resultado_que_fase_analitica(self):
+        varredura = varrer(criar_fase(), PassaroAmarelo, range(0, 91, 3), [0.5])
+        for i, angulo in enumerate(range(0, 91, 3)):
+            fase = criar_fase()
+            fase._passaros = fase._passaros[1:]
+            passaro = fase.lancar(angulo, 0.5)
+            fase.resolver_colisoes()
+            alvos = fase._obstaculos + fase._porcos
+            atingidos = [j for j, alvo in enumerate(alvos) if alvo._tempo_de_colisao is not None]
+            self.assertEqual(atingidos[0] if atingidos else -1, varredura.alvos[i, 0], 'Ângulo %s' % angulo)
+            self.assertAlmostEqual(passaro._tempo_de_colisao, varredura.tempos_de_colisao[i, 0])
+
+    def teste_porcos_destruidos(self):
+        varredura = varrer(criar_fase(), PassaroAmarelo, [27, 45, 66], [4])
+        self.assertEqual((3, 1), varredura.porcos.shape)
+        self.assertListEqual([0, -1, 1], varredura.porcos[:, 0].tolist())
+
+    def teste_alvo_ja_destruido_nao_conta(self):
+        fase = criar_fase()
+        segundo_porco = fase._porcos[1]
+        segundo_porco._tempo_de_colisao = 8
+        varredura = varrer(fase, PassaroAmarelo, [66], [1, 4])
+        self.assertEqual(1, varredura.porcos[0, 0], 'Porco ainda ativo quando o pássaro chega')
+        self.assertEqual(-1, varredura.porcos[0, 1], 'Porco já destruído quando o pássaro chega')
+
+    def teste_alvos_destruidos_durante_o_jogo(self):
+        'Os tempos de colisão vêm do motor da fase, inclusive dos arrays de FaseVetorizada'
+        for classe_de_fase in (FaseAnalitica, FaseVetorizada):
+            fase = criar_fase(classe_de_fase)
+            self.assertEqual(1, varrer(fase, PassaroAmarelo, [66], [4]).porcos[0, 0])
+            for angulo, tempo in ((45, 1), (63, 3), (23, 4)):
+                fase.lancar(angulo, tempo)
+            for i in range(70):
+                fase.calcular_pontos(i / 10)
+            self.assertEqual(1, fase.porcos_destruidos(7))
+            self.assertEqual(-1, varrer(fase, PassaroAmarelo, [66], [4]).porcos[0, 0], classe_de_fase.__name__)
+
+    def teste_lancamento_abaixo_do_chao_sem_avisos(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            varredura = varrer(criar_fase(), PassaroAmarelo, [0, 10, 80], [0], posicao=(3, -5))
+        self.assertListEqual([0, 0, 0], varredura.tempos_de_colisao[:, 0].tolist())
+
+    def teste_resolver(self):
+        lancamentos = resolver(criar_fase(), 3)
+        # o pássaro vermelho não alcança os porcos, então é usado no obstáculo
+        self.assertEqual(3, len(lancamentos))
+        fase = criar_fase()
+        for angulo, tempo in lancamentos:
+            fase.lancar(angulo, tempo)
+        self.assertEqual('Jogo em encerrado. Você ganhou!', fase.status(100))
+
+    def teste_resolver_sem_lancamentos_suficientes(self):
+        self.assertIsNone(resolver(criar_fase(), 2))
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import io
+import os
+import re
+import sys
+from unittest.case import TestCase
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+import placa_grafica
+from fase import Ponto
+from terminal import LeitorDeLinhas, Terminal
+
+SEQUENCIA = re.compile(r'\x1b(?:\[(\d+);(\d+)H|\[2J|\[K|7|8)')
+
+
+class Tela():
+    'Emula as sequências ANSI usadas por Terminal sobre uma grade de caracteres'
+
+    def __init__(self):
+        self.celulas = {}
+        self.linha = self.coluna = 0
+        self.cursor_salvo = (0, 0)
+
+    def aplicar(self, texto):
+        posicao = 0
+        for sequencia in SEQUENCIA.finditer(texto):
+            self._escrever(texto[posicao:sequencia.start()])
+            posicao = sequencia.end()
+            if sequencia.group(1):
+                self.linha, self.coluna = int(sequencia.group(1)) - 1, int(sequencia.group(2)) - 1
+            elif sequencia.group(0).endswith('J'):
+                self.celulas.clear()
+            elif sequencia.group(0).endswith('7'):
+                self.cursor_salvo = self.linha, self.coluna
+            elif sequencia.group(0).endswith('8'):
+                self.linha, self.coluna = self.cursor_salvo
+            else:
+                for linha, coluna in list(self.celulas):
+                    if linha == self.linha and coluna >= self.coluna:
+                        del self.celulas[linha, coluna]
+        self._escrever(texto[posicao:])
+
+    def _escrever(self, texto):
+        for caracter in texto:
+            self.celulas[self.linha, self.coluna] = caracter
+            self.coluna += 1
+
+    def texto(self):
+        linhas = max((linha for linha, _ in self.celulas), default=-1) + 1
+        return [''.join(self.celulas.get((linha, coluna), ' ') for coluna in range(200)).rstrip()
+                for linha in range(linhas)]
+
+
+class TerminalTestes(TestCase):
+    def exibir(self, terminal, saida, tela, quadro):
+        inicio = saida.tell()
+        caracteres = terminal.exibir(quadro)
+        escrito = saida.getvalue()[inicio:]
+        self.assertEqual(caracteres, len(escrito))
+        tela.aplicar(escrito)
+        self.assertListEqual([linha.rstrip() for linha in quadro.splitlines()], tela.texto())
+        return escrito
+
+    def teste_escreve_apenas_as_diferencas(self):
+        saida, tela = io.StringIO(), Tela()
+        terminal = Terminal(saida)
+        primeiro = placa_grafica.desenhar(Ponto(10, 10, 'V'), Ponto(70, 1, '@'))
+        self.assertTrue(self.exibir(terminal, saida, tela, primeiro).startswith('\x1b[2J'))
+        escrito = self.exibir(terminal, saida, tela, placa_grafica.desenhar(Ponto(11, 10, 'V'), Ponto(70, 1, '+')))
+        self.assertNotIn('\x1b[2J', escrito)
+        self.assertLess(len(escrito), 40)
+        self.assertEqual(2, terminal.escritas)
+
+    def teste_quadro_igual_nao_escreve_nada(self):
+        saida, tela = io.StringIO(), Tela()
+        terminal = Terminal(saida)
+        quadro = placa_grafica.desenhar(Ponto(10, 10, 'V'))
+        self.exibir(terminal, saida, tela, quadro)
+        self.assertEqual('', self.exibir(terminal, saida, tela, quadro))
+        self.assertEqual(1, terminal.escritas)
+
+    def teste_linhas_de_tamanhos_e_quantidades_diferentes(self):
+        saida, tela = io.StringIO(), Tela()
+        terminal = Terminal(saida)
+        for quadro in ('Play! Tempo: 0.00\nabc\nxyz', 'Replay! Tempo: 10.00\nab\nxyz\n123', 'Play!\nabcdefgh',
+                       'Play!\nabcdefgh', 'a          b\n', 'b          a\nc'):
+            self.exibir(terminal, saida, tela, quadro)
+
+    def teste_cursor_volta_para_onde_estava(self):
+        'O eco do que o jogador digita continua no mesmo lugar enquanto os quadros são atualizados'
+        saida, tela = io.StringIO(), Tela()
+        terminal = Terminal(saida)
+        self.exibir(terminal, saida, tela, placa_grafica.desenhar())
+        self.assertEqual((placa_grafica.ALTURA, 0), (tela.linha, tela.coluna))
+        tela.aplicar('45')
+        inicio = saida.tell()
+        terminal.exibir(placa_grafica.desenhar(Ponto(10, 10, 'V')))
+        tela.aplicar(saida.getvalue()[inicio:])
+        self.assertEqual('45', tela.texto()[-1])
+        self.assertEqual((placa_grafica.ALTURA, 2), (tela.linha, tela.coluna))
+
+    def teste_apagar(self):
+        saida, tela = io.StringIO(), Tela()
+        terminal = Terminal(saida)
+        quadro = placa_grafica.desenhar()
+        self.exibir(terminal, saida, tela, quadro)
+        inicio = saida.tell()
+        terminal.apagar()
+        tela.aplicar(saida.getvalue()[inicio:])
+        self.assertListEqual([], tela.texto())
+        self.assertTrue(self.exibir(terminal, saida, tela, quadro).startswith('\x1b[2J'), 'Quadro escrito por completo')
+
+
+class LeitorDeLinhasTestes(TestCase):
+    def teste_linhas_chegam_aos_pedacos(self):
+        leitura, escrita = os.pipe()
+        with os.fdopen(leitura) as entrada:
+            async def ler():
+                leitor = LeitorDeLinhas(entrada).iniciar()
+                try:
+                    os.write(escrita, '4'.encode('utf-8'))
+                    await asyncio.sleep(0.01)
+                    os.write(escrita, '5\r\n> \nângulo\n'.encode('utf-8'))
+                    os.write(escrita, b'10')
+                    os.close(escrita)
+                    return [await leitor.proxima_linha() for _ in range(4)]
+                finally:
+                    leitor.parar()
+            self.assertListEqual(['45', '> ', 'ângulo', None], asyncio.run(ler()))
@@ -1,10 +1,34 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals
+import asyncio
+import io
 import os
 import platform
-from unittest.case import TestCase
+import signal
+import threading
+from unittest.case import TestCase, skipIf
+from unittest.mock import patch
 import placa_grafica
+from atores import PassaroVermelho, Porco
+from fase import Fase
+from relogio import Cadencia, Relogio
+from terminal import Terminal
 from templates import FRAMES
+from visor import Visor
+
+
+def desenhar_celula_a_celula(largura, altura, *pontos_cartesianos):
+    'Quadro montado célula a célula com esta_dentro_da_tela e os escolher_caracter, numa tela largura x altura'
+    with patch.object(placa_grafica, 'LARGURA', largura), patch.object(placa_grafica, 'ALTURA', altura):
+        frame = ''
+        for y in range(altura):
+            for x in range(largura):
+                if placa_grafica.esta_dentro_da_tela(x, y):
+                    frame += placa_grafica.escolher_caracter(x, y, *pontos_cartesianos)
+                else:
+                    frame += placa_grafica.escolher_caracter_limitrofe(x, y)
+            frame += os.linesep
+        return frame
 
 
 class TestesDoMotor(TestCase):
@@ -41,3 +65,101 @@ class TestesDoMotor(TestCase):
         self.assertEqual(frames[4], placa_grafica.desenhar(ponto_a, ponto_b))
         ponto_b(placa_grafica.LARGURA - 1, placa_grafica.ALTURA - 1)
         self.assertEqual(frames[4], placa_grafica.desenhar(ponto_a, ponto_b))
+
+        self.assertEqual(frames[4], desenhar_celula_a_celula(placa_grafica.LARGURA, placa_grafica.ALTURA, ponto_a,
+                                                             ponto_b))
+        ponto_b(1, 1)
+        for largura, altura in [(0, 0), (1, 0), (80, 0), (5, -1), (-1, 5), (0, 5), (1, 1), (1, 20), (2, 1), (2, 2),
+                                (3, 3), (4, 4), (5, 1), (5, 2), (80, 3)]:
+            self.assertEqual(desenhar_celula_a_celula(largura, altura, ponto_a, ponto_b),
+                             placa_grafica.desenhar(ponto_a, ponto_b, largura=largura, altura=altura),
+                             '%s x %s' % (largura, altura))
+
+    def teste_desenhar_igual_a_escolher_caracter(self):
+        'Cada célula interna tem o caracter do primeiro ponto nela, como em escolher_caracter'
+        class PontoCartesiano():
+            def __init__(self, x, y, caracter):
+                self.x, self.y, self.caracter = x, y, caracter
+
+        pontos = [PontoCartesiano(5, 5, 'A'), PontoCartesiano(5, 5, 'B'), PontoCartesiano(6, 5, ' '),
+                  PontoCartesiano(6, 5, 'C'), PontoCartesiano(7.5, 5, 'D'), PontoCartesiano(-1, 3, 'E'),
+                  PontoCartesiano(8.0, placa_grafica.ALTURA + 4, 'F'), PontoCartesiano(9.0, 3.0, 'G')]
+        linhas = placa_grafica.desenhar(*pontos).split(os.linesep)[:-1]
+        self.assertEqual(placa_grafica.ALTURA, len(linhas))
+        for y, linha in enumerate(linhas):
+            for x, caracter in enumerate(linha):
+                if placa_grafica.esta_dentro_da_tela(x, y):
+                    self.assertEqual(placa_grafica.escolher_caracter(x, y, *pontos), caracter)
+                else:
+                    self.assertEqual(placa_grafica.escolher_caracter_limitrofe(x, y), caracter)
+
+
+class JogoAssincronoTestes(TestCase):
+    def teste_animacao_continua_enquanto_jogador_digita(self):
+        fase = Fase()
+        fase.adicionar_passaro(PassaroVermelho(3, 3), PassaroVermelho(3, 3))
+        fase.adicionar_porco(Porco(78, 1))
+        tela = placa_grafica.Tela(Terminal(io.StringIO()), Visor(80, 20))
+        tempos = []
+        leitura, escrita = os.pipe()
+
+        def calcular_alteracoes(tempo):
+            tempos.append(tempo)
+            return fase.calcular_alteracoes(tempo)
+
+        async def jogar():
+            async def digitar():
+                await asyncio.sleep(0.05)
+                os.write(escrita, b'4')
+                # o jogador demora a terminar de digitar, mas a física não para
+                await asyncio.sleep(0.1)
+                os.write(escrita, b'5\nabc\n30\n')
+            digitacao = asyncio.ensure_future(digitar())
+            jogo = placa_grafica._jogar(tela, Relogio(0.01), 1, fase, Cadencia(0.005), 'Play!', calcular_alteracoes,
+                                        entrada)
+            tempo_final = await asyncio.wait_for(jogo, 30)
+            await digitacao
+            return tempo_final
+
+        try:
+            with os.fdopen(leitura) as entrada:
+                tempo_final = asyncio.run(jogar())
+        finally:
+            os.close(escrita)
+        self.assertTrue(fase.acabou(tempo_final))
+        self.assertEqual([i * 0.01 for i in range(len(tempos))], tempos, 'Nenhum passo da física é pulado')
+        self.assertGreater(fase._passaros[0]._tempo_de_lancamento, 0.1)
+        self.assertEqual(fase._passaros[0]._tempo_de_lancamento, fase._passaros[1]._tempo_de_lancamento,
+                         'Entrada inválida é ignorada')
+
+
+@skipIf(not hasattr(signal, 'SIGWINCH'), 'Sistema sem SIGWINCH')
+class TelaTestes(TestCase):
+    def teste_importar_nao_trata_sinais(self):
+        self.assertNotIsInstance(getattr(signal.getsignal(signal.SIGWINCH), '__self__', None), placa_grafica.Tela)
+
+    def teste_redimensionamento_observado_apenas_durante_a_partida(self):
+        anterior = signal.getsignal(signal.SIGWINCH)
+        tela = placa_grafica.Tela(Terminal(io.StringIO()), Visor(80, 20))
+        with tela.observar_redimensionamento():
+            self.assertEqual(tela.ao_redimensionar, signal.getsignal(signal.SIGWINCH))
+            signal.raise_signal(signal.SIGWINCH)
+            self.assertTrue(tela.redimensionada)
+            tela.exibir_quadro('Play!', 0)
+            self.assertFalse(tela.redimensionada)
+        self.assertEqual(anterior, signal.getsignal(signal.SIGWINCH))
+
+    def teste_fora_da_thread_principal(self):
+        erros = []
+
+        def observar():
+            try:
+                with placa_grafica.Tela(Terminal(io.StringIO()), Visor(80, 20)).observar_redimensionamento():
+                    pass
+            except Exception as erro:
+                erros.append(erro)
+
+        thread = threading.Thread(target=observar)
+        thread.start()
+        thread.join()
+        self.assertListEqual([], erros)
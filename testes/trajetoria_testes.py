@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import math
+import os
+import sys
+from unittest.case import TestCase
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+from trajetoria import Trajetoria, tempo_de_chegada_ao_chao, tempo_de_entrada_na_caixa
+
+
+class TrajetoriaTestes(TestCase):
+    def teste_chegada_ao_chao(self):
+        self.assertEqual(0, tempo_de_chegada_ao_chao(0, 10, 10))
+        # y(t) = 10 * t - 5 * t ** 2 chega a 0.5 um pouco depois de t = 2
+        self.assertAlmostEqual(2.0488088481701516, tempo_de_chegada_ao_chao(1, 10, 10))
+        self.assertEqual(math.inf, tempo_de_chegada_ao_chao(1, 1, 0))
+        self.assertAlmostEqual(0.5, tempo_de_chegada_ao_chao(1, -1, 0))
+
+    def teste_entrada_na_caixa_horizontal(self):
+        # lançamento horizontal sem gravidade: x(t) = 2 * t
+        self.assertEqual(4, tempo_de_entrada_na_caixa(0, 5, 2, 0, 0, 8, 10, 4, 6))
+        self.assertIsNone(tempo_de_entrada_na_caixa(0, 5, 2, 0, 0, 8, 10, 6, 7))
+        self.assertIsNone(tempo_de_entrada_na_caixa(0, 5, 2, 0, 0, 8, 10, 4, 6, tempo_maximo=3))
+        self.assertIsNone(tempo_de_entrada_na_caixa(0, 5, 2, 0, 0, -10, -8, 4, 6))
+
+    def teste_entrada_na_caixa_na_descida(self):
+        # lançamento vertical: y(t) = 10 * t - 5 * t ** 2, altura máxima 5 em t = 1
+        self.assertEqual(0, tempo_de_entrada_na_caixa(0, 0, 0, 10, 10, -1, 1, -1, 1))
+        self.assertAlmostEqual(1 - math.sqrt(0.2), tempo_de_entrada_na_caixa(0, 0, 0, 10, 10, -1, 1, 4, 6))
+        self.assertIsNone(tempo_de_entrada_na_caixa(0, 0, 0, 10, 10, -1, 1, 6, 7))
+        # caixa deslocada para a direita só é alcançada na descida
+        self.assertAlmostEqual(1.5, tempo_de_entrada_na_caixa(0, 0, 2, 10, 10, 3, 4, 0, 4))
+
+
+class TrajetoriaObjetoTestes(TestCase):
+    def teste_lancamento_vertical(self):
+        # y(t) = 1 + 10 * t - 5 * t ** 2, lançado no tempo 3
+        trajetoria = Trajetoria(2, 1, 10, math.radians(90), 10, 3)
+        self.assertAlmostEqual(0, trajetoria.vx)
+        self.assertAlmostEqual(10, trajetoria.vy)
+        self.assertAlmostEqual(3 + 2.0488088481701516, trajetoria.tempo_no_chao)
+        tempo, x, y = trajetoria.apice
+        self.assertAlmostEqual(4, tempo)
+        self.assertAlmostEqual(2, x)
+        self.assertAlmostEqual(6, y)
+        x_min, x_max, y_min, y_max = trajetoria.caixa
+        self.assertAlmostEqual(2, x_min)
+        self.assertAlmostEqual(2, x_max)
+        self.assertEqual(0.5, y_min)
+        self.assertAlmostEqual(6, y_max)
+        self.assertTupleEqual((2, 6), trajetoria.posicao_arredondada(4))
+
+    def teste_caixa_do_voo(self):
+        trajetoria = Trajetoria(3, 3, 20, math.radians(45), 10, 1)
+        x_min, x_max, y_min, y_max = trajetoria.caixa
+        self.assertEqual(3, x_min)
+        x_chao, y_chao = trajetoria.posicao(trajetoria.tempo_no_chao)
+        self.assertAlmostEqual(x_max, x_chao)
+        self.assertAlmostEqual(0.5, y_chao)
+        self.assertAlmostEqual(3 + 10, y_max)
+        for i in range(101):
+            x, y = trajetoria.posicao(1 + (trajetoria.tempo_no_chao - 1) * i / 100)
+            self.assertTrue(x_min - 1e-9 <= x <= x_max + 1e-9 and y_min - 1e-9 <= y <= y_max + 1e-9)
+
+    def teste_sem_gravidade_nunca_chega_ao_chao(self):
+        trajetoria = Trajetoria(0, 5, 2, 0, 0)
+        self.assertEqual(math.inf, trajetoria.tempo_no_chao)
+        self.assertTupleEqual((0, math.inf, 0.5, 5), trajetoria.caixa)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+import sys
+from unittest.case import TestCase
+
+project_dir = os.path.join(os.path.dirname(__file__), '..')
+project_dir = os.path.normpath(project_dir)
+sys.path.append(project_dir)
+
+import placa_grafica
+from atores import PassaroVermelho, Porco
+from fase import Fase, Ponto
+from fases import escudo_espartano
+from visor import Visor
+
+
+def visiveis_por_forca_bruta(visor, pontos):
+    return [Ponto(round(p.x) - visor.x, round(p.y) - visor.y, p.caracter) for p in pontos
+            if 0 < round(p.x) - visor.x < visor.largura - 1 and 0 < round(p.y) - visor.y < visor.altura - 1]
+
+
+class VisorTestes(TestCase):
+    def teste_na_origem_igual_a_tela_padrao(self):
+        pontos = [Ponto(1, 1, 'A'), Ponto(78, 18, 'V'), Ponto(79, 5, '@'), Ponto(40, 0, 'O'), Ponto(40, 10, '+')]
+        visor = Visor(placa_grafica.LARGURA, placa_grafica.ALTURA)
+        visor.usar_pontos(pontos)
+        self.assertEqual(placa_grafica.desenhar(*pontos),
+                         placa_grafica.desenhar(*visor.pontos_visiveis(), largura=visor.largura,
+                                                altura=visor.altura))
+
+    def teste_recorte_igual_a_forca_bruta(self):
+        aleatorio = random.Random(7)
+        pontos = [Ponto(aleatorio.uniform(0, 700), aleatorio.randint(0, 60), aleatorio.choice('VA@O+')) for _ in
+                  range(500)]
+        visor = Visor(80, 20, tamanho_da_celula=8)
+        visor.usar_pontos(pontos)
+        for x, y in ((0, 0), (600, 0), (333, 17), (690, 50), (5000, 0)):
+            visor.x, visor.y = x, y
+            self.assertListEqual(visiveis_por_forca_bruta(visor, pontos), visor.pontos_visiveis())
+        for _ in range(200):
+            indice = aleatorio.randrange(len(pontos))
+            pontos[indice] = Ponto(aleatorio.uniform(0, 700), aleatorio.randint(0, 60), 'a')
+            visor.atualizar([(indice, pontos[indice])])
+        for x, y in ((0, 0), (600, 0), (333, 17)):
+            visor.x, visor.y = x, y
+            self.assertListEqual(visiveis_por_forca_bruta(visor, pontos), visor.pontos_visiveis())
+
+    def teste_primeiro_ponto_prevalece(self):
+        visor = Visor(80, 20)
+        visor.usar_pontos([Ponto(5, 5, 'A'), Ponto(5, 5, 'B')])
+        quadro = placa_grafica.desenhar(*visor.pontos_visiveis(), largura=80, altura=20)
+        self.assertIn('A', quadro)
+        self.assertNotIn('B', quadro)
+
+    def teste_segue_passaro(self):
+        visor = Visor(80, 20)
+        visor.usar_pontos([Ponto(3, 3, 'V'), Ponto(3, 3, 'A'), Ponto(300, 1, '@')])
+        for i in range(1, 300):
+            passaro = Ponto(3 + i, 3 + i // 6, 'A')
+            visor.atualizar([(1, passaro)])
+            self.assertIn(Ponto(passaro.x - visor.x, passaro.y - visor.y, 'A'), visor.pontos_visiveis())
+        self.assertGreater(visor.x, 200)
+        self.assertGreater(visor.y, 30)
+        x, y = visor.x, visor.y
+        visor.atualizar([(1, Ponto(302, 52, 'a'))])
+        self.assertEqual((x, y), (visor.x, visor.y), 'Pássaro destruído não é seguido')
+
+    def teste_segue_passaro_da_fase(self):
+        fase = Fase()
+        fase.adicionar_passaro(PassaroVermelho(3, 3))
+        fase.adicionar_porco(Porco(300, 1))
+        fase.lancar(20, 0)
+        visor = Visor(40, 20)
+        for i in range(40):
+            visor.atualizar(fase.calcular_alteracoes(i / 10))
+            passaro = fase._passaros[0]
+            if passaro.caracter(i / 10) == 'V' and passaro.y > 0:
+                self.assertIn(Ponto(round(passaro.x) - visor.x, round(passaro.y) - visor.y, 'V'),
+                              visor.pontos_visiveis())
+        self.assertGreater(visor.x, 0)
+
+    def teste_rolar(self):
+        visor = Visor(80, 20, x=100)
+        visor.rolar(-40)
+        self.assertEqual(60, visor.x)
+        self.assertFalse(visor.seguindo)
+        visor.atualizar([(0, Ponto(3, 3, 'V'))])
+        visor.atualizar([(0, Ponto(500, 3, 'V'))])
+        self.assertEqual(60, visor.x, 'Rolado à mão, não segue os pássaros')
+        visor.rolar(-100, -5)
+        self.assertEqual((0, 0), (visor.x, visor.y))
+        visor.seguir()
+        visor.atualizar([(0, Ponto(501, 3, 'V'))])
+        self.assertIn(Ponto(501 - visor.x, 3, 'V'), visor.pontos_visiveis())
+
+    def teste_fase_larga(self):
+        'Os porcos de escudo_espartano, em x perto de 600, aparecem com o visor rolado até eles'
+        fase = escudo_espartano.criar_fase()
+        visor = Visor(80, 20)
+        visor.usar_pontos(fase.calcular_pontos(0))
+        self.assertNotIn('@', ''.join(ponto.caracter for ponto in visor.pontos_visiveis()))
+        visor.rolar(560)
+        self.assertIn('@', ''.join(ponto.caracter for ponto in visor.pontos_visiveis()))
+
+    def teste_tamanho_do_terminal(self):
+        visor = Visor()
+        self.assertGreaterEqual(visor.largura, 3)
+        self.assertGreaterEqual(visor.altura, 3)
+        visor.ajustar_ao_terminal(100, 30)
+        self.assertEqual((100, 30), (visor.largura, visor.altura))
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+'''
+Cálculos analíticos sobre a parábola de lançamento de um pássaro:
+
+    x(t) = x0 + vx * t
+    y(t) = y0 + vy * t - (gravidade / 2) * t ** 2
+
+Os tempos são relativos ao momento do lançamento.
+'''
+import math
+
+# Atores usam posições arredondadas, então o pássaro "toca" o chão quando sua altura arredondada chega a zero
+ALTURA_DO_CHAO = 0.5
+BITS_DO_PONTO_FIXO = 32
+
+
+def _raizes(y0, vy, gravidade, altura):
+    'Tempos, em ordem crescente, em que a parábola passa por altura. None se nunca passa.'
+    if gravidade == 0:
+        if vy == 0:
+            return None
+        t = (altura - y0) / vy
+        return t, t
+    discriminante = vy ** 2 - 2 * gravidade * (altura - y0)
+    if discriminante < 0:
+        return None
+    raiz = math.sqrt(discriminante)
+    return (vy - raiz) / gravidade, (vy + raiz) / gravidade
+
+
+def _intervalos_verticais(y0, vy, gravidade, y_min, y_max):
+    'Intervalos de tempo em que y_min <= y(t) <= y_max'
+    if gravidade == 0:
+        if vy == 0:
+            return [(-math.inf, math.inf)] if y_min <= y0 <= y_max else []
+        t1, t2 = sorted(((y_min - y0) / vy, (y_max - y0) / vy))
+        return [(t1, t2)]
+    acima = _raizes(y0, vy, gravidade, y_min)
+    if acima is None:
+        return []
+    r1, r2 = acima
+    abaixo = _raizes(y0, vy, gravidade, y_max)
+    if abaixo is None:
+        return [(r1, r2)]
+    s1, s2 = abaixo
+    return [(a, b) for a, b in ((r1, min(r2, s1)), (max(r1, s2), r2)) if a <= b]
+
+
+def _intervalo_horizontal(x0, vx, x_min, x_max):
+    'Intervalo de tempo em que x_min <= x(t) <= x_max, ou None'
+    if vx == 0:
+        return (-math.inf, math.inf) if x_min <= x0 <= x_max else None
+    t1, t2 = sorted(((x_min - x0) / vx, (x_max - x0) / vx))
+    return t1, t2
+
+
+def tempo_de_chegada_ao_chao(y0, vy, gravidade):
+    'Primeiro tempo t >= 0 em que o pássaro toca o chão. math.inf se nunca toca.'
+    if y0 <= ALTURA_DO_CHAO:
+        return 0
+    raizes = _raizes(y0, vy, gravidade, ALTURA_DO_CHAO)
+    if raizes is None:
+        return math.inf
+    t = raizes[1] if gravidade != 0 else raizes[0]
+    return t if t >= 0 else math.inf
+
+
+def tempo_de_entrada_na_caixa(x0, y0, vx, vy, gravidade, x_min, x_max, y_min, y_max, tempo_maximo=math.inf):
+    'Primeiro tempo em [0, tempo_maximo] em que a parábola está dentro da caixa. None se nunca entra.'
+    horizontal = _intervalo_horizontal(x0, vx, x_min, x_max)
+    if horizontal is None:
+        return None
+    inicio_x, fim_x = horizontal
+    for inicio_y, fim_y in _intervalos_verticais(y0, vy, gravidade, y_min, y_max):
+        inicio = max(inicio_x, inicio_y, 0)
+        if inicio <= min(fim_x, fim_y, tempo_maximo):
+            return inicio
+    return None
+
+
+def _extremo(inicio, velocidade, duracao):
+    'inicio + velocidade * duracao, aceitando duração infinita'
+    if velocidade == 0:
+        return inicio
+    if duracao == math.inf:
+        return math.copysign(math.inf, velocidade)
+    return inicio + velocidade * duracao
+
+
+class Trajetoria():
+    '''
+    Parábola de um lançamento, calculada uma única vez quando o pássaro é lançado: componentes da velocidade, tempo
+    de chegada ao chão, ápice (tempo, x, y) e a caixa (x_min, x_max, y_min, y_max) que contém todo o voo até o chão.
+    duracao_do_voo é relativa ao lançamento; tempo_no_chao e o tempo do ápice são absolutos. Valores infinitos
+    indicam um voo que nunca chega ao chão.
+    '''
+    __slots__ = ('x0', 'y0', 'vx', 'vy', 'gravidade', 'tempo_de_lancamento', 'duracao_do_voo', 'tempo_no_chao',
+                 'apice', 'caixa', '_meia_gravidade', '_ponto_fixo')
+
+    def __init__(self, x0, y0, velocidade, angulo, gravidade, tempo_de_lancamento=0):
+        self.x0 = x0
+        self.y0 = y0
+        self.vx = velocidade * math.cos(angulo)
+        self.vy = velocidade * math.sin(angulo)
+        self.gravidade = gravidade
+        self.tempo_de_lancamento = tempo_de_lancamento
+        self._meia_gravidade = gravidade / 2
+        self._ponto_fixo = None
+
+        duracao = self.duracao_do_voo = tempo_de_chegada_ao_chao(y0, self.vy, gravidade)
+        self.tempo_no_chao = tempo_de_lancamento + duracao
+        if gravidade > 0:
+            t_apice = min(max(self.vy / gravidade, 0), duracao)
+        elif duracao == math.inf and (self.vy > 0 or gravidade < 0):
+            t_apice = math.inf
+        else:
+            t_apice = 0
+        if t_apice == math.inf:
+            self.apice = (math.inf, _extremo(x0, self.vx, t_apice), math.inf)
+        else:
+            self.apice = (tempo_de_lancamento + t_apice,) + self.posicao(tempo_de_lancamento + t_apice)
+        x_fim = _extremo(x0, self.vx, duracao)
+        self.caixa = (min(x0, x_fim), max(x0, x_fim), min(y0, ALTURA_DO_CHAO), max(y0, self.apice[2]))
+
+    def posicao(self, tempo):
+        'Posição exata, sem arredondar, em tempo'
+        delta_t = tempo - self.tempo_de_lancamento
+        return self.x0 + self.vx * delta_t, self.y0 + self.vy * delta_t - self._meia_gravidade * delta_t * delta_t
+
+    def posicao_arredondada(self, tempo):
+        if self._ponto_fixo is not None:
+            return self._posicao_em_ponto_fixo(tempo)
+        delta_t = tempo - self.tempo_de_lancamento
+        return (round(self.x0 + self.vx * delta_t),
+                round(self.y0 + self.vy * delta_t - self._meia_gravidade * delta_t * delta_t))
+
+    def usar_ponto_fixo(self, duracao_do_tique):
+        '''
+        Passa a calcular as posições arredondadas em aritmética inteira, contando o tempo em tiques de
+        duracao_do_tique a partir do lançamento. Tempos fora da grade de tiques vão para o tique mais próximo.
+        As posições já saem inteiras, sem round(); empates exatos são arredondados para cima.
+        '''
+        escala = 1 << BITS_DO_PONTO_FIXO
+        meio = escala >> 1
+        self._ponto_fixo = (duracao_do_tique, round(self.tempo_de_lancamento / duracao_do_tique),
+                            round(self.x0 * escala) + meio, round(self.vx * duracao_do_tique * escala),
+                            round(self.y0 * escala) + meio, round(self.vy * duracao_do_tique * escala),
+                            round(self._meia_gravidade * duracao_do_tique ** 2 * escala))
+
+    def _posicao_em_ponto_fixo(self, tempo):
+        duracao_do_tique, tique_de_lancamento, x0, vx, y0, vy, meia_gravidade = self._ponto_fixo
+        tiques = round(tempo / duracao_do_tique) - tique_de_lancamento
+        return ((x0 + vx * tiques) >> BITS_DO_PONTO_FIXO,
+                (y0 + vy * tiques - meia_gravidade * tiques * tiques) >> BITS_DO_PONTO_FIXO)
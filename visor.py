@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+'''
+Visor da placa gráfica ASCII: a janela do mundo que cabe no terminal. Ele pode seguir o pássaro em voo ou ser
+rolado à mão.
+
+O visor guarda os pontos da fase numa grade de células e é atualizado com as alterações de cada quadro, como as de
+Fase.calcular_alteracoes. Só os pontos das células que cruzam a janela são examinados ao desenhar, então o custo de
+um quadro depende das alterações e do que está visível, não do tamanho da fase.
+'''
+import shutil
+
+from fase import Ponto
+
+CARACTERES_SEGUIDOS = ('V', 'A')  # pássaros ativos
+
+
+class Visor():
+    '''
+    Janela de largura x altura caracteres, com a borda, cujo canto inferior esquerdo está em (x, y) no mundo. Sem
+    tamanho, ocupa o terminal, deixando uma linha para a mensagem acima do quadro e outra para o cursor abaixo.
+    '''
+
+    def __init__(self, largura=None, altura=None, x=0, y=0, tamanho_da_celula=16):
+        self.ajustar_ao_terminal(largura, altura)
+        self.x, self.y = x, y
+        self.seguindo = True
+        self.tamanho_da_celula = tamanho_da_celula
+        self.limpar()
+
+    def ajustar_ao_terminal(self, largura=None, altura=None):
+        'Usa largura e altura ou, sem elas, o tamanho atual do terminal'
+        if largura is None or altura is None:
+            tamanho = shutil.get_terminal_size()
+            largura = tamanho.columns if largura is None else largura
+            altura = tamanho.lines - 2 if altura is None else altura
+        self.largura, self.altura = max(largura, 3), max(altura, 3)
+
+    def atualizar(self, alteracoes):
+        '''
+        Aplica pares (índice, Ponto) aos pontos guardados. Seguindo, a janela acompanha o último pássaro ativo que
+        mudou de posição.
+        '''
+        pontos, celulas_dos_pontos, celulas = self._pontos, self._celulas_dos_pontos, self._celulas
+        tamanho = self.tamanho_da_celula
+        seguido = None
+        for indice, ponto in alteracoes:
+            if indice >= len(pontos):
+                faltam = indice + 1 - len(pontos)
+                pontos.extend([None] * faltam)
+                celulas_dos_pontos.extend([None] * faltam)
+            anterior = pontos[indice]
+            pontos[indice] = ponto
+            celula = (round(ponto.x) // tamanho, round(ponto.y) // tamanho)
+            celula_anterior = celulas_dos_pontos[indice]
+            if celula != celula_anterior:
+                if celula_anterior is not None:
+                    celulas[celula_anterior].discard(indice)
+                celulas.setdefault(celula, set()).add(indice)
+                celulas_dos_pontos[indice] = celula
+            if (ponto.caracter in CARACTERES_SEGUIDOS and anterior is not None and
+                    (anterior.x != ponto.x or anterior.y != ponto.y)):
+                seguido = ponto
+        if seguido is not None and self.seguindo:
+            self._acompanhar(seguido)
+
+    def usar_pontos(self, pontos):
+        'Substitui todos os pontos guardados, por exemplo ao saltar para um quadro qualquer de uma gravação'
+        if len(pontos) < len(self._pontos):
+            self.limpar()
+        self.atualizar(enumerate(pontos))
+
+    def limpar(self):
+        'Esquece todos os pontos guardados'
+        self._pontos, self._celulas_dos_pontos, self._celulas = [], [], {}
+
+    def rolar(self, dx, dy=0):
+        'Desloca a janela e para de seguir os pássaros'
+        self.seguindo = False
+        self.x, self.y = max(self.x + dx, 0), max(self.y + dy, 0)
+
+    def seguir(self):
+        self.seguindo = True
+
+    def pontos_visiveis(self):
+        'Pontos dentro da borda, em coordenadas da tela e na ordem da fase, para placa_grafica.desenhar'
+        x_min, x_max = self.x + 1, self.x + self.largura - 2
+        y_min, y_max = self.y + 1, self.y + self.altura - 2
+        tamanho, celulas, pontos = self.tamanho_da_celula, self._celulas, self._pontos
+        indices = []
+        for cx in range(x_min // tamanho, x_max // tamanho + 1):
+            for cy in range(y_min // tamanho, y_max // tamanho + 1):
+                celula = celulas.get((cx, cy))
+                if celula:
+                    indices.extend(celula)
+        indices.sort()
+        visiveis = []
+        for indice in indices:
+            ponto = pontos[indice]
+            x, y = round(ponto.x), round(ponto.y)
+            if x_min <= x <= x_max and y_min <= y <= y_max:
+                visiveis.append(Ponto(x - self.x, y - self.y, ponto.caracter))
+        return visiveis
+
+    def _acompanhar(self, ponto):
+        # a janela só anda quando o ponto sai da sua metade central, o que poupa redesenhar a tela toda a cada quadro
+        margem_x, margem_y = self.largura // 4, self.altura // 4
+        x, y = round(ponto.x) - self.x, round(ponto.y) - self.y
+        if x < margem_x:
+            self.x = max(self.x + x - margem_x, 0)
+        elif x > self.largura - 1 - margem_x:
+            self.x += x - (self.largura - 1 - margem_x)
+        if y < margem_y:
+            self.y = max(self.y + y - margem_y, 0)
+        elif y > self.altura - 1 - margem_y:
+            self.y += y - (self.altura - 1 - margem_y)